@@ -4,6 +4,7 @@
 // SIGN LANGUAGE ANIMATION FALLBACK STRATEGY:
 // When a specific sign animation doesn't exist, the system uses this hierarchy:
 // 1. Exact match: Load pre-recorded GLB animation from animations/ folder
+//    (or its clip in the page's sign bundle, if the page has one)
 // 2. Compound breakdown: Split hyphenated/underscored words and play components
 //    Example: "LEGAL-DIFFERENCE" → play "LEGAL" then "DIFFERENCE" sequentially
 // 3. Fingerspelling: Spell out word letter-by-letter (requires alphabet animations)
@@ -30,6 +31,8 @@ let isPaused = false;
 
 let loader;
 const actionCache = new Map();
+const baseAvatarCache = new Map();
+let signBundlePromise = null;
 let signMetadata = {};
 
 // SignAvatars dataset reference for biomechanical validation
@@ -359,6 +362,74 @@ function createPlaceholderAvatar() {
   }
 }
 
+// Animation-only sign files (convert_pkl_to_glb.py --mode animation) carry just
+// joint rotations and expression weights. Their channels bind by node name to
+// one shared skinned avatar, named in the file's asset.extras.baseAvatar, which
+// is downloaded once and reused by every such sign. The sign also records the
+// avatar's hash (baseAvatarHash); an avatar built from different settings
+// (asset.extras.sourceHash) would misplay it, so it is rejected.
+function loadBaseAvatar(fileName, expectedHash) {
+  if (!baseAvatarCache.has(fileName)) {
+    const url = `animations/${fileName}`;
+    debug(`Loading shared base avatar from ${url}…`);
+    baseAvatarCache.set(
+      fileName,
+      new Promise((resolve, reject) => {
+        loader.load(url, resolve, undefined, reject);
+      })
+    );
+  }
+  return baseAvatarCache.get(fileName).then((gltf) => {
+    const sourceHash = gltf.parser?.json?.asset?.extras?.sourceHash;
+    if (expectedHash && sourceHash && sourceHash !== expectedHash) {
+      throw new Error(`${fileName} was built from different settings than this sign (hash ${sourceHash}, expected ${expectedHash})`);
+    }
+    return gltf.scene;
+  });
+}
+
+// Per-page sign bundles (sign_bundle.py): one GLB holding the avatar once and
+// a named clip per sign, announced by <meta name="sign-bundle" content="INDEX.json">.
+// The index maps sign keys to clip names; signs it does not list load from
+// their own files as usual.
+function loadSignBundle() {
+  if (!signBundlePromise) {
+    const bundleMeta = document.querySelector('meta[name="sign-bundle"]');
+    if (!bundleMeta) {
+      signBundlePromise = Promise.resolve(null);
+      return signBundlePromise;
+    }
+    const indexUrl = new URL(bundleMeta.content, document.baseURI);
+    debug(`Loading sign bundle index from ${indexUrl}…`);
+    signBundlePromise = fetch(indexUrl)
+      .then((response) => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        return response.json();
+      })
+      .then(
+        (index) =>
+          new Promise((resolve, reject) => {
+            const url = new URL(index.file, indexUrl).href;
+            loader.load(
+              url,
+              (gltf) => {
+                const clips = new Map(gltf.animations.map((clip) => [clip.name, clip]));
+                debug(`Sign bundle ${url} loaded with ${clips.size} clips.`);
+                resolve({ index, scene: gltf.scene, clips });
+              },
+              undefined,
+              reject
+            );
+          })
+      )
+      .catch((error) => {
+        debug(`Could not load sign bundle: ${error?.message || error}. Using per-sign files.`, "error");
+        return null;
+      });
+  }
+  return signBundlePromise;
+}
+
 async function loadSignAction(signKey) {
   if (!signKey) return null;
 
@@ -368,6 +439,22 @@ async function loadSignAction(signKey) {
   }
 
   const meta = signMetadata[signKey] || {};
+
+  // Signs in the page's bundle all play on the bundle's single scene
+  const bundle = await loadSignBundle();
+  const bundleClip = bundle && bundle.clips.get(bundle.index.clips?.[signKey]);
+  if (bundleClip) {
+    const signData = {
+      signGLTF: true,
+      scene: bundle.scene,
+      clip: bundleClip,
+      signKey: signKey,
+      description: meta.description
+    };
+    actionCache.set(signKey, signData);
+    debug(`Sign '${signKey}' found in the page's sign bundle.`);
+    return signData;
+  }
   
   // Log additional metadata if available
   if (meta.hamnosys) {
@@ -452,17 +539,32 @@ async function loadSignAction(signKey) {
         // IMPORTANT: Morph target animations are mesh-specific.
         // Each sign GLB contains its own mesh with its own morph targets.
         // We must store the entire GLTF scene + clip so we can swap meshes when playing.
-        const signData = {
-          signGLTF: true,
-          scene: gltf.scene,
-          clip: clip,
-          signKey: signKey,
-          description: meta.description
-        };
-
-        actionCache.set(signKey, signData);
-        debug(`Sign animation loaded and cached for key: ${signKey}.`);
-        resolve(signData);
+        // Animation-only signs instead play on the shared base avatar's scene.
+        const extras = gltf.parser?.json?.asset?.extras;
+        const baseAvatar = extras?.baseAvatar;
+        const scenePromise = baseAvatar
+          ? loadBaseAvatar(baseAvatar, extras.baseAvatarHash)
+          : Promise.resolve(gltf.scene);
+
+        scenePromise.then(
+          (signScene) => {
+            const signData = {
+              signGLTF: true,
+              scene: signScene,
+              clip: clip,
+              signKey: signKey,
+              description: meta.description
+            };
+
+            actionCache.set(signKey, signData);
+            debug(`Sign animation loaded and cached for key: ${signKey}${baseAvatar ? ` (plays on ${baseAvatar})` : ""}.`);
+            resolve(signData);
+          },
+          (error) => {
+            debug(`Could not load base avatar ${baseAvatar}: ${error?.message || error}`, "error");
+            resolve({ fingerspell: true, text: signKey, description: meta.description });
+          }
+        );
       },
       undefined,
       (error) => {
@@ -539,7 +641,8 @@ async function playSign(signKey) {
       mixer.stopAllAction();
     }
     
-    // Add the sign's own scene (which has the mesh with morph targets)
+    // Add the sign's own scene (which has the mesh with morph targets),
+    // or the shared base avatar for animation-only signs
     const signScene = action.scene;
     signScene.position.set(0, 0, 0);
     scene.add(signScene);
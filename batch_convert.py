@@ -2,75 +2,128 @@
 """
 Batch convert ALL SignAvatars .pkl files to GLB format.
 Uses the fixed converter with normals, material, and correct accessor indices.
+Conversions run on a warm multi-core worker pool (see batch_engine.py), and
+signs whose .pkl, SMPL-X model and settings are unchanged since the last run
+are skipped (see build_manifest.py). --priority takes a site coverage report
+(see site_build.py) and converts the signs pages need most first.
 """
-import subprocess
-import sys
+import argparse
 import json
-import os
+import time
 from pathlib import Path
 
+from batch_engine import ConversionJob, run_batch, add_batch_arguments
+from build_manifest import BuildManifest
+from conversion_settings import add_settings_arguments, settings_from_args
+from vertex_cache import vertex_cache_from_args
+from instrumentation import add_report_arguments, report_runs
+
 PKL_DIR = Path("signavatars-data/asl-word-level")
 OUT_DIR = Path("animations")
 SMPLX_MODEL = "signavatars-data/models"
+MANIFEST = OUT_DIR / ".build-manifest.json"
+
+
+def load_word_mapping():
+    """Load word mapping for labeling, inverted to file_id -> word."""
+    mapping = {}
+    mapping_file = Path("wlasl_mapping.json")
+    if mapping_file.exists():
+        with open(mapping_file) as f:
+            raw = json.load(f)
+        for word, info in raw.items():
+            mapping[info["file_id"]] = word
+    return mapping
+
+
+def load_priority(path):
+    """WLASL file ids from a site coverage report's priority list, most needed first."""
+    with open(path) as f:
+        report = json.load(f)
+    return [item["file_id"] for item in report.get("priority", [])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch convert SignAvatars .pkl files to GLB')
+    add_batch_arguments(parser)
+    add_settings_arguments(parser)
+    add_report_arguments(parser)
+    parser.add_argument('--priority', metavar='COVERAGE_JSON', default=None,
+                        help='Convert signs in the order of a site_build.py coverage report first')
+    parser.add_argument('--priority-only', action='store_true',
+                        help='With --priority, convert only the signs the report lists')
+    args = parser.parse_args()
+
+    settings = settings_from_args(args)
+    manifest = BuildManifest(MANIFEST, SMPLX_MODEL, settings)
+    mapping = load_word_mapping()
+
+    # Get all .pkl files
+    pkl_files = sorted(PKL_DIR.glob("*.pkl"))
+    print(f"Found {len(pkl_files)} .pkl files to convert")
+    if args.priority:
+        rank = {}
+        for file_id in load_priority(args.priority):
+            rank.setdefault(file_id, len(rank))
+        if args.priority_only:
+            pkl_files = [pkl for pkl in pkl_files if pkl.stem in rank]
+        pkl_files.sort(key=lambda pkl: rank.get(pkl.stem, len(rank)))
+        print(f"Priority order from {args.priority}: {sum(pkl.stem in rank for pkl in pkl_files)} listed signs first")
+    print(f"Word mappings available: {len(mapping)}")
 
-# Load word mapping for labeling
-mapping = {}
-mapping_file = Path("wlasl_mapping.json")
-if mapping_file.exists():
-    with open(mapping_file) as f:
-        raw = json.load(f)
-    # Invert: file_id -> word
-    for word, info in raw.items():
-        mapping[info["file_id"]] = word
-
-# Get all .pkl files
-pkl_files = sorted(PKL_DIR.glob("*.pkl"))
-print(f"Found {len(pkl_files)} .pkl files to convert")
-print(f"Word mappings available: {len(mapping)}")
-
-# Track results
-success = 0
-failed = 0
-skipped = 0
-
-for i, pkl in enumerate(pkl_files):
-    file_id = pkl.stem  # e.g., "00295"
-    out_name = f"WORD-{file_id}.glb"
-    out_path = OUT_DIR / out_name
-    
-    word = mapping.get(file_id, f"sign-{file_id}")
-    
-    print(f"\n[{i+1}/{len(pkl_files)}] Converting {pkl.name} -> {out_name} ({word})")
-    
-    try:
-        result = subprocess.run(
-            [sys.executable, "convert_pkl_to_glb.py",
-             "--input", str(pkl),
-             "--output", str(out_path),
-             "--word", word,
-             "--smplx-model", SMPLX_MODEL],
-            capture_output=True, text=True, timeout=120
-        )
-        
-        if result.returncode == 0:
+    # Track results
+    success = 0
+    failed = 0
+    skipped = 0
+
+    jobs = []
+    fingerprints = {}
+    for pkl in pkl_files:
+        file_id = pkl.stem  # e.g., "00295"
+        out_path = OUT_DIR / f"WORD-{file_id}.glb"
+        fingerprint = manifest.fingerprint(pkl)
+        if not args.force and manifest.is_current(out_path, fingerprint):
+            skipped += 1
+            continue
+        fingerprints[str(out_path)] = fingerprint
+        jobs.append(ConversionJob(str(pkl), str(out_path), mapping.get(file_id, f"sign-{file_id}")))
+
+    print(f"Up to date: {skipped}, to convert: {len(jobs)}")
+
+    results = run_batch(jobs, SMPLX_MODEL, workers=args.workers, threads_per_worker=args.threads_per_worker,
+                        settings=settings, chunk_size=args.chunk_size,
+                        vertex_cache=vertex_cache_from_args(args), profile=args.profile)
+    reports = []
+    start = time.perf_counter()
+    for i, result in enumerate(results):
+        job = result['job']
+        reports.append(result['report'])
+        print(f"\n[{i+1}/{len(jobs)}] Converted {Path(job.input_path).name} -> {Path(job.output_path).name} "
+              f"({job.word}) in {result['seconds']:.1f}s")
+
+        if result['ok']:
             success += 1
+            manifest.record(job.output_path, fingerprints[job.output_path])
+            manifest.save()
             # Print just the last few lines (the summary)
-            lines = result.stdout.strip().split("\n")
-            for line in lines[-4:]:
+            for line in result['log'][-4:]:
                 print(f"  {line}")
         else:
             failed += 1
-            print(f"  ❌ FAILED: {result.stderr[-200:] if result.stderr else 'unknown error'}")
-    except subprocess.TimeoutExpired:
-        failed += 1
-        print(f"  ❌ TIMEOUT after 120s")
-    except Exception as e:
-        failed += 1
-        print(f"  ❌ ERROR: {e}")
-
-print(f"\n{'='*60}")
-print(f"Batch conversion complete!")
-print(f"  ✅ Success: {success}")
-print(f"  ❌ Failed:  {failed}")
-print(f"  ⏭️  Skipped: {skipped}")
-print(f"  Total GLBs: {len(list(OUT_DIR.glob('WORD-*.glb')))}")
+            print(f"  ❌ FAILED: {result['error'][-200:]}")
+
+    manifest.save()
+
+    print(f"\n{'='*60}")
+    print(f"Batch conversion complete!")
+    print(f"  ✅ Success: {success}")
+    print(f"  ❌ Failed:  {failed}")
+    print(f"  ⏭️  Skipped: {skipped}")
+    print(f"  Total GLBs: {len(list(OUT_DIR.glob('WORD-*.glb')))}")
+
+    if reports and (args.report or args.profile):
+        report_runs(args.report, reports, wall_seconds=time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+In-process multi-core batch engine for SignAvatars .pkl -> GLB conversion.
+
+Instead of one `convert_pkl_to_glb.py` subprocess per file, a pool of worker
+processes each imports the converter once, maps the shared SMPL-X model
+layout once and keeps it warm for every job it receives. BLAS and OpenMP
+threads are pinned per worker so the pool does not oversubscribe the CPU.
+Results stream back to the parent in job order as soon as they are ready,
+each with its per-stage instrumentation report (see instrumentation.py).
+
+Usage:
+    from batch_engine import ConversionJob, run_batch
+
+    jobs = [ConversionJob('signavatars-data/asl-word-level/00384.pkl', 'animations/WORD-00384.glb', 'ABLE')]
+    for result in run_batch(jobs, 'signavatars-data/models', workers=8):
+        print(result['job'].word, result['ok'])
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+
+from conversion_settings import DEFAULT_CHUNK_SIZE
+from instrumentation import measure
+
+ConversionJob = namedtuple('ConversionJob', ['input_path', 'output_path', 'word'])
+
+# Thread pools that NumPy (and torch, if imported) may start in each worker
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+# Per-process state, filled by _init_worker
+_worker = {}
+
+
+def default_worker_count(threads_per_worker=1):
+    """One worker per group of threads_per_worker cores."""
+    return max(1, (os.cpu_count() or 1) // max(1, threads_per_worker))
+
+
+@contextlib.contextmanager
+def pinned_thread_env(threads):
+    """
+    Set THREAD_ENV_VARS to threads while the block runs, restoring them after.
+
+    Spawned workers inherit the parent's environment and import NumPy while
+    unpickling their initargs, before any initializer runs, so the limits
+    have to be in place when the pool starts.
+    """
+    saved = {var: os.environ.get(var) for var in THREAD_ENV_VARS}
+    os.environ.update({var: str(threads) for var in THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _init_worker(smplx_model_dir, threads_per_worker, settings, chunk_size, vertex_cache, profile):
+    """Pin torch threads, then import the converter and load the body model once."""
+    # torch decodes .pkl files that are not in the parameter store and sizes its own pool
+    try:
+        import torch
+    except ImportError:
+        pass
+    else:
+        torch.set_num_threads(threads_per_worker)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # Already set in this process
+
+    import convert_pkl_to_glb
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        smplx_model = convert_pkl_to_glb.load_smplx_model(smplx_model_dir)
+
+    _worker.update(
+        converter=convert_pkl_to_glb,
+        smplx_model=smplx_model,
+        settings=settings,
+        chunk_size=chunk_size,
+        vertex_cache=vertex_cache,
+        profile=profile,
+    )
+
+
+def _convert_job(job):
+    """Convert one job inside a worker, capturing the converter's output and stage report."""
+    log = io.StringIO()
+    start = time.perf_counter()
+    result = {'job': job, 'ok': False, 'error': None, 'metadata': None}
+
+    with measure(job.word, profile=_worker['profile']) as report:
+        try:
+            with contextlib.redirect_stdout(log):
+                result['metadata'] = _worker['converter'].convert_file(
+                    job.input_path, job.output_path, job.word, _worker['smplx_model'],
+                    _worker['settings'], chunk_size=_worker['chunk_size'], vertex_cache=_worker['vertex_cache'])
+            result['ok'] = True
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+
+    result['seconds'] = time.perf_counter() - start
+    result['log'] = log.getvalue().strip().split("\n")
+    result['report'] = {**report.as_dict(), 'input': job.input_path, 'output': job.output_path,
+                        'ok': result['ok'], 'error': result['error'], 'worker': os.getpid()}
+    return result
+
+
+def run_batch(jobs, smplx_model_dir, workers=None, threads_per_worker=1, settings=None,
+              chunk_size=DEFAULT_CHUNK_SIZE, vertex_cache=None, profile=None):
+    """
+    Convert jobs on a warm process pool.
+
+    vertex_cache is an optional vertex_cache.VertexCache shared by all workers.
+    profile ('cprofile' or 'tracemalloc') adds profiler output to each report.
+
+    Yields one result dict per job, in job order:
+    {'job', 'ok', 'error', 'metadata', 'seconds', 'log', 'report'}, where
+    report is the job's instrumentation.RunReport record.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+
+    workers = min(workers or default_worker_count(threads_per_worker), len(jobs))
+
+    # Write the shared SMPL-X layout once up front, so workers only map it
+    # instead of all unpacking the .npz at the same time
+    from convert_pkl_to_glb import load_smplx_model
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_smplx_model(smplx_model_dir)
+
+    # spawn, not fork: forking a parent that has already started BLAS or torch threads can deadlock
+    context = multiprocessing.get_context('spawn')
+    with pinned_thread_env(threads_per_worker):
+        pool = context.Pool(workers, initializer=_init_worker,
+                            initargs=(str(smplx_model_dir), threads_per_worker, settings, chunk_size, vertex_cache,
+                                      profile))
+    with pool:
+        for result in pool.imap(_convert_job, jobs, chunksize=1):
+            yield result
+
+
+def add_batch_arguments(parser):
+    """Add the shared --workers / --threads-per-worker / --force options to a batch script."""
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: CPU count / threads per worker)')
+    parser.add_argument('--threads-per-worker', type=int, default=1,
+                        help='BLAS/OpenMP threads per worker (default: 1)')
+    parser.add_argument('--force', action='store_true',
+                        help='Reconvert everything, ignoring the build manifest')
+    return parser
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the conversion pipeline.
+
+Runs on a synthetic SMPL-X model and synthetic SignAvatars pickles (see
+synthetic.py), so it needs neither the licensed model, the dataset, torch
+nor a network connection. Each case times one stage: load_pkl_params,
+parse_smplx_params, the body-model forward pass, params_to_mesh_sequence,
+create_glb_with_animation, and end-to-end convert_file per export mode,
+over several sign lengths. A case reports the median of --repeats runs.
+It also reports its peak traced allocation, measured in a separate
+tracemalloc run. End-to-end cases add their per-stage breakdown from
+instrumentation.py.
+
+Times are also stored relative to a fixed NumPy calibration workload timed
+on the same machine. That lets a baseline recorded on one box flag real
+regressions on another. Results are compared with benchmarks/baseline.json.
+The run fails (exit 1) when a case is slower than its baseline by more than
+--time-threshold, or uses more memory by more than --memory-threshold.
+
+Everything runs inside a scratch directory (the current directory while
+benchmarking), so the default parameter store and model cache under
+signavatars-data/ are never touched.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --quick --cases forward convert
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from pathlib import Path
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+
+from synthetic import DEFAULT_LENGTHS, write_synthetic_model, write_synthetic_pkls  # noqa: E402
+
+DEFAULT_BASELINE = BENCHMARK_DIR / 'baseline.json'
+BASELINE_FORMAT = 1
+
+DEFAULT_REPEATS = 5
+QUICK_REPEATS = 2
+
+# Allowed slowdown (relative time) and memory growth before a case fails
+DEFAULT_TIME_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.10
+
+# Differences below these are noise, whatever the ratio
+TIME_NOISE_SECONDS = 0.002
+MEMORY_NOISE_MB = 1.0
+
+# End-to-end modes: name -> converter settings
+CONVERT_MODES = {
+    'morph': {},
+    'morph-int16-sparse': {'quantize': 'int16', 'sparse_threshold': 0.0005},
+    'morph-adaptive': {'keyframe_tolerance': 0.002, 'max_keyframes': 40},
+    'skinned': {'mode': 'skinned'},
+    'basis': {'mode': 'basis'},
+}
+CONVERT_LENGTH = 90
+
+
+def calibrate(repeats=DEFAULT_REPEATS):
+    """Median time of a fixed float32 matrix workload, the unit of relative times."""
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=(512, 512)).astype(np.float32)
+    b = rng.normal(size=(512, 2048)).astype(np.float32)
+    times = []
+    for _ in range(repeats + 1):
+        start = time.perf_counter()
+        for _ in range(4):
+            np.tanh(a @ b)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times[1:])
+
+
+def time_case(run, setup=None, repeats=DEFAULT_REPEATS):
+    """Median seconds of run(setup()) over repeats, after one warm-up; setup is not timed."""
+    times = []
+    for i in range(repeats + 1):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        run(argument)
+        if i:
+            times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def traced_peak_mb(run, setup=None):
+    """Peak memory traced by tracemalloc during one run(setup()), in MB."""
+    argument = setup() if setup else None
+    tracemalloc.start()
+    try:
+        run(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024 / 1024, 2)
+
+
+def build_cases(data_dir, lengths, selected=None):
+    """(name, run, setup, frames, stage_report) for every case; names are 'stage/frames' or 'convert/mode/frames'."""
+    import convert_pkl_to_glb as converter
+
+    model_dir = data_dir / 'models'
+    model = converter.load_smplx_model(model_dir)
+    faces = np.asarray(model.faces)
+    pkl_paths = dict(zip(lengths, write_synthetic_pkls(data_dir / 'pkl', lengths)))
+    out_dir = data_dir / 'out'
+    out_dir.mkdir(exist_ok=True)
+
+    cases = []
+    for frames, pkl_path in pkl_paths.items():
+        params = converter.load_pkl_params(pkl_path)
+        keyframes = converter.select_keyframe_indices(frames)
+        vertices = converter.params_to_vertices(params, model)
+        output = out_dir / f"bench-{frames}.glb"
+        cases += [
+            (f"load/{frames}", lambda _, path=pkl_path: converter.load_pkl_params(path), None, frames, False),
+            (f"parse/{frames}", lambda _, rows=params['smplx']: converter.parse_smplx_params(rows), None, frames,
+             False),
+            (f"forward/{frames}", lambda _, params=params: converter.params_to_vertices(params, model), None, frames,
+             False),
+            (f"mesh_sequence/{frames}",
+             lambda _, params=params, keyframes=keyframes: converter.params_to_mesh_sequence(
+                 params, model_dir, frame_indices=keyframes), None, frames, False),
+            (f"morph_glb/{frames}",
+             lambda selected_vertices, output=output, keyframes=keyframes: converter.create_glb_with_animation(
+                 selected_vertices, faces, output, frame_indices=keyframes),
+             lambda vertices=vertices, keyframes=keyframes: vertices[keyframes], frames, False),
+        ]
+
+    pkl_path = write_synthetic_pkls(data_dir / 'pkl-convert', [CONVERT_LENGTH], seed=100)[0]
+    for mode, settings in CONVERT_MODES.items():
+        output = out_dir / f"convert-{mode}.glb"
+        cases.append((f"convert/{mode}/{CONVERT_LENGTH}",
+                      lambda _, output=output, settings=settings: converter.convert_file(
+                          pkl_path, output, 'bench', model, settings),
+                      None, CONVERT_LENGTH, True))
+
+    if selected:
+        cases = [case for case in cases if any(case[0] == name or case[0].startswith(name + '/') for name in selected)]
+    return cases
+
+
+def run_suite(lengths=DEFAULT_LENGTHS, repeats=DEFAULT_REPEATS, selected=None, memory=True):
+    """Generate the synthetic data in a scratch directory and run every case. Returns the results dict."""
+    from instrumentation import measure
+
+    with tempfile.TemporaryDirectory(prefix='signavatars-bench-') as scratch:
+        data_dir = Path(scratch)
+        previous_cwd = os.getcwd()
+        os.chdir(data_dir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                write_synthetic_model(data_dir / 'models')
+                cases = build_cases(data_dir, lengths, selected)
+            calibration = calibrate(repeats)
+            print(f"Calibration: {calibration * 1000:.1f} ms; {len(cases)} cases, {repeats} repeats each")
+
+            results = {}
+            for name, run, setup, frames, staged in cases:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    seconds = time_case(run, setup, repeats)
+                    peak = traced_peak_mb(run, setup) if memory else None
+                    stages = None
+                    if staged:
+                        with measure(name) as report:
+                            run(setup() if setup else None)
+                        stages = {stage: record['seconds'] for stage, record in report.as_dict()['stages'].items()}
+                results[name] = {
+                    'seconds': round(seconds, 6),
+                    'relative': round(seconds / calibration, 4),
+                    'frames': frames,
+                    'fps': round(frames / seconds, 1),
+                    'traced_peak_mb': peak,
+                }
+                if stages:
+                    results[name]['stages'] = stages
+                print(f"  {name:<32} {seconds * 1000:9.2f} ms {frames / seconds:10.0f} frames/s"
+                      f"{f'  {peak:8.1f} MB' if peak is not None else ''}")
+        finally:
+            os.chdir(previous_cwd)
+
+    return {
+        'format': BASELINE_FORMAT,
+        'calibration_seconds': round(calibration, 6),
+        'repeats': repeats,
+        'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                    'platform': platform.platform(), 'processor': platform.machine(), 'cpus': os.cpu_count()},
+        'cases': results,
+    }
+
+
+def compare(results, baseline, time_threshold=DEFAULT_TIME_THRESHOLD, memory_threshold=DEFAULT_MEMORY_THRESHOLD,
+            absolute=False):
+    """
+    Regressions of results against a baseline, as a list of messages.
+
+    Times are compared relative to each run's calibration unless absolute.
+    Cases missing from either side are skipped.
+    """
+    key = 'seconds' if absolute else 'relative'
+    scale = 1.0 if absolute else results['calibration_seconds']
+    regressions = []
+    for name, case in sorted(results['cases'].items()):
+        base = baseline.get('cases', {}).get(name)
+        if base is None:
+            continue
+        current, previous = case[key], base[key]
+        if current > previous * (1 + time_threshold) and (current - previous) * scale > TIME_NOISE_SECONDS:
+            regressions.append(f"{name}: {current / previous - 1:+.0%} time "
+                               f"({previous * scale * 1000:.2f} -> {current * scale * 1000:.2f} ms)")
+        if case.get('traced_peak_mb') is not None and base.get('traced_peak_mb') is not None:
+            current_mb, previous_mb = case['traced_peak_mb'], base['traced_peak_mb']
+            if current_mb > previous_mb * (1 + memory_threshold) and current_mb - previous_mb > MEMORY_NOISE_MB:
+                regressions.append(f"{name}: {current_mb / previous_mb - 1:+.0%} memory "
+                                   f"({previous_mb:.1f} -> {current_mb:.1f} MB)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the conversion pipeline on synthetic data')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE),
+                        help='Baseline JSON to compare with or update (default: benchmarks/baseline.json)')
+    parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--output', default=None, metavar='JSON', help='Also write the results here')
+    parser.add_argument('--cases', nargs='+', default=None, metavar='PREFIX',
+                        help='Only run cases named PREFIX or PREFIX/... (e.g. forward convert/skinned)')
+    parser.add_argument('--lengths', type=int, nargs='+', default=list(DEFAULT_LENGTHS),
+                        help=f'Sign lengths in frames (default: {" ".join(map(str, DEFAULT_LENGTHS))})')
+    parser.add_argument('--repeats', type=int, default=None,
+                        help=f'Timed runs per case (default: {DEFAULT_REPEATS}, {QUICK_REPEATS} with --quick)')
+    parser.add_argument('--quick', action='store_true', help='Fewer repeats, no memory pass')
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help=f'Fail when a case is this much slower (default: {DEFAULT_TIME_THRESHOLD})')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help=f'Fail when a case uses this much more memory (default: {DEFAULT_MEMORY_THRESHOLD})')
+    parser.add_argument('--absolute', action='store_true',
+                        help='Compare raw seconds instead of calibration-relative times (same machine only)')
+    args = parser.parse_args()
+
+    repeats = args.repeats or (QUICK_REPEATS if args.quick else DEFAULT_REPEATS)
+    results = run_suite(args.lengths, repeats, args.cases, memory=not args.quick)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        if args.cases and baseline_path.exists():
+            # Partial runs only replace their own cases
+            with open(baseline_path) as f:
+                baseline = json.load(f)
+            results = {**results, 'cases': {**baseline['cases'], **results['cases']}}
+        with open(baseline_path, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"\n✅ Baseline written: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\n⚠️  No baseline at {baseline_path}; run with --update-baseline to record one")
+        return 0
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline.get('format') != BASELINE_FORMAT:
+        print(f"❌ ERROR: Unsupported baseline format in {baseline_path}")
+        return 1
+
+    regressions = compare(results, baseline, args.time_threshold, args.memory_threshold, args.absolute)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) against {baseline_path}:")
+        for message in regressions:
+            print(f"   {message}")
+        return 1
+    print(f"\n✅ No regressions against {baseline_path} "
+          f"(time +{args.time_threshold:.0%}, memory +{args.memory_threshold:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Synthetic SMPL-X model and SignAvatars parameters for offline tests and benchmarks.
+
+The licensed SMPL-X model and the SignAvatars data cannot live in CI, so this
+writes stand-ins with the same array shapes and sizes: a SMPL-X .npz with
+10,475 vertices, 20,908 faces, 55 joints in the SMPL-X kinematic tree, 400
+shape/expression and 486 pose-corrective blend shapes, and .pkl files with
+(frames, 182) 'smplx' rows. Geometry is random but well formed (vertices are
+clustered around their skinning joint), and the motion is smooth, so keyframe
+selection and basis fitting behave like they do on real signs.
+
+The pickles hold NumPy arrays rather than torch tensors, so loading them
+needs no torch.
+
+Usage:
+    python benchmarks/synthetic.py --out /tmp/synthetic --lengths 30 90 300
+    # -> /tmp/synthetic/models/smplx/SMPLX_NEUTRAL.npz, /tmp/synthetic/pkl/SYN-00090.pkl, ...
+"""
+
+import argparse
+import pickle
+import numpy as np
+from pathlib import Path
+
+NUM_VERTICES = 10475
+NUM_FACES = 20908
+NUM_SHAPE_COMPONENTS = 400  # 300 shape + 100 expression
+NUM_POSE_FEATURES = 486  # 54 joints x 9
+
+# SMPL-X kinematic tree (parent of each of the 55 joints)
+PARENTS = [-1, 0, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 9, 9, 12, 13, 14, 16, 17, 18, 19, 15, 15, 15,
+           20, 25, 26, 20, 28, 29, 20, 31, 32, 20, 34, 35, 20, 37, 38,
+           21, 40, 41, 21, 43, 44, 21, 46, 47, 21, 49, 50, 21, 52, 53]
+
+PARAM_DIM = 182
+DEFAULT_LENGTHS = (30, 90, 300)
+
+
+def write_synthetic_model(model_dir, seed=0):
+    """Write MODEL_DIR/smplx/SMPLX_NEUTRAL.npz with random but well-formed SMPL-X arrays. Returns its path."""
+    rng = np.random.default_rng(seed)
+    num_joints = len(PARENTS)
+    joints = np.zeros((num_joints, 3))
+    for i in range(1, num_joints):
+        joints[i] = joints[PARENTS[i]] + rng.normal(0, 0.1, 3)
+    owner = rng.integers(0, num_joints, NUM_VERTICES)
+    weights = np.zeros((NUM_VERTICES, num_joints))
+    weights[np.arange(NUM_VERTICES), owner] = 0.7
+    weights[np.arange(NUM_VERTICES), np.maximum(np.array(PARENTS)[owner], 0)] += 0.3
+    regressor = np.zeros((num_joints, NUM_VERTICES))
+    for j in range(num_joints):
+        members = np.flatnonzero(owner == j)[:8]
+        regressor[j, members] = 1 / len(members)
+    faces = np.arange(NUM_FACES)[:, None] % (NUM_VERTICES - 2) + np.arange(3)
+
+    path = Path(model_dir) / 'smplx' / 'SMPLX_NEUTRAL.npz'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path,
+             v_template=joints[owner] + rng.normal(0, 0.03, (NUM_VERTICES, 3)),
+             f=faces.astype(np.int64),
+             shapedirs=rng.normal(0, 1e-3, (NUM_VERTICES, 3, NUM_SHAPE_COMPONENTS)).astype(np.float32),
+             posedirs=rng.normal(0, 1e-3, (NUM_VERTICES, 3, NUM_POSE_FEATURES)).astype(np.float32),
+             J_regressor=regressor,
+             weights=weights,
+             kintree_table=np.array([[2 ** 32 - 1] + PARENTS[1:], list(range(num_joints))], dtype=np.int64),
+             hands_componentsl=np.eye(45), hands_componentsr=np.eye(45),
+             hands_meanl=rng.normal(0, 0.2, 45), hands_meanr=rng.normal(0, 0.2, 45),
+             lmk_faces_idx=np.zeros(51, dtype=np.int64), lmk_bary_coords=np.full((51, 3), 1 / 3))
+    return path
+
+
+def synthetic_params(num_frames, seed=0, fps=30):
+    """
+    (num_frames, 182) float32 SignAvatars rows: smooth sinusoidal joint
+    motion (larger for the arms and hands), a little expression, one fixed
+    body shape and a slow drift in translation.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(num_frames)[:, None] / fps
+    amplitude = np.full(PARAM_DIM, 0.05)
+    amplitude[3:66] = 0.15  # body
+    amplitude[3 + 3 * 12:3 + 3 * 21] = 0.5  # shoulders, elbows, wrists (joints 13-21)
+    amplitude[66:90] = 0.4  # hands
+    amplitude[99:109] = 0.3  # expression
+    frequency = rng.uniform(0.2, 1.5, PARAM_DIM)
+    phase = rng.uniform(0, 2 * np.pi, PARAM_DIM)
+    params = amplitude * np.sin(2 * np.pi * frequency * t + phase)
+    params[:, 109:119] = rng.normal(0, 0.5, 10)  # betas, constant over the sign
+    params[:, 119:122] = 0.02 * t  # transl
+    return params.astype(np.float32)
+
+
+def write_synthetic_pkls(pkl_dir, lengths=DEFAULT_LENGTHS, seed=0):
+    """Write one SYN-<frames>.pkl per length, shaped like SignAvatars files. Returns the paths."""
+    pkl_dir = Path(pkl_dir)
+    pkl_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, num_frames in enumerate(lengths):
+        path = pkl_dir / f"SYN-{num_frames:05d}.pkl"
+        with open(path, 'wb') as f:
+            pickle.dump({'smplx': synthetic_params(num_frames, seed + i)}, f)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic SMPL-X model and SignAvatars-style .pkl files')
+    parser.add_argument('--out', required=True, help='Output directory (gets models/ and pkl/)')
+    parser.add_argument('--lengths', type=int, nargs='+', default=list(DEFAULT_LENGTHS),
+                        help=f'Frame counts of the .pkl files (default: {" ".join(map(str, DEFAULT_LENGTHS))})')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    model_path = write_synthetic_model(out / 'models', args.seed)
+    pkl_paths = write_synthetic_pkls(out / 'pkl', args.lengths, args.seed)
+    print(f"✅ Synthetic SMPL-X model: {model_path}")
+    print(f"✅ {len(pkl_paths)} .pkl files in {out / 'pkl'} ({', '.join(map(str, args.lengths))} frames)")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
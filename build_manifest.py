@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Content-hash build manifest for batch GLB conversion.
+
+For each output GLB the manifest records SHA-256 hashes of everything that
+determines it: the source .pkl, the SMPL-X model file and the converter
+settings (including CONVERTER_VERSION). A batch only reconverts entries whose
+fingerprint changed or whose output is missing.
+
+File hashes are cached by (size, mtime) so unchanged inputs are not re-read
+on every run.
+
+Usage:
+    manifest = BuildManifest('animations/.build-manifest.json', 'signavatars-data/models', settings)
+    fingerprint = manifest.fingerprint('signavatars-data/asl-word-level/00384.pkl')
+    if not manifest.is_current('animations/WORD-00384.glb', fingerprint):
+        ...convert...
+        manifest.record('animations/WORD-00384.glb', fingerprint)
+        manifest.save()
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from conversion_settings import CONVERTER_VERSION
+
+DEFAULT_MANIFEST = Path("animations/.build-manifest.json")
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def settings_sha256(settings):
+    """
+    SHA-256 of converter settings, independent of key order.
+
+    Optional features left off (None) are omitted, so adding a new setting
+    does not invalidate GLBs built before it existed.
+    """
+    enabled = {key: value for key, value in settings.items() if value is not None}
+    payload = json.dumps({'converter_version': CONVERTER_VERSION, **enabled}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def find_smplx_model_file(smplx_model_path, gender='neutral', ext='npz'):
+    """Resolve the SMPL-X model file smplx.create() would load for a model path."""
+    path = Path(smplx_model_path)
+    if path.is_file():
+        return path
+    model_fn = f"SMPLX_{gender.upper()}.{ext}"
+    for candidate in (path / 'smplx' / model_fn, path / model_fn):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+class BuildManifest:
+    """Tracks input fingerprints of converted GLBs across batch runs."""
+
+    def __init__(self, path, smplx_model_path, settings):
+        self.path = Path(path)
+        self.entries = {}
+        self.hash_cache = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                data = json.load(f)
+            self.entries = data.get('entries', {})
+            self.hash_cache = data.get('hash_cache', {})
+
+        model_file = find_smplx_model_file(smplx_model_path)
+        self.model_hash = self.cached_sha256(model_file) if model_file else None
+        # A shared basis file is an input too: refitting it invalidates every weight track
+        if settings.get('shared_basis') and Path(settings['shared_basis']).exists():
+            settings = {**settings, 'shared_basis_sha256': self.cached_sha256(settings['shared_basis'])}
+        self.settings_hash = settings_sha256(settings)
+
+    def cached_sha256(self, path):
+        """file_sha256, reusing the stored digest while size and mtime are unchanged."""
+        stat = os.stat(path)
+        key = str(path)
+        cached = self.hash_cache.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+        digest = file_sha256(path)
+        self.hash_cache[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        return digest
+
+    def fingerprint(self, pkl_path):
+        """Hashes of the three inputs that determine an output GLB."""
+        return {
+            'pkl': self.cached_sha256(pkl_path),
+            'smplx_model': self.model_hash,
+            'settings': self.settings_hash,
+        }
+
+    def is_current(self, output_path, fingerprint):
+        """True if output_path exists and was built from exactly these inputs."""
+        return Path(output_path).exists() and self.entries.get(str(output_path)) == fingerprint
+
+    def record(self, output_path, fingerprint):
+        self.entries[str(output_path)] = fingerprint
+
+    def save(self):
+        """Write the manifest atomically so an interrupted batch keeps finished entries."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'entries': self.entries, 'hash_cache': self.hash_cache}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Converter settings shared by convert_pkl_to_glb.py and the batch scripts.
+
+Kept free of torch/smplx imports so batch parents can parse and hash settings
+without loading the conversion stack.
+"""
+
+# Bump when the converter's output changes for the same inputs and settings,
+# so build manifests treat every existing GLB as stale.
+CONVERTER_VERSION = 1
+
+# Frames per SMPL-X forward pass in batched mode
+DEFAULT_CHUNK_SIZE = 64
+
+# Posed vertex sequences cached by --vertex-cache (see vertex_cache.py)
+DEFAULT_VERTEX_CACHE = "signavatars-data/vertex-cache"
+DEFAULT_VERTEX_CACHE_GB = 20
+
+# Vocabulary basis written by shared_basis.py and read by --mode weights
+DEFAULT_SHARED_BASIS = "animations/shared-basis.npz"
+
+# Having 60-90 morph targets per sign causes GPU jerkiness, so signs are
+# subsampled to ~20 keyframes by default
+DEFAULT_MAX_KEYFRAMES = 20
+
+# Converter settings that change the exported GLB.
+# max_keyframes=None exports every source frame.
+# quantize: None (float32), 'int16' or 'int8' morph deltas via KHR_mesh_quantization.
+# mode: None (morph-target keyframes), 'skinned' (joint rotations at full frame rate) or
+# 'animation' (skinned, but only the animation; binds to the shared base avatar) or
+# 'basis' (per-sign PCA morph targets with full-rate weight curves) or
+# 'weights' (weight curves only, over the vocabulary basis in shared_basis, an .npz path).
+# basis_tolerance / max_basis: None (motion_basis defaults, 2 mm and 8) or the
+# max vertex error in metres and component limit for 'basis'.
+# keyframe_tolerance: None (fixed stride) or the max vertex error in metres for
+# adaptive keyframe selection; max_keyframes then caps the key count.
+# interpolation: None (LINEAR) or 'CUBICSPLINE' morph weight curves.
+# sparse_threshold: None (dense morphs) or metres below which per-vertex deltas are
+# dropped and morph targets are written as sparse accessors.
+DEFAULT_SETTINGS = {
+    'mode': None,
+    'max_keyframes': DEFAULT_MAX_KEYFRAMES,
+    'fps': 30,
+    'quantize': None,
+    'sparse_threshold': None,
+    'keyframe_tolerance': None,
+    'interpolation': None,
+    'basis_tolerance': None,
+    'max_basis': None,
+    'shared_basis': None,
+}
+
+
+def add_settings_arguments(parser):
+    """Add the export settings options to an argparse parser."""
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Frames per batched SMPL-X forward pass (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--vertex-cache', nargs='?', const=DEFAULT_VERTEX_CACHE, default=None, metavar='DIR',
+                        help=f'Reuse posed vertex sequences cached in DIR instead of re-running the body '
+                             f'model (default DIR: {DEFAULT_VERTEX_CACHE})')
+    parser.add_argument('--vertex-cache-dtype', choices=['float32', 'float16'], default='float32',
+                        help='Precision of cached vertices; float16 halves the cache (default: float32)')
+    parser.add_argument('--vertex-cache-size', type=float, default=DEFAULT_VERTEX_CACHE_GB, metavar='GB',
+                        help=f'Evict least recently used entries above this size (default: {DEFAULT_VERTEX_CACHE_GB})')
+    parser.add_argument('--mode', choices=['morph', 'skinned', 'animation', 'basis', 'weights'], default='morph',
+                        help='morph: keyframes baked into morph targets; skinned: SMPL-X skeleton '
+                             'with per-joint rotations at the full frame rate; animation: skinned '
+                             'channels only, played on the shared base-avatar-<hash>.glb; basis: a few PCA '
+                             'morph targets with full-rate weight curves; weights: weight curves only, '
+                             'over the vocabulary basis from shared_basis.py (default: morph)')
+    parser.add_argument('--shared-basis', default=DEFAULT_SHARED_BASIS, metavar='NPZ',
+                        help=f'weights mode: basis written by shared_basis.py (default: {DEFAULT_SHARED_BASIS})')
+    parser.add_argument('--basis-tolerance', type=float, default=None, metavar='METRES',
+                        help='basis mode: add components until every vertex is within this error '
+                             '(default: 0.002)')
+    parser.add_argument('--max-basis', type=int, default=None, metavar='N',
+                        help='basis mode: at most N morph targets (default: 8)')
+    parser.add_argument('--keyframes', type=int, default=DEFAULT_MAX_KEYFRAMES,
+                        help=f'Approximate number of keyframes to export (default: {DEFAULT_MAX_KEYFRAMES})')
+    parser.add_argument('--all-frames', action='store_true',
+                        help='Export every source frame instead of subsampled keyframes')
+    parser.add_argument('--keyframe-tolerance', type=float, default=None, metavar='METRES',
+                        help='Pick the fewest keyframes keeping every frame within this vertex error '
+                             '(e.g. 0.002 = 2 mm); --keyframes becomes the upper limit')
+    parser.add_argument('--cubic', action='store_true',
+                        help='Write CUBICSPLINE morph weight curves (fewer keys for the same error)')
+    parser.add_argument('--quantize', choices=['int16', 'int8'], default=None,
+                        help='Store positions as normalized int16 and morph deltas as int16/int8 '
+                             '(KHR_mesh_quantization)')
+    parser.add_argument('--sparse-threshold', type=float, default=None, metavar='METRES',
+                        help='Drop morph deltas smaller than this and store targets as sparse '
+                             'accessors (e.g. 0.0005 = 0.5 mm)')
+    return parser
+
+
+def settings_from_args(args):
+    """Build converter settings from parsed CLI arguments."""
+    return {
+        **DEFAULT_SETTINGS,
+        'mode': None if args.mode == 'morph' else args.mode,
+        'max_keyframes': None if args.all_frames else args.keyframes,
+        'quantize': args.quantize,
+        'sparse_threshold': args.sparse_threshold,
+        'keyframe_tolerance': args.keyframe_tolerance,
+        'interpolation': 'CUBICSPLINE' if args.cubic else None,
+        'basis_tolerance': args.basis_tolerance,
+        'max_basis': args.max_basis,
+        'shared_basis': args.shared_basis if args.mode == 'weights' else None,
+    }
@@ -2,14 +2,21 @@
 """
 Convert just the 24 demo words to GLB format (quick test).
 """
-import subprocess
-import sys
+import argparse
 import json
+import time
 from pathlib import Path
 
+from batch_engine import ConversionJob, run_batch, add_batch_arguments
+from build_manifest import BuildManifest
+from conversion_settings import add_settings_arguments, settings_from_args
+from vertex_cache import vertex_cache_from_args
+from instrumentation import add_report_arguments, report_runs
+
 PKL_DIR = Path("signavatars-data/asl-word-level")
 OUT_DIR = Path("animations")
 SMPLX_MODEL = "signavatars-data/models"
+MANIFEST = OUT_DIR / ".build-manifest.json"
 
 # The 24 words shown in the HTML demo grid
 DEMO_WORDS = [
@@ -18,59 +25,81 @@ DEMO_WORDS = [
     "AFTERNOON", "AGAIN", "AGAINST", "AGE", "AGREE", "AID", "AIM", "AIRPLANE"
 ]
 
-# Load word mapping
-with open("wlasl_mapping.json") as f:
-    mapping = json.load(f)
-
-# Convert each demo word
-success = 0
-failed = 0
-
-for word in DEMO_WORDS:
-    if word not in mapping:
-        print(f"❌ {word}: not in WLASL mapping!")
-        failed += 1
-        continue
-    
-    info = mapping[word]
-    file_id = info["file_id"]
-    pkl_path = PKL_DIR / f"{file_id}.pkl"
-    out_path = OUT_DIR / f"WORD-{file_id}.glb"
-    
-    if not pkl_path.exists():
-        print(f"❌ {word}: pkl file not found: {pkl_path}")
-        failed += 1
-        continue
-    
-    print(f"\n🔄 [{word}] {pkl_path.name} -> WORD-{file_id}.glb")
-    
-    try:
-        result = subprocess.run(
-            [sys.executable, "convert_pkl_to_glb.py",
-             "--input", str(pkl_path),
-             "--output", str(out_path),
-             "--word", word,
-             "--smplx-model", SMPLX_MODEL],
-            capture_output=True, text=True, timeout=120
-        )
-        
-        if result.returncode == 0:
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the demo grid words to GLB')
+    add_batch_arguments(parser)
+    add_settings_arguments(parser)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    settings = settings_from_args(args)
+    manifest = BuildManifest(MANIFEST, SMPLX_MODEL, settings)
+
+    # Load word mapping
+    with open("wlasl_mapping.json") as f:
+        mapping = json.load(f)
+
+    success = 0
+    failed = 0
+    skipped = 0
+
+    jobs = []
+    fingerprints = {}
+    for word in DEMO_WORDS:
+        if word not in mapping:
+            print(f"❌ {word}: not in WLASL mapping!")
+            failed += 1
+            continue
+
+        info = mapping[word]
+        file_id = info["file_id"]
+        pkl_path = PKL_DIR / f"{file_id}.pkl"
+        out_path = OUT_DIR / f"WORD-{file_id}.glb"
+
+        if not pkl_path.exists():
+            print(f"❌ {word}: pkl file not found: {pkl_path}")
+            failed += 1
+            continue
+
+        fingerprint = manifest.fingerprint(pkl_path)
+        if not args.force and manifest.is_current(out_path, fingerprint):
+            print(f"⏩ {word}: {out_path.name} is up to date")
+            skipped += 1
+            continue
+
+        fingerprints[str(out_path)] = fingerprint
+        jobs.append(ConversionJob(str(pkl_path), str(out_path), word))
+
+    # Convert each demo word
+    results = run_batch(jobs, SMPLX_MODEL, workers=args.workers, threads_per_worker=args.threads_per_worker,
+                        settings=settings, chunk_size=args.chunk_size,
+                        vertex_cache=vertex_cache_from_args(args), profile=args.profile)
+    reports = []
+    start = time.perf_counter()
+    for result in results:
+        job = result['job']
+        reports.append(result['report'])
+        print(f"\n🔄 [{job.word}] {Path(job.input_path).name} -> {Path(job.output_path).name}")
+
+        if result['ok']:
             success += 1
-            lines = result.stdout.strip().split("\n")
-            for line in lines[-3:]:
+            manifest.record(job.output_path, fingerprints[job.output_path])
+            manifest.save()
+            for line in result['log'][-3:]:
                 print(f"  {line}")
         else:
             failed += 1
-            stderr = result.stderr[-300:] if result.stderr else ""
-            stdout = result.stdout[-300:] if result.stdout else ""
             print(f"  ❌ FAILED")
-            if stderr:
-                print(f"  stderr: {stderr}")
-            if stdout:
-                print(f"  stdout: {stdout}")
-    except subprocess.TimeoutExpired:
-        failed += 1
-        print(f"  ❌ TIMEOUT")
-
-print(f"\n{'='*60}")
-print(f"Demo conversion complete: {success} success, {failed} failed")
+            print(f"  error: {result['error'][-300:]}")
+            print(f"  output: {' | '.join(result['log'][-3:])}")
+
+    print(f"\n{'='*60}")
+    print(f"Demo conversion complete: {success} success, {failed} failed, {skipped} up to date")
+
+    if reports and (args.report or args.profile):
+        report_runs(args.report, reports, wall_seconds=time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,97 +6,189 @@ Usage:
     python convert_pkl_to_glb.py --input signavatars-data/asl-word-level/00295.pkl --output animations/sign-00295.glb --word "example"
 
 Requirements:
-    pip install torch smplx trimesh pyrender numpy scipy
+    pip install numpy
+    pip install torch         # to decode .pkl files not yet in the parameter store (param_store.py)
+    pip install torch smplx   # only for --body-model torch
 """
 
 import argparse
-import torch
 import numpy as np
-import trimesh
 import json
 import sys
 from pathlib import Path
 
-try:
-    import smplx
-    SMPLX_AVAILABLE = True
-except ImportError:
-    SMPLX_AVAILABLE = False
-    print("ERROR: smplx not installed. Install with: pip install smplx")
-    exit(1)
+from glb_writer import GLBWriter, ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER, quantize_normalized, pad_vec3
+from motion_basis import DEFAULT_BASIS_TOLERANCE, DEFAULT_MAX_BASIS, fit_motion_basis
+from keyframe_reduction import cubic_spline_output, max_weight_sum, select_adaptive_keyframes
+from param_store import load_params
+from build_manifest import find_smplx_model_file
+from vertex_cache import vertex_cache_from_args
+from instrumentation import add_report_arguments, measure, report_runs, stage
+from conversion_settings import (DEFAULT_CHUNK_SIZE, DEFAULT_MAX_KEYFRAMES, DEFAULT_SETTINGS, DEFAULT_SHARED_BASIS,
+                                 add_settings_arguments, settings_from_args)
+
+from smplx_numpy import SMPLXModel, create as create_numpy_smplx
 
 
 def load_pkl_params(pkl_path):
-    """Load SMPL-X parameters from .pkl file (PyTorch format)."""
-    # Custom unpickler to handle CUDA tensors
-    import pickle
-    import io
-    
-    class CPU_Unpickler(pickle.Unpickler):
-        def find_class(self, module, name):
-            if module == 'torch.storage' and name == '_load_from_bytes':
-                # Override to force CPU loading
-                return lambda b: torch.load(io.BytesIO(b), map_location='cpu', weights_only=False)
-            return super().find_class(module, name)
-    
-    # Load with custom unpickler
-    with open(pkl_path, 'rb') as f:
-        data = CPU_Unpickler(f).load()
-    
-    # Ensure all tensors are on CPU
-    def to_cpu(obj):
-        if isinstance(obj, torch.Tensor):
-            return obj.cpu()
-        elif isinstance(obj, dict):
-            return {k: to_cpu(v) for k, v in obj.items()}
-        elif isinstance(obj, (list, tuple)):
-            return type(obj)(to_cpu(item) for item in obj)
-        return obj
-    
-    data = to_cpu(data)
-    
-    print(f"Loaded {pkl_path}")
-    print(f"Available keys: {list(data.keys())}")
-    
-    # Convert PyTorch tensors to numpy arrays
-    params = {}
-    for key, value in data.items():
-        if isinstance(value, torch.Tensor):
-            params[key] = value.detach().cpu().numpy()
-        else:
-            params[key] = value
+    """
+    Load SMPL-X parameters for a .pkl file (PyTorch format).
+
+    Reads from the packed parameter store when it holds the unchanged file
+    (see param_store.py), otherwise decodes the pickle.
+    """
+    with stage('load') as record:
+        params = load_params(pkl_path)
+    smplx_params = params.get('smplx')
+    if smplx_params is not None:
+        record['frames'] += len(smplx_params)
+    shape = f"smplx {tuple(smplx_params.shape)}" if smplx_params is not None else f"keys {list(params)}"
+    print(f"Loaded {pkl_path}: {shape}")
+    return params
+
+
+# SignAvatars 'smplx' rows are (num_frames, 182):
+#   3 (global_orient) + 63 (body_pose) + 12 (left_hand) + 12 (right_hand) +
+#   3 (jaw) + 3 (leye) + 3 (reye) + 10 (expression) + 10 (betas) + 3 (transl) + other params
+# Each entry is (name, width); hands are stored as 12 params and padded to 45 later.
+SIGNAVATARS_LAYOUT = [
+    ('global_orient', 3),
+    ('body_pose', 63),
+    ('left_hand_pose', 12),
+    ('right_hand_pose', 12),
+    ('jaw_pose', 3),
+    ('leye_pose', 3),
+    ('reye_pose', 3),
+    ('expression', 10),
+    ('betas', 10),
+    ('transl', 3),
+]
+
+# SMPL-X uses 15 hand joints x 3 rotations per hand
+SMPLX_HAND_POSE_DIM = 45
+
+
+def layout_slice(name):
+    """Column slice of one SIGNAVATARS_LAYOUT block in a 182-dim parameter row."""
+    start = 0
+    for block, width in SIGNAVATARS_LAYOUT:
+        if block == name:
+            return slice(start, start + width)
+        start += width
+    raise KeyError(name)
+
+
+def with_mean_shape(params):
+    """Copy of params with betas zeroed, for signs retargeted to a shared mean-shape avatar."""
+    smplx_params = np.array(params['smplx'], dtype=np.float32)
+    smplx_params[:, layout_slice('betas')] = 0.0
+    return {**params, 'smplx': smplx_params}
+
+
+# Body-model options for SignAvatars parameters (also part of the vertex cache key)
+SMPLX_OPTIONS = {
+    'model_type': 'smplx',
+    'gender': 'neutral',
+    'use_face_contour': False,
+    'num_betas': 10,
+    'num_expression_coeffs': 10,
+    'use_pca': False,  # SignAvatars uses full hand pose, not PCA
+    'flat_hand_mean': True,
+    'ext': 'npz',
+}
+
+
+# 'numpy' evaluates SMPL-X with smplx_numpy.py; 'torch' uses the smplx package
+BODY_MODEL_BACKENDS = ('numpy', 'torch')
+
+
+def load_smplx_model(smplx_model_path, backend='numpy'):
+    """Create the SMPL-X body model used for SignAvatars parameters."""
+    if backend == 'numpy':
+        return create_numpy_smplx(smplx_model_path, **SMPLX_OPTIONS)
+    if backend != 'torch':
+        raise ValueError(f"Unknown body model backend: {backend}")
     
-    # Check dimensions
-    for key, value in params.items():
-        if hasattr(value, 'shape'):
-            print(f"  {key}: shape {value.shape}")
+    try:
+        import smplx
+    except ImportError:
+        raise ImportError("smplx library required for the torch backend: pip install torch smplx")
+    model = smplx.create(smplx_model_path, **SMPLX_OPTIONS)
+    # Lets the vertex cache key entries by the model file's content
+    model_file = find_smplx_model_file(smplx_model_path, SMPLX_OPTIONS['gender'], SMPLX_OPTIONS['ext'])
+    model.model_file = str(model_file) if model_file else None
+    return model
+
+
+def body_model_backend(smplx_model):
+    """'numpy' or 'torch', for a model from load_smplx_model."""
+    return 'numpy' if isinstance(smplx_model, SMPLXModel) else 'torch'
+
+
+def body_model_vertices(smplx_model, inputs):
+    """(F, V, 3) float32 vertices for a dict of (F, width) float32 SMPL-X inputs, with either backend."""
+    if isinstance(smplx_model, SMPLXModel):
+        return smplx_model(**inputs).vertices
     
-    return params
+    import torch
+    with torch.no_grad():
+        output = smplx_model(**{name: torch.from_numpy(values) for name, values in inputs.items()},
+                             return_verts=True)
+    return output.vertices.detach().cpu().numpy()
+
+
+def parse_smplx_params(smplx_params):
+    """
+    Split a (num_frames, 182) SignAvatars array into SMPL-X inputs for all frames at once.
+    
+    Returns a dict of float32 (num_frames, width) arrays keyed by SMPL-X argument name.
+    Blocks past the end of a shorter parameter vector are zero-filled.
+    """
+    smplx_params = np.asarray(smplx_params, dtype=np.float32)
+    num_frames, param_dim = smplx_params.shape
+    
+    with stage('parse', frames=num_frames):
+        parsed = {}
+        idx = 0
+        for name, width in SIGNAVATARS_LAYOUT:
+            block = np.zeros((num_frames, width), dtype=np.float32)
+            available = max(0, min(width, param_dim - idx))
+            block[:, :available] = smplx_params[:, idx:idx+available]
+            parsed[name] = block
+            idx += width
+        
+        # Pad hand pose from 12 to 45 parameters (15 joints × 3 rotations)
+        # SignAvatars uses simplified 4-finger model, SMPL-X uses 15 joints
+        for name in ('left_hand_pose', 'right_hand_pose'):
+            hand_pose = np.zeros((num_frames, SMPLX_HAND_POSE_DIM), dtype=np.float32)
+            hand_pose[:, :parsed[name].shape[1]] = parsed[name]
+            parsed[name] = hand_pose
+    
+    return parsed
+
+
+def select_keyframe_indices(frame_count, max_keyframes=DEFAULT_MAX_KEYFRAMES):
+    """
+    Pick evenly spaced keyframe indices, always including the first and last frame.
+    
+    max_keyframes=None keeps every frame.
+    """
+    if frame_count <= 0:
+        return []
+    step = 1 if max_keyframes is None else max(1, frame_count // max_keyframes)
+    keyframe_indices = list(range(0, frame_count, step))
+    if keyframe_indices[-1] != frame_count - 1:
+        keyframe_indices.append(frame_count - 1)  # Always include last frame
+    return keyframe_indices
 
 
-def params_to_mesh_sequence(params, smplx_model_path):
-    """Convert SMPL-X parameters to mesh sequence (animation)."""
-    if not SMPLX_AVAILABLE:
-        raise ImportError("smplx library required")
-    
-    # Initialize SMPL-X model
-    smplx_model = smplx.create(
-        smplx_model_path,
-        model_type='smplx',
-        gender='neutral',
-        use_face_contour=False,
-        num_betas=10,
-        num_expression_coeffs=10,
-        use_pca=False,  # SignAvatars uses full hand pose, not PCA
-        flat_hand_mean=True,
-        ext='npz'
-    )
-    
-    # Extract SMPL-X parameters from SignAvatars format
-    # The 'smplx' key contains shape (num_frames, 182) where 182 = 
-    # 3 (global_orient) + 63 (body_pose) + 12 (left_hand) + 12 (right_hand) + 
-    # 10 (betas) + 3 (transl) + other params
+def params_to_vertices(params, smplx_model, chunk_size=DEFAULT_CHUNK_SIZE, frame_indices=None):
+    """
+    Run the SMPL-X forward pass for a whole sign in batched chunks.
     
+    If frame_indices is given, only those frames go through the body model.
+    Returns a single (num_selected_frames, num_vertices, 3) float32 vertex array.
+    """
     smplx_params = params.get('smplx')
     if smplx_params is None:
         raise ValueError("No 'smplx' key found in parameters")
@@ -106,284 +198,478 @@ def params_to_mesh_sequence(params, smplx_model_path):
     print(f"  Frames: {num_frames}")
     print(f"  Parameter dimension: {param_dim}")
     
-    # Parse SignAvatars SMPL-X format (based on their codebase)
-    # Standard SMPL-X ordering from their annotations
-    meshes = []
-    for frame_idx in range(num_frames):
-        frame_params = smplx_params[frame_idx]
-        
-        # Parse parameter vector
-        # Based on SignAvatars format: parameters (182 total)
-        # Note: SignAvatars uses 12-param hand pose (4 fingers × 3 params), we need to pad to 45 (15 joints × 3)
-        idx = 0
-        global_orient = frame_params[idx:idx+3]
-        idx += 3
-        body_pose = frame_params[idx:idx+63]
-        idx += 63
-        left_hand_pose_12 = frame_params[idx:idx+12]
-        idx += 12
-        right_hand_pose_12 = frame_params[idx:idx+12]
-        idx += 12
-        
-        # Pad hand pose from 12 to 45 parameters (15 joints × 3 rotations)
-        # SignAvatars uses simplified 4-finger model, SMPL-X uses 15 joints
-        left_hand_pose = np.zeros(45)
-        left_hand_pose[:12] = left_hand_pose_12
-        right_hand_pose = np.zeros(45)
-        right_hand_pose[:12] = right_hand_pose_12
-        
-        jaw_pose = frame_params[idx:idx+3]
-        idx += 3
-        leye_pose = frame_params[idx:idx+3]
-        idx += 3
-        reye_pose = frame_params[idx:idx+3]
-        idx += 3
-        
-        # Expression and betas
-        expression = frame_params[idx:idx+10] if idx < param_dim else np.zeros(10)
-        idx += 10
-        betas = frame_params[idx:idx+10] if idx < param_dim else np.zeros(10)
-        idx += 10
-        transl = frame_params[idx:idx+3] if idx < param_dim else np.zeros(3)
+    parsed = parse_smplx_params(smplx_params)
+    if frame_indices is not None:
+        parsed = {name: values[frame_indices] for name, values in parsed.items()}
+        num_frames = len(frame_indices)
+        print(f"  Evaluating {num_frames} selected frames")
+    chunk_size = max(1, int(chunk_size))
+    
+    num_vertices = smplx_model.v_template.shape[0]
+    vertices = np.empty((num_frames, num_vertices, 3), dtype=np.float32)
+    
+    for start in range(0, num_frames, chunk_size):
+        stop = min(start + chunk_size, num_frames)
+        with stage('forward', frames=stop - start):
+            vertices[start:stop] = body_model_vertices(
+                smplx_model, {name: np.ascontiguousarray(values[start:stop]) for name, values in parsed.items()})
+        print(f"  Processed frames {start + 1}-{stop}/{num_frames}")
+    
+    return vertices
+
+
+def sign_vertices(input_path, params, smplx_model, chunk_size=DEFAULT_CHUNK_SIZE, frame_indices=None,
+                  vertex_cache=None, mean_shape=False):
+    """
+    params_to_vertices for one sign, through the vertex cache when one is given.
+    
+    The cache always holds the full sequence, so any frame selection can be
+    sliced from it. mean_shape says params had their betas zeroed (a different
+    cache entry from the source shape). Without an input_path (params not
+    read straight from a .pkl) the cache is bypassed. Returns a new float32 array.
+    """
+    if vertex_cache is None or input_path is None:
+        return params_to_vertices(params, smplx_model, chunk_size=chunk_size, frame_indices=frame_indices)
+    
+    key = vertex_cache.key(input_path, smplx_model, {**SMPLX_OPTIONS, 'mean_shape': mean_shape,
+                                                     'backend': body_model_backend(smplx_model)})
+    with stage('cache'):
+        vertices = vertex_cache.get(key)
+    if vertices is None:
+        vertices = params_to_vertices(params, smplx_model, chunk_size=chunk_size)
+        with stage('cache'):
+            vertex_cache.put(key, vertices)
+    else:
+        print(f"\nVertex cache hit: {len(vertices)} frames")
+    with stage('cache', frames=len(frame_indices) if frame_indices is not None else len(vertices)):
+        if frame_indices is not None:
+            vertices = vertices[frame_indices]
+        return np.array(vertices, dtype=np.float32)
+
+
+def params_to_mesh_sequence(params, smplx_model_path, chunk_size=DEFAULT_CHUNK_SIZE, frame_indices=None):
+    """
+    Convert SMPL-X parameters to a mesh sequence (animation).
+    
+    Returns (vertices (F, V, 3) float32, faces (N, 3)); every frame shares the faces.
+    """
+    smplx_model = load_smplx_model(smplx_model_path)
+    
+    vertices = params_to_vertices(params, smplx_model, chunk_size=chunk_size, frame_indices=frame_indices)
+    return vertices, np.asarray(smplx_model.faces)
+
+
+def vertex_normals(vertices, faces):
+    """
+    Unit vertex normals of one (V, 3) frame: face normals weighted by each
+    face's corner angle at the vertex (the same weighting as trimesh).
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces)
+    corners = vertices[faces]  # (N, 3 corners, 3)
+    
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    face_normals /= np.maximum(np.linalg.norm(face_normals, axis=1, keepdims=True), 1e-12)
+    
+    # Angle at each corner between its two outgoing edges
+    edges_out = np.roll(corners, -1, axis=1) - corners
+    edges_in = np.roll(corners, 1, axis=1) - corners
+    edges_out /= np.maximum(np.linalg.norm(edges_out, axis=2, keepdims=True), 1e-12)
+    edges_in /= np.maximum(np.linalg.norm(edges_in, axis=2, keepdims=True), 1e-12)
+    angles = np.arccos(np.clip((edges_out * edges_in).sum(axis=2), -1.0, 1.0))
+    
+    normals = np.zeros_like(vertices)
+    for axis in range(3):
+        normals[:, axis] = np.bincount(faces.reshape(-1), (angles * face_normals[:, axis:axis + 1]).reshape(-1),
+                                       minlength=len(vertices))
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+    return normals.astype(np.float32)
+
+
+# Skin-tone material for avatar visibility
+SKIN_MATERIAL = {
+    "pbrMetallicRoughness": {
+        "baseColorFactor": [0.76, 0.57, 0.45, 1.0],  # Warm skin tone
+        "metallicFactor": 0.0,
+        "roughnessFactor": 0.7
+    },
+    "doubleSided": True,
+    "name": "skin"
+}
+
+
+# Integer types for --quantize morph deltas (positions always use int16)
+QUANTIZED_MORPH_TYPES = {'int16': np.int16, 'int8': np.int8}
+
+
+@stage('pack')
+def write_morph_animation_glb(output_path, vertices, normals, faces, morph_targets, times, weights,
+                              interpolation="LINEAR", quantize=None, sparse_threshold=None, node_name=None):
+    """
+    Write a single-mesh GLB whose morph target weights are animated.
+    
+    vertices/normals are (V, 3), faces (N, 3), morph_targets (T, V, 3) position deltas,
+    times (K,) in seconds and weights the sampler output: (K, T) for LINEAR,
+    (3 * K, T) in-tangent/value/out-tangent rows for CUBICSPLINE.
+    
+    quantize='int16' or 'int8' stores positions as normalized int16, normals as
+    normalized int8 and morph deltas in the given type (KHR_mesh_quantization).
+    Positions are dequantized by the node's scale/translation; each morph target
+    gets its own scale from its min/max, folded into that target's weight curve.
+    
+    sparse_threshold (metres) zeroes per-vertex deltas that move less than the
+    threshold and writes each target as a sparse accessor of the moving vertices
+    whenever that is smaller than the dense array.
+    
+    With times and weights None the mesh and its targets are written without an
+    animation (a shared avatar whose weights are animated by other files).
+    
+    Returns {'bytes': file size, 'max_error': position error bound in metres,
+    'weight_scales': (T,) factors applied to the weights (1 unless quantized),
+    'morph_step': rounding error per unit of scaled weight}.
+    """
+    writer = GLBWriter()
+    writer.add('materials', SKIN_MATERIAL)
+    node = {"mesh": 0}
+    if node_name:
+        node["name"] = node_name
+    animated = times is not None
+    weights = np.asarray(weights if animated else np.zeros((0, len(morph_targets))),
+                         dtype=np.float32).reshape(-1, len(morph_targets))
+    weight_scales = np.ones(len(morph_targets), dtype=np.float32)
+    morph_step = 0.0
+    max_error = 0.0
+    
+    if sparse_threshold and len(morph_targets) and animated:
+        # Dropped deltas are at most sparse_threshold per target, per unit of weight
+        max_error += sparse_threshold * max_weight_sum(weights, times, interpolation)
+    
+    if quantize:
+        writer.require_extension("KHR_mesh_quantization")
+        morph_type = QUANTIZED_MORPH_TYPES[quantize]
         
-        # Forward pass through SMPL-X
-        output = smplx_model(
-            body_pose=torch.from_numpy(body_pose[np.newaxis, :]).float(),
-            global_orient=torch.from_numpy(global_orient[np.newaxis, :]).float(),
-            transl=torch.from_numpy(transl[np.newaxis, :]).float(),
-            betas=torch.from_numpy(betas[np.newaxis, :]).float(),
-            expression=torch.from_numpy(expression[np.newaxis, :]).float(),
-            left_hand_pose=torch.from_numpy(left_hand_pose[np.newaxis, :]).float(),
-            right_hand_pose=torch.from_numpy(right_hand_pose[np.newaxis, :]).float(),
-            jaw_pose=torch.from_numpy(jaw_pose[np.newaxis, :]).float(),
-            leye_pose=torch.from_numpy(leye_pose[np.newaxis, :]).float(),
-            reye_pose=torch.from_numpy(reye_pose[np.newaxis, :]).float(),
-            return_verts=True
-        )
+        # Uniform node scale maps the base mesh bounding box onto [-1, 1]
+        lower, upper = vertices.min(axis=0), vertices.max(axis=0)
+        center = (lower + upper) / 2
+        scale = float(max((upper - lower).max() / 2, 1e-8))
+        node.update(translation=center.tolist(), scale=[scale] * 3)
         
-        vertices = output.vertices.detach().cpu().numpy()[0]
-        faces = smplx_model.faces
+        local_positions = (vertices - center) / scale
+        positions = pad_vec3(quantize_normalized(local_positions, np.int16))
+        attributes = {
+            "POSITION": writer.add_accessor(positions, target=ARRAY_BUFFER, min_max=True,
+                                            normalized=True, accessor_type="VEC3"),
+            "NORMAL": writer.add_accessor(pad_vec3(quantize_normalized(normals, np.int8)), target=ARRAY_BUFFER,
+                                          normalized=True, accessor_type="VEC3"),
+        }
+    else:
+        attributes = {
+            "POSITION": writer.add_accessor(vertices.astype(np.float32), target=ARRAY_BUFFER, min_max=True),
+            "NORMAL": writer.add_accessor(normals.astype(np.float32), target=ARRAY_BUFFER),
+        }
+    
+    targets = []
+    weights = weights.copy()
+    for i, target in enumerate(morph_targets):
+        target = target.astype(np.float32)
+        moving = None
+        if sparse_threshold:
+            moving = np.abs(target).max(axis=1) > sparse_threshold
+            target[~moving] = 0.0
         
-        mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
-        meshes.append(mesh)
+        if quantize:
+            # Each target is stored relative to its own largest local delta;
+            # the weights are scaled by the same factor to compensate
+            local_delta = target / scale
+            target_scale = float(max(np.abs(local_delta).max(), 1e-12))
+            stored = quantize_normalized(local_delta / target_scale, morph_type)
+            weights[:, i] *= target_scale
+            weight_scales[i] = target_scale
+        else:
+            stored = target
         
-        if (frame_idx + 1) % 10 == 0 or frame_idx == 0:
-            print(f"  Processed frame {frame_idx + 1}/{num_frames}")
+        targets.append({"POSITION": writer.add_morph_target_accessor(stored, moving, normalized=bool(quantize))})
+    
+    if quantize:
+        # Rounding error is half a step, in node units times the node scale.
+        # Worst case over keys: base rounding plus every active target's rounding.
+        max_error += scale * 0.5 / np.iinfo(np.int16).max
+        morph_step = scale * 0.5 / np.iinfo(morph_type).max
+        if len(morph_targets) and animated:
+            max_error += max_weight_sum(weights, times, interpolation) * morph_step
+    
+    # Quantized output also narrows indices when the mesh allows it (SMPL-X has 10,475 vertices)
+    index_type = np.uint16 if quantize and len(vertices) < 65535 else np.uint32
+    indices = writer.add_accessor(faces.astype(index_type).reshape(-1), target=ELEMENT_ARRAY_BUFFER)
+    
+    primitive = {"attributes": attributes, "indices": indices, "material": 0}
+    mesh = {"primitives": [primitive]}
+    if targets:
+        primitive["targets"] = targets
+        mesh["weights"] = [0.0] * len(targets)
+    
+    writer.add('meshes', mesh)
+    writer.add('nodes', node)
+    writer.add('scenes', {"nodes": [0]})
+    writer.gltf['scene'] = 0
+    
+    if targets and animated:
+        times_accessor = writer.add_accessor(np.asarray(times, dtype=np.float32), min_max=True)
+        weights_accessor = writer.add_accessor(weights.reshape(-1))
+        writer.add('animations', {
+            "samplers": [{"input": times_accessor, "output": weights_accessor, "interpolation": interpolation}],
+            "channels": [{"sampler": 0, "target": {"node": 0, "path": "weights"}}]
+        })
     
-    return meshes
+    return {'bytes': writer.write(output_path), 'max_error': max_error, 'weight_scales': weight_scales,
+            'morph_step': morph_step}
 
 
-def create_glb_with_animation(meshes, output_path, word_label="sign", fps=30):
+def create_glb_with_animation(vertices, faces, output_path, word_label="sign", fps=30,
+                              frame_indices=None, max_keyframes=DEFAULT_MAX_KEYFRAMES, quantize=None,
+                              sparse_threshold=None, interpolation="LINEAR", keyframe_error=None):
     """
-    Create GLB file with animation from mesh sequence using pygltflib.
+    Create GLB file with animation from an (F, V, 3) vertex sequence and its shared (N, 3) faces.
+    
+    If frame_indices is given, vertices are already the selected keyframes and
+    frame_indices holds their source frame numbers (used for timing); the
+    array is then reoriented and turned into morph deltas in place.
+    Otherwise the full sequence is subsampled to max_keyframes here.
+    quantize ('int16' or 'int8') enables KHR_mesh_quantization output.
+    sparse_threshold (metres) stores morph targets as sparse accessors of the
+    vertices that move more than the threshold.
+    interpolation 'CUBICSPLINE' writes Catmull-Rom tangents for the weights.
+    keyframe_error (metres) is the measured interpolation error of the chosen
+    keyframes, if known; it is reported and added to max_error_mm.
     """
-    if len(meshes) == 0:
-        raise ValueError("No meshes provided")
+    vertices = np.asarray(vertices, dtype=np.float32)
+    if len(vertices) == 0:
+        raise ValueError("No frames provided")
     
-    try:
-        import pygltflib
-        from pygltflib import GLTF2, Scene, Node, Mesh, Primitive, Accessor, BufferView, Buffer, Animation, AnimationSampler, AnimationChannel, AnimationChannelTarget
-        import struct
-        
+    # --- Subsample keyframes for smooth GPU animation ---
+    # Having 60-90 morph targets per sign causes GPU jerkiness.
+    # Subsample to ~20 keyframes; glTF LINEAR interpolation smoothly
+    # blends between them at display framerate (60fps).
+    if frame_indices is None:
+        original_count = len(vertices)
+        with stage('keyframes', frames=original_count):
+            keyframe_indices = select_keyframe_indices(original_count, max_keyframes)
+            vertices = vertices[keyframe_indices]  # Copy of the kept frames only
+        print(f"  Subsampled: {original_count} frames -> {len(vertices)} keyframes")
+    else:
+        keyframe_indices = list(frame_indices)
+        original_count = keyframe_indices[-1] + 1
+    times = np.asarray(keyframe_indices, dtype=np.float32) / fps
+    
+    with stage('transform', frames=len(vertices)):
         # --- Fix orientation and center mesh for Three.js/GLB ---
-        # SMPL-X outputs can be off-center with inverted Y/Z orientation.
-        # 1. Center at origin using first frame's centroid
-        centroid = np.mean(meshes[0].vertices, axis=0)
-        # 2. Rotate 180° around X-axis: negate Y and Z
-        #    Fixes upside-down (Y flip) and backwards (Z flip)
-        for i, m in enumerate(meshes):
-            verts = m.vertices - centroid
-            verts[:, 1] *= -1  # Flip Y (fixes upside-down)
-            verts[:, 2] *= -1  # Flip Z (fixes backwards/facing away)
-            meshes[i] = trimesh.Trimesh(vertices=verts, faces=m.faces, process=False)
-        
-        # --- Subsample keyframes for smooth GPU animation ---
-        # Having 60-90 morph targets per sign causes GPU jerkiness.
-        # Subsample to ~20 keyframes; glTF LINEAR interpolation smoothly
-        # blends between them at display framerate (60fps).
-        original_count = len(meshes)
-        step = max(1, original_count // 20)
-        keyframe_indices = list(range(0, original_count, step))
-        if keyframe_indices[-1] != original_count - 1:
-            keyframe_indices.append(original_count - 1)  # Always include last frame
-        keyframe_times = [idx / fps for idx in keyframe_indices]
-        meshes = [meshes[i] for i in keyframe_indices]
-        print(f"  Subsampled: {original_count} frames -> {len(meshes)} keyframes (step={step})")
-        
-        # Use first keyframe as base mesh
-        base_mesh = meshes[0]
-        vertices = base_mesh.vertices.astype(np.float32)
-        faces = base_mesh.faces
-        
-        # Create morph target deltas from base to each subsequent keyframe
-        morph_targets = []
-        for i, mesh in enumerate(meshes[1:], 1):
-            delta = (mesh.vertices - vertices).astype(np.float32)
-            morph_targets.append(delta)
-        
-        # Pack binary data
-        binary_blob = bytearray()
-        
-        # Compute vertex normals from the transformed base mesh
-        normals = base_mesh.vertex_normals.astype(np.float32)
-        
-        # 1. Base vertices
-        vertex_offset = len(binary_blob)
-        for v in vertices.flatten():
-            binary_blob.extend(struct.pack('f', v))
-        
-        # 1b. Normals
-        normal_offset = len(binary_blob)
-        for n in normals.flatten():
-            binary_blob.extend(struct.pack('f', n))
+        # Centre on the first frame and rotate 180° around X, in place
+        orient_for_gltf(vertices, out=vertices)
         
-        # 2. Indices
-        index_offset = len(binary_blob)
-        for face in faces.flatten():
-            binary_blob.extend(struct.pack('I', face))
+        # Use first keyframe as base mesh; normals are only needed for it
+        base_vertices = vertices[0].copy()
+        faces = np.asarray(faces)
+        normals = vertex_normals(base_vertices, faces)
         
-        # 3. Morph target deltas
-        morph_offsets = []
-        for morph in morph_targets:
-            morph_offsets.append(len(binary_blob))
-            for v in morph.flatten():
-                binary_blob.extend(struct.pack('f', v))
+        # Morph target deltas from base to each subsequent keyframe, in place
+        morph_targets = vertices[1:]
+        morph_targets -= base_vertices
         
-        # 4. Animation timestamps (subsampled keyframe times)
-        time_offset = len(binary_blob)
-        times = keyframe_times
-        for t in times:
-            binary_blob.extend(struct.pack('f', t))
-        
-        # 5. Morph weights (0 to 1 for each target per frame)
-        weight_offset = len(binary_blob)
-        for frame_idx in range(len(meshes)):
-            for morph_idx in range(len(morph_targets)):
-                weight = 1.0 if morph_idx == (frame_idx - 1) else 0.0
-                binary_blob.extend(struct.pack('f', weight))
-        
-        # Create GLTF structure
-        from pygltflib import Material
-        
-        # Skin-tone material for avatar visibility
-        skin_material = Material(
-            pbrMetallicRoughness={
-                "baseColorFactor": [0.76, 0.57, 0.45, 1.0],  # Warm skin tone
-                "metallicFactor": 0.0,
-                "roughnessFactor": 0.7
-            },
-            doubleSided=True,
-            name="skin"
-        )
-        
-        # Accessor index tracking:
-        # 0 = positions, 1 = normals, 2 = indices
-        # 3..3+N-1 = morph targets
-        # 3+N = times, 4+N = weights
-        acc_idx_pos = 0
-        acc_idx_norm = 1
-        acc_idx_indices = 2
-        acc_idx_morph_start = 3
-        acc_idx_times = 3 + len(morph_targets)
-        acc_idx_weights = 4 + len(morph_targets)
-        
-        # BufferView index tracking:
-        # 0 = positions, 1 = normals, 2 = indices
-        # 3..3+N-1 = morph targets
-        # 3+N = times, 4+N = weights
-        
-        gltf = GLTF2(
-            scene=0,
-            scenes=[Scene(nodes=[0])],
-            nodes=[Node(mesh=0)],
-            materials=[skin_material],
-            meshes=[
-                Mesh(
-                    primitives=[
-                        Primitive(
-                            attributes={"POSITION": acc_idx_pos, "NORMAL": acc_idx_norm},
-                            indices=acc_idx_indices,
-                            material=0,
-                            targets=[{"POSITION": acc_idx_morph_start + i} for i in range(len(morph_targets))]
-                        )
-                    ],
-                    weights=[0.0] * len(morph_targets)
-                )
-            ],
-            accessors=[
-                # 0: Base positions
-                Accessor(bufferView=0, componentType=5126, count=len(vertices), type="VEC3", max=vertices.max(axis=0).tolist(), min=vertices.min(axis=0).tolist()),
-                # 1: Normals
-                Accessor(bufferView=1, componentType=5126, count=len(normals), type="VEC3"),
-                # 2: Indices
-                Accessor(bufferView=2, componentType=5125, count=len(faces.flatten()), type="SCALAR"),
-            ] + [
-                # 3+: Morph targets (min/max required for POSITION accessors)
-                Accessor(bufferView=3+i, componentType=5126, count=len(vertices), type="VEC3",
-                         max=morph_targets[i].max(axis=0).tolist(),
-                         min=morph_targets[i].min(axis=0).tolist())
-                for i in range(len(morph_targets))
-            ] + [
-                # Times
-                Accessor(bufferView=3+len(morph_targets), componentType=5126, count=len(times), type="SCALAR", max=[max(times)], min=[min(times)]),
-                # Weights
-                Accessor(bufferView=4+len(morph_targets), componentType=5126, count=len(meshes) * len(morph_targets), type="SCALAR")
-            ],
-            bufferViews=[
-                BufferView(buffer=0, byteOffset=vertex_offset, byteLength=len(vertices.flatten())*4, target=34962),
-                BufferView(buffer=0, byteOffset=normal_offset, byteLength=len(normals.flatten())*4, target=34962),
-                BufferView(buffer=0, byteOffset=index_offset, byteLength=len(faces.flatten())*4, target=34963),
-            ] + [
-                BufferView(buffer=0, byteOffset=morph_offsets[i], byteLength=len(vertices.flatten())*4, target=34962)
-                for i in range(len(morph_targets))
-            ] + [
-                BufferView(buffer=0, byteOffset=time_offset, byteLength=len(times)*4),
-                BufferView(buffer=0, byteOffset=weight_offset, byteLength=len(meshes)*len(morph_targets)*4)
-            ],
-            buffers=[Buffer(byteLength=len(binary_blob))],
-            animations=[
-                Animation(
-                    samplers=[
-                        AnimationSampler(
-                            input=acc_idx_times,     # times accessor index
-                            output=acc_idx_weights,  # weights accessor index
-                            interpolation="LINEAR"
-                        )
-                    ],
-                    channels=[
-                        AnimationChannel(
-                            sampler=0,
-                            target=AnimationChannelTarget(node=0, path="weights")
-                        )
-                    ]
-                )
-            ]
-        )
-        
-        gltf.set_binary_blob(bytes(binary_blob))
-        gltf.save(str(output_path))
-        
-        print(f"\n✅ Created GLB with animation: {output_path}")
-        print(f"   Keyframes: {len(meshes)} (duration: {times[-1]:.2f}s, subsampled from {original_count} frames)")
-        print(f"   Vertices: {len(vertices)}")
-        print(f"   Morph targets: {len(morph_targets)}")
-        
-    except ImportError:
-        print("⚠️  pygltflib not installed. Installing...")
-        import subprocess
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'pygltflib'])
-        # Retry
-        return create_glb_with_animation(meshes, output_path, word_label, fps)
+        # Morph weights: keyframe k is reached by fully weighting target k-1
+        weights = np.zeros((len(vertices), len(morph_targets)), dtype=np.float32)
+        weights[np.arange(1, len(vertices)), np.arange(len(morph_targets))] = 1.0
+        if interpolation == "CUBICSPLINE":
+            weights = cubic_spline_output(weights, times)
+    
+    written = write_morph_animation_glb(output_path, base_vertices, normals, faces, morph_targets, times, weights,
+                                        interpolation=interpolation, quantize=quantize,
+                                        sparse_threshold=sparse_threshold)
+    max_error = written['max_error'] + (keyframe_error or 0.0)
+    
+    print(f"\n✅ Created GLB with animation: {output_path}")
+    print(f"   Keyframes: {len(vertices)} (duration: {times[-1]:.2f}s, subsampled from {original_count} frames)")
+    print(f"   Vertices: {len(base_vertices)}")
+    print(f"   Morph targets: {len(morph_targets)} ({interpolation})")
+    if keyframe_error is not None:
+        print(f"   Keyframe error: {keyframe_error * 1000:.3f} mm max vertex distance over all frames")
+    if sparse_threshold and len(morph_targets):
+        moving = (np.abs(morph_targets).max(axis=2) > sparse_threshold).mean()
+        print(f"   Sparse morphs: {moving:.0%} of vertex deltas above {sparse_threshold * 1000:.2f} mm")
+    if quantize or sparse_threshold:
+        label = f"Quantized ({quantize} morphs)" if quantize else "Sparse"
+        print(f"   {label}: max position error {written['max_error'] * 1000:.3f} mm")
+    print(f"   Size: {written['bytes'] / 1024:.0f} KB")
+    
+    metadata = {
+        'file': Path(output_path).name,
+        'description': f'ASL sign: {word_label}',
+        'region': 'ASL',
+        'biomechanical': True,
+        'frames': len(vertices)
+    }
+    if quantize or sparse_threshold or keyframe_error is not None:
+        metadata['max_error_mm'] = round(max_error * 1000, 4)
+    return metadata
+
+
+def orient_for_gltf(vertices, centroid=None, out=None):
+    """
+    Centre (F, V, 3) SMPL-X vertices on the first frame's centroid and rotate
+    180° around X (negate Y and Z) to fix the upside-down, backwards SMPL-X output.
+    
+    out (float32, same shape) may be vertices itself to reorient in place.
+    """
+    if centroid is None:
+        centroid = vertices[0].mean(axis=0, dtype=np.float64)
+    if out is None:
+        out = np.empty(np.shape(vertices), dtype=np.float32)
+    np.subtract(vertices, centroid, out=out)
+    out[..., 1:] *= -1  # Flip Y (upside-down) and Z (facing away)
+    return out
+
+
+def create_basis_glb(vertices, faces, output_path, word_label="sign", fps=30,
+                     tolerance=DEFAULT_BASIS_TOLERANCE, max_components=DEFAULT_MAX_BASIS,
+                     quantize=None, sparse_threshold=None):
+    """
+    Create a GLB whose morph targets are a per-sign PCA motion basis (see motion_basis.py).
+    
+    vertices is the full (F, V, 3) sequence, reoriented in place; every frame
+    becomes a key of the weight curves, so nothing is subsampled.
+    """
+    with stage('transform', frames=len(vertices)):
+        vertices = orient_for_gltf(vertices, out=np.asarray(vertices, dtype=np.float32))
+        mean, targets, weights, basis_error = fit_motion_basis(vertices, tolerance, max_components)
+        times = np.arange(len(vertices), dtype=np.float32) / fps
+        normals = vertex_normals(mean, faces)
+    
+    written = write_morph_animation_glb(output_path, mean, normals, faces, targets, times, weights,
+                                        quantize=quantize, sparse_threshold=sparse_threshold)
+    max_error = basis_error + written['max_error']
+    
+    print(f"\n✅ Created GLB with motion basis: {output_path}")
+    print(f"   Frames: {len(vertices)} (duration: {times[-1]:.2f}s, full frame rate)")
+    print(f"   Vertices: {len(mean)}")
+    print(f"   Basis morph targets: {len(targets)} (target {tolerance * 1000:.2f} mm, limit {max_components})")
+    print(f"   Max position error: {max_error * 1000:.3f} mm")
+    print(f"   Size: {written['bytes'] / 1024:.0f} KB")
     
     return {
-        'file': output_path.name,
+        'file': Path(output_path).name,
         'description': f'ASL sign: {word_label}',
         'region': 'ASL',
         'biomechanical': True,
-        'frames': len(meshes)
+        'frames': len(vertices),
+        'max_error_mm': round(max_error * 1000, 4),
     }
 
 
+def convert_file(input_path, output_path, word_label, smplx_model, settings=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, vertex_cache=None):
+    """
+    Convert one SignAvatars .pkl to GLB with an already loaded body model.
+    
+    settings overrides DEFAULT_SETTINGS. vertex_cache is an optional
+    vertex_cache.VertexCache. Returns the signs.json-style metadata.
+    """
+    # Load parameters
+    params = load_pkl_params(input_path)
+    return convert_params(params, output_path, word_label, smplx_model, settings, chunk_size,
+                          input_path=input_path, vertex_cache=vertex_cache)
+
+
+def convert_params(params, output_path, word_label, smplx_model, settings=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                   input_path=None, vertex_cache=None):
+    """
+    Convert already loaded parameters to GLB (convert_file without the loading).
+    
+    input_path names the .pkl that params came from unmodified; the vertex
+    cache is only used when it is given.
+    """
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    output_path = Path(output_path)
+    
+    # Create output directory
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    if settings['mode'] in ('skinned', 'animation'):
+        return convert_skinned(params, output_path, word_label, smplx_model, settings, chunk_size,
+                               input_path=input_path, vertex_cache=vertex_cache)
+    if settings['mode'] == 'weights':
+        from shared_basis import create_weights_glb, load_shared_basis
+        basis = load_shared_basis(settings['shared_basis'] or DEFAULT_SHARED_BASIS)
+        vertices = sign_vertices(input_path, with_mean_shape(params), smplx_model, chunk_size=chunk_size,
+                                 vertex_cache=vertex_cache, mean_shape=True)
+        with stage('transform', frames=len(vertices)):
+            orient_for_gltf(vertices, out=vertices)
+        return create_weights_glb(vertices, basis, output_path, word_label, fps=settings['fps'])
+    if settings['mode'] == 'basis':
+        vertices = sign_vertices(input_path, params, smplx_model, chunk_size=chunk_size, vertex_cache=vertex_cache)
+        return create_basis_glb(vertices, smplx_model.faces, output_path, word_label, fps=settings['fps'],
+                                tolerance=settings['basis_tolerance'] or DEFAULT_BASIS_TOLERANCE,
+                                max_components=settings['max_basis'] or DEFAULT_MAX_BASIS,
+                                quantize=settings['quantize'], sparse_threshold=settings['sparse_threshold'])
+    
+    interpolation = settings['interpolation'] or "LINEAR"
+    keyframe_error = None
+    if settings['keyframe_tolerance'] is not None:
+        # Adaptive selection measures interpolation error on every frame,
+        # so the whole sequence goes through the body model
+        vertices = sign_vertices(input_path, params, smplx_model, chunk_size=chunk_size, vertex_cache=vertex_cache)
+        times = np.arange(len(vertices)) / settings['fps']
+        with stage('keyframes', frames=len(vertices)):
+            frame_indices, keyframe_error = select_adaptive_keyframes(
+                vertices, times, settings['keyframe_tolerance'], settings['max_keyframes'], interpolation)
+            vertices = vertices[frame_indices]
+        print(f"\nAdaptive keyframes: {len(times)} frames -> {len(frame_indices)} keyframes "
+              f"(max error {keyframe_error * 1000:.3f} mm)")
+    else:
+        # Select keyframes up front so only those frames go through the body model
+        num_frames = len(params['smplx']) if params.get('smplx') is not None else 0
+        with stage('keyframes', frames=num_frames):
+            frame_indices = select_keyframe_indices(num_frames, settings['max_keyframes'])
+        print(f"\nKeyframes: {num_frames} frames -> {len(frame_indices)} keyframes")
+        vertices = sign_vertices(input_path, params, smplx_model, chunk_size=chunk_size,
+                                 frame_indices=frame_indices, vertex_cache=vertex_cache)
+    
+    # Create GLB
+    return create_glb_with_animation(vertices, smplx_model.faces, output_path, word_label, fps=settings['fps'],
+                                     frame_indices=frame_indices, quantize=settings['quantize'],
+                                     sparse_threshold=settings['sparse_threshold'],
+                                     interpolation=interpolation, keyframe_error=keyframe_error)
+
+
+def convert_skinned(params, output_path, word_label, smplx_model, settings, chunk_size=DEFAULT_CHUNK_SIZE,
+                    input_path=None, vertex_cache=None):
+    """
+    Export loaded parameters as a skinned mesh with joint rotation channels (see skinned_export.py).
+    
+    The body model only runs on the usual keyframe sample, which places the
+    avatar and measures the skinning error; the animation keeps every frame.
+    In 'animation' mode the sign is retargeted to the shared mean-shape base
+    avatar, so betas are zeroed before the body model runs.
+    """
+    from skinned_export import BASE_AVATAR_FILE, create_skinned_glb
+    
+    if params.get('smplx') is None:
+        raise ValueError("No 'smplx' key found in parameters")
+    base_avatar = None
+    if settings['mode'] == 'animation':
+        base_avatar = BASE_AVATAR_FILE
+        params = with_mean_shape(params)
+    
+    with stage('keyframes', frames=len(params['smplx'])):
+        reference_indices = select_keyframe_indices(len(params['smplx']), settings['max_keyframes'])
+    reference_vertices = sign_vertices(input_path, params, smplx_model, chunk_size=chunk_size,
+                                       frame_indices=reference_indices, vertex_cache=vertex_cache,
+                                       mean_shape=base_avatar is not None)
+    
+    return create_skinned_glb(parse_smplx_params(params['smplx']), smplx_model, output_path, word_label,
+                              fps=settings['fps'], reference_indices=reference_indices,
+                              reference_vertices=reference_vertices, quantize=settings['quantize'],
+                              sparse_threshold=settings['sparse_threshold'], base_avatar=base_avatar)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Convert SignAvatars .pkl to GLB')
     parser.add_argument('--input', required=True, help='Input .pkl file path')
@@ -391,6 +677,10 @@ def main():
     parser.add_argument('--word', default='unknown', help='Word label for this sign')
     parser.add_argument('--smplx-model', default='signavatars-data/models',
                        help='Path to SMPL-X models directory (contains smplx/ subfolder)')
+    parser.add_argument('--body-model', choices=BODY_MODEL_BACKENDS, default='numpy',
+                       help='Evaluate SMPL-X with NumPy (no torch) or the smplx package (default: numpy)')
+    add_settings_arguments(parser)
+    add_report_arguments(parser)
     
     args = parser.parse_args()
     
@@ -407,22 +697,21 @@ def main():
         print(f"❌ ERROR: SMPL-X model directory not found: {smplx_model_dir}")
         return 1
     
-    # Create output directory
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
     print(f"\n🔄 Converting SignAvatars animation to GLB...")
     print(f"Input:  {input_path}")
     print(f"Output: {output_path}")
     print(f"Word:   {args.word}\n")
     
-    # Load parameters
-    params = load_pkl_params(input_path)
+    settings = settings_from_args(args)
+    smplx_model = load_smplx_model(smplx_model_dir, backend=args.body_model)
+    profile_path = f"{args.report}.prof" if args.report and args.profile == 'cprofile' else None
+    with measure(args.word, profile=args.profile, profile_path=profile_path) as report:
+        convert_file(input_path, output_path, args.word, smplx_model, settings, chunk_size=args.chunk_size,
+                     vertex_cache=vertex_cache_from_args(args))
     
-    # Generate mesh sequence
-    meshes = params_to_mesh_sequence(params, smplx_model_dir)
-    
-    # Create GLB
-    metadata = create_glb_with_animation(meshes, output_path, args.word)
+    if args.report or args.profile:
+        report_runs(args.report, [{**report.as_dict(), 'input': str(input_path), 'output': str(output_path),
+                                   'ok': True}])
     
     return 0
 
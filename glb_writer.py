@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Minimal NumPy GLB writer for the conversion pipeline.
+
+Every buffer view is written straight from a contiguous NumPy array (padded to
+4-byte alignment) and the JSON and BIN chunks are streamed directly to the
+output file, so there is no per-element struct packing and no pygltflib.
+
+Usage:
+    writer = GLBWriter()
+    positions = writer.add_accessor(vertices, target=ARRAY_BUFFER, min_max=True)
+    ...
+    writer.add('meshes', {...})
+    writer.write('animations/WORD-00384.glb')
+"""
+
+import json
+import struct
+import numpy as np
+
+from instrumentation import stage
+
+GLB_MAGIC = b'glTF'
+GLB_VERSION = 2
+CHUNK_TYPE_JSON = 0x4E4F534A  # "JSON"
+CHUNK_TYPE_BIN = 0x004E4942   # "BIN\0"
+
+# bufferView.target values
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+# accessor.componentType values
+COMPONENT_TYPES = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+
+ACCESSOR_TYPES = {1: 'SCALAR', 2: 'VEC2', 3: 'VEC3', 4: 'VEC4', 16: 'MAT4'}
+
+
+def quantize_normalized(values, dtype):
+    """Map values in [-1, 1] to a normalized signed integer dtype (e.g. np.int16)."""
+    limit = np.iinfo(dtype).max
+    return np.round(np.clip(values, -1.0, 1.0) * limit).astype(dtype)
+
+
+def pad_vec3(array):
+    """
+    Pad (count, 3) integer data to (count, 4).
+
+    glTF vertex attributes need a byteStride that is a multiple of 4, so
+    int8/int16 VEC3 attributes carry one unused component per element.
+    """
+    padded = np.zeros((array.shape[0], 4), dtype=array.dtype)
+    padded[:, :3] = array
+    return padded
+
+
+def read_glb_json(path):
+    """Read only the JSON chunk of a .glb file."""
+    with open(path, 'rb') as f:
+        magic, _, _ = struct.unpack('<4sII', f.read(12))
+        if magic != GLB_MAGIC:
+            raise ValueError(f"Not a GLB file: {path}")
+        chunk_length, chunk_type = struct.unpack('<II', f.read(8))
+        if chunk_type != CHUNK_TYPE_JSON:
+            raise ValueError(f"GLB file does not start with a JSON chunk: {path}")
+        return json.loads(f.read(chunk_length))
+
+
+def _padding(byte_length):
+    """Bytes needed to bring byte_length up to a multiple of 4."""
+    return (4 - byte_length % 4) % 4
+
+
+def _little_endian(array):
+    """Return a C-contiguous little-endian view (or copy) of array."""
+    array = np.ascontiguousarray(array)
+    if array.dtype.byteorder == '>':
+        array = array.astype(array.dtype.newbyteorder('<'))
+    return array
+
+
+class GLBWriter:
+    """Collects glTF JSON and NumPy buffer views, then writes a single .glb file."""
+
+    def __init__(self, generator='html2sign-language glb_writer'):
+        self.gltf = {'asset': {'version': '2.0', 'generator': generator}}
+        self._arrays = []
+        self._byte_length = 0
+
+    @property
+    def byte_length(self):
+        """Current size of the BIN chunk payload in bytes."""
+        return self._byte_length
+
+    def add(self, key, item):
+        """Append item to a top-level glTF list (meshes, nodes, ...) and return its index."""
+        items = self.gltf.setdefault(key, [])
+        items.append(item)
+        return len(items) - 1
+
+    def add_buffer_view(self, array, target=None, byte_stride=None):
+        """Append array to the BIN chunk as its own buffer view and return the view index."""
+        array = _little_endian(array)
+        view = {'buffer': 0, 'byteOffset': self._byte_length, 'byteLength': array.nbytes}
+        if byte_stride is not None:
+            view['byteStride'] = byte_stride
+        if target is not None:
+            view['target'] = target
+
+        self._arrays.append(array)
+        self._byte_length += array.nbytes + _padding(array.nbytes)
+        return self.add('bufferViews', view)
+
+    def add_accessor(self, array, target=None, min_max=False, normalized=False, accessor_type=None):
+        """
+        Write array as a buffer view and describe it with an accessor.
+
+        array is (count,) for SCALAR or (count, components) for VEC/MAT types.
+        accessor_type may name fewer components than array has (padded VEC3
+        from pad_vec3); the view then gets a byteStride covering the padding.
+        min_max adds per-component bounds (required for POSITION and animation input),
+        in stored units, i.e. raw integers for normalized accessors.
+        Returns the accessor index.
+        """
+        array = _little_endian(array)
+        stored_components = 1 if array.ndim == 1 else array.shape[1]
+        accessor_type = accessor_type or ACCESSOR_TYPES[stored_components]
+        components = {v: k for k, v in ACCESSOR_TYPES.items()}[accessor_type]
+
+        byte_stride = None
+        if components != stored_components:
+            byte_stride = stored_components * array.dtype.itemsize
+
+        accessor = {
+            'bufferView': self.add_buffer_view(array, target=target, byte_stride=byte_stride),
+            'componentType': COMPONENT_TYPES[array.dtype],
+            'count': int(array.shape[0]),
+            'type': accessor_type,
+        }
+        if normalized:
+            accessor['normalized'] = True
+        if min_max:
+            values = array.reshape(array.shape[0], -1)[:, :components]
+            accessor['min'] = values.min(axis=0).tolist()
+            accessor['max'] = values.max(axis=0).tolist()
+        return self.add('accessors', accessor)
+
+    def add_sparse_accessor(self, count, indices, values, accessor_type, normalized=False,
+                            min_values=None, max_values=None):
+        """
+        Describe a zero-initialised accessor of count elements where only
+        `indices` (strictly increasing) hold `values`.
+
+        With no indices the accessor is all zeros and needs no buffer data.
+        min/max, if given, must cover the zeros as well as the values.
+        Returns the accessor index.
+        """
+        values = _little_endian(values)
+        accessor = {
+            'componentType': COMPONENT_TYPES[values.dtype],
+            'count': int(count),
+            'type': accessor_type,
+        }
+        if normalized:
+            accessor['normalized'] = True
+        if min_values is not None:
+            accessor['min'] = list(min_values)
+            accessor['max'] = list(max_values)
+        if len(indices):
+            index_type = np.uint16 if count <= 65535 else np.uint32
+            accessor['sparse'] = {
+                'count': int(len(indices)),
+                'indices': {'bufferView': self.add_buffer_view(np.asarray(indices, dtype=index_type)),
+                            'componentType': COMPONENT_TYPES[np.dtype(index_type)]},
+                'values': {'bufferView': self.add_buffer_view(values)},
+            }
+        return self.add('accessors', accessor)
+
+    def add_morph_target_accessor(self, deltas, moving=None, normalized=False):
+        """
+        Write one morph target's (count, 3) deltas, as a sparse accessor if that is smaller.
+
+        deltas are float32 or quantized integers; moving is the per-element mask
+        of deltas kept after thresholding (None = always dense). min/max are
+        required for morph target POSITION accessors.
+        Returns the accessor index.
+        """
+        quantized = deltas.dtype != np.float32
+        dense_bytes = len(deltas) * (4 * deltas.dtype.itemsize if quantized else 12)
+
+        if moving is not None:
+            indices = np.flatnonzero(moving)
+            index_size = 2 if len(deltas) <= 65535 else 4
+            sparse_bytes = len(indices) * (index_size + 3 * deltas.dtype.itemsize)
+            if sparse_bytes < dense_bytes:
+                values = deltas[indices]
+                # Untouched elements are zero, so the bounds always include 0
+                lower = np.minimum(values.min(axis=0, initial=0), 0).tolist()
+                upper = np.maximum(values.max(axis=0, initial=0), 0).tolist()
+                return self.add_sparse_accessor(len(deltas), indices, values, 'VEC3', normalized=normalized,
+                                                min_values=lower, max_values=upper)
+
+        if quantized:
+            return self.add_accessor(pad_vec3(deltas), target=ARRAY_BUFFER, min_max=True,
+                                     normalized=True, accessor_type='VEC3')
+        return self.add_accessor(deltas, target=ARRAY_BUFFER, min_max=True)
+
+    def require_extension(self, name):
+        """Declare an extension in extensionsUsed and extensionsRequired."""
+        for key in ('extensionsUsed', 'extensionsRequired'):
+            names = self.gltf.setdefault(key, [])
+            if name not in names:
+                names.append(name)
+
+    def write(self, output_path):
+        """Write the GLB file and return the number of bytes written."""
+        self.gltf['buffers'] = [{'byteLength': self._byte_length}]
+
+        json_bytes = json.dumps(self.gltf, separators=(',', ':')).encode('utf-8')
+        json_bytes += b' ' * _padding(len(json_bytes))
+
+        total_length = 12 + 8 + len(json_bytes) + 8 + self._byte_length
+        with stage('write') as record, open(output_path, 'wb') as f:
+            f.write(struct.pack('<4sII', GLB_MAGIC, GLB_VERSION, total_length))
+            f.write(struct.pack('<II', len(json_bytes), CHUNK_TYPE_JSON))
+            f.write(json_bytes)
+            f.write(struct.pack('<II', self._byte_length, CHUNK_TYPE_BIN))
+            for array in self._arrays:
+                f.write(memoryview(array).cast('B'))
+                f.write(b'\0' * _padding(array.nbytes))
+            record['bytes'] += total_length
+
+        return total_length
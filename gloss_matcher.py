@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Longest-match gloss matcher over the sign registry.
+
+Builds a word-level trie from every gloss in signs.json and
+wlasl_mapping.json: single words (ACCEPT), multi-word glosses (A LOT) and
+hyphenated keys, which match both as one word (member-states) and as a
+phrase (member states). Lookups are case-folded, and an inflection table
+generated from the vocabulary (PLAYING, PLAYED, PLAYS -> PLAY, plus a few
+irregular forms such as WENT -> GO) maps surface forms onto glosses.
+
+Registry keys that are not upper case (wad, pdf, harmonized-standard) name
+hand-made explainer clips rather than glosses; they match only their exact
+spelling. Placeholder entries (the idle pose, region Universal, and the test
+clip) are never matched in prose, only resolved when a page already names
+them in data-sign.
+
+scan() tokenizes arbitrary text in one pass and, at each word, follows the
+trie as far as the following whitespace-separated words allow, taking the
+longest gloss that ends there. Words that match no gloss resolve the way
+app.js loadSignAction falls back at runtime: a hyphenated word whose parts
+include a sign becomes a compound, anything else is fingerspelled.
+
+The trie, the inflection table and the resolution of every gloss are
+serialized to JSON next to the registry. The index records the size and
+mtime of the files it was built from and is rebuilt only when they change,
+so loading it does not read or resolve the registry.
+
+Usage:
+    python gloss_matcher.py --build
+    python gloss_matcher.py --match "We accept a lot of playing"
+    index = load_index()
+    for start, end, resolution in index.scan(text):
+        ...
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+
+DEFAULT_SIGNS = "signs.json"
+DEFAULT_MAPPING = "wlasl_mapping.json"
+DEFAULT_INDEX = Path("animations/.gloss-index.json")
+INDEX_FORMAT = 2
+
+WORD_PATTERN = re.compile(r"[A-Za-z0-9]+(?:['’][A-Za-z]+)*(?:[-_][A-Za-z0-9]+)*")
+GLOSS_SEPARATOR = re.compile(r"[\s_-]+")
+# Registry keys that name a clip rather than a word (WORD-00384)
+CLIP_KEY = re.compile(r"WORD-\d+")
+# Registry entries that are not words: rest poses and test clips
+PLACEHOLDER_REGIONS = frozenset(['Universal'])
+PLACEHOLDER_KEYS = frozenset(['idle', 'test'])
+
+IRREGULAR_FORMS = {
+    'be': ['am', 'is', 'are', 'was', 'were', 'been', 'being'],
+    'have': ['has', 'had', 'having'],
+    'do': ['does', 'did', 'done', 'doing'],
+    'go': ['goes', 'went', 'gone', 'going'],
+    'make': ['made'],
+    'take': ['took', 'taken'],
+    'give': ['gave', 'given'],
+    'see': ['saw', 'seen'],
+    'come': ['came'],
+    'get': ['got', 'gotten'],
+    'know': ['knew', 'known'],
+    'think': ['thought'],
+    'tell': ['told'],
+    'buy': ['bought'],
+    'bring': ['brought'],
+    'teach': ['taught'],
+    'eat': ['ate', 'eaten'],
+    'write': ['wrote', 'written'],
+    'child': ['children'],
+    'person': ['people'],
+    'man': ['men'],
+    'woman': ['women'],
+    'foot': ['feet'],
+    'tooth': ['teeth'],
+    'mouse': ['mice'],
+}
+
+VOWELS = frozenset('aeiou')
+
+Resolution = namedtuple('Resolution', ['mode', 'key', 'parts'])
+
+
+def fold(word):
+    """Case- and apostrophe-folded form used for every lookup."""
+    return word.casefold().replace('’', "'")
+
+
+def inflections(word):
+    """Regular plural, past and -ing forms of a lower-case word."""
+    if not word.isalpha() or len(word) < 2:
+        return []
+    forms = [word + 's', word + 'es']
+    if word.endswith('y') and word[-2] not in VOWELS:
+        forms += [word[:-1] + 'ies', word[:-1] + 'ied', word + 'ing']
+    elif word.endswith('e'):
+        forms += [word + 'd', word[:-1] + 'ing']
+    else:
+        forms += [word + 'ed', word + 'ing']
+        if (len(word) >= 3 and word[-1] not in VOWELS | {'w', 'x', 'y'}
+                and word[-2] in VOWELS and word[-3] not in VOWELS):
+            forms += [word + word[-1] + 'ed', word + word[-1] + 'ing']
+    return forms + IRREGULAR_FORMS.get(word, [])
+
+
+def fallback_resolution(word, part_key):
+    """
+    app.js fallback for a word without a sign: a compound of the hyphenated or
+    underscored parts part_key() finds a sign key for, else fingerspelling.
+    """
+    key = word.upper()
+    if '-' in key or '_' in key:
+        parts = [part_key(part) for part in re.split(r'[-_]', key) if part]
+        available = tuple(part for part in parts if part)
+        if available:
+            return Resolution('compound', key, available)
+    return Resolution('fingerspell', key, ())
+
+
+class SignRegistry:
+    """signs.json plus wlasl_mapping.json, resolved the way app.js loadSignAction does."""
+
+    def __init__(self, signs, mapping=None):
+        self.signs = signs
+        self.aliases = {}
+        for word, entry in (mapping or {}).items():
+            sign_key = entry.get('sign_key')
+            if sign_key and self.signs.get(sign_key, {}).get('file'):
+                self.aliases[word.upper()] = sign_key
+
+    def sign_key(self, word):
+        """signs.json key with a file for a word or gloss (exact key first, then upper case), or None."""
+        for key in (word, word.upper()):
+            if self.signs.get(key, {}).get('file'):
+                return key
+        return self.aliases.get(word.upper())
+
+    def resolve(self, word):
+        """
+        Resolution for a word or key: mode 'sign', 'compound' (parts are the
+        playable part keys) or 'fingerspell'.
+        """
+        sign_key = self.sign_key(word)
+        if sign_key:
+            return Resolution('sign', sign_key, ())
+        return fallback_resolution(word, self.sign_key)
+
+    def is_placeholder(self, key):
+        return key in PLACEHOLDER_KEYS or self.signs.get(key, {}).get('region') in PLACEHOLDER_REGIONS
+
+    def glosses(self):
+        """(gloss, Resolution) for every case-insensitive gloss: upper-case registry keys first, then aliases."""
+        for key in self.signs:
+            if CLIP_KEY.fullmatch(key.upper()) or key != key.upper() or self.is_placeholder(key):
+                continue
+            resolution = self.resolve(key)
+            if resolution.mode != 'fingerspell':
+                yield key, resolution
+        for word in self.aliases:
+            yield word, self.resolve(word)
+
+    def exact_keys(self):
+        """(key, Resolution, matchable) for registry keys with a file that match only by exact spelling."""
+        for key, entry in self.signs.items():
+            if not entry.get('file') or CLIP_KEY.fullmatch(key.upper()):
+                continue
+            placeholder = self.is_placeholder(key)
+            if key != key.upper() or placeholder:
+                yield key, Resolution('sign', key, ()), not placeholder
+
+
+class GlossIndex:
+    """
+    Word-level trie over the registry glosses.
+
+    nodes[i] is (children, resolution index or -1) with children mapping a
+    folded word to a node index; node 0 is the root. forms maps inflected
+    words onto the vocabulary word they inflect. exact maps case-sensitive
+    registry keys to (resolution index, whether prose may match it).
+    """
+
+    def __init__(self, nodes, resolutions, forms, sources=None, exact=None):
+        self.nodes = nodes
+        self.resolutions = resolutions
+        self.forms = forms
+        self.sources = sources or {}
+        self.exact = exact or {}
+        self._words = {}
+
+    @classmethod
+    def build(cls, signs, mapping=None, sources=None):
+        """Index for the registry dicts (signs.json, wlasl_mapping.json contents)."""
+        registry = SignRegistry(signs, mapping)
+        nodes = [({}, -1)]
+        resolutions = []
+        resolution_ids = {}
+
+        def resolution_id(resolution):
+            if resolution not in resolution_ids:
+                resolution_ids[resolution] = len(resolutions)
+                resolutions.append(resolution)
+            return resolution_ids[resolution]
+
+        def insert(words, resolution):
+            node = 0
+            for word in words:
+                children = nodes[node][0]
+                if word not in children:
+                    children[word] = len(nodes)
+                    nodes.append(({}, -1))
+                node = children[word]
+            if nodes[node][1] < 0:  # first gloss wins
+                nodes[node] = (nodes[node][0], resolution_id(resolution))
+
+        for gloss, resolution in registry.glosses():
+            words = [fold(word) for word in GLOSS_SEPARATOR.split(gloss.strip()) if word]
+            if not words:
+                continue
+            insert(words, resolution)
+            if len(words) > 1 and not re.search(r'\s', gloss):
+                insert([fold(gloss)], resolution)
+
+        vocabulary = sorted({word for children, _ in nodes for word in children})
+        known = set(vocabulary)
+        forms = {}
+        for word in vocabulary:
+            for form in inflections(word):
+                if form not in known:
+                    forms.setdefault(form, word)
+        exact = {key: (resolution_id(resolution), matchable)
+                 for key, resolution, matchable in registry.exact_keys()}
+        return cls(nodes, resolutions, forms, sources, exact)
+
+    @classmethod
+    def from_dict(cls, data):
+        nodes = [(children, resolution) for children, resolution in data['nodes']]
+        resolutions = [Resolution(mode, key, tuple(parts)) for mode, key, parts in data['resolutions']]
+        exact = {key: (resolution, matchable) for key, (resolution, matchable) in data['exact'].items()}
+        return cls(nodes, resolutions, data['forms'], data.get('sources'), exact)
+
+    def to_dict(self):
+        return {
+            'format': INDEX_FORMAT,
+            'sources': self.sources,
+            'resolutions': [[mode, key, list(parts)] for mode, key, parts in self.resolutions],
+            'forms': self.forms,
+            'exact': {key: [resolution, matchable] for key, (resolution, matchable) in self.exact.items()},
+            'nodes': [[children, resolution] for children, resolution in self.nodes],
+        }
+
+    def save(self, path=DEFAULT_INDEX):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def step(self, node, word):
+        """Child of node for a folded word or its uninflected form, or None."""
+        children = self.nodes[node][0]
+        child = children.get(word)
+        if child is None and word in self.forms:
+            child = children.get(self.forms[word])
+        return child
+
+    def lookup(self, word):
+        """Resolution of a single-word gloss (inflections included) or exact-case key, or None."""
+        resolution, matchable = self.exact.get(word, (-1, False))
+        if matchable:
+            return self.resolutions[resolution]
+        node = self.step(0, fold(word))
+        if node is None or self.nodes[node][1] < 0:
+            return None
+        return self.resolutions[self.nodes[node][1]]
+
+    def resolve_word(self, word):
+        """
+        Resolution of one word: its gloss, else a compound of its hyphenated
+        parts, else fingerspelling (cached).
+        """
+        resolution = self._words.get(word)
+        if resolution is None:
+            resolution = self.lookup(word)
+            if resolution is None:
+                resolution = fallback_resolution(word, self._part_key)
+            self._words[word] = resolution
+        return resolution
+
+    def resolve_key(self, key):
+        """Resolution of a data-sign value: a registry key (placeholders included) or any word."""
+        if key in self.exact:
+            return self.resolutions[self.exact[key][0]]
+        return self.resolve_word(key)
+
+    def _part_key(self, part):
+        resolution = self.lookup(part)
+        return resolution.key if resolution and resolution.mode == 'sign' else None
+
+    def scan(self, text):
+        """
+        Yield (start, end, Resolution) for every word of text, in order. A
+        multi-word gloss yields one span covering its words; words are joined
+        into a gloss only across whitespace.
+        """
+        words = [(match.start(), match.end(), fold(match.group())) for match in WORD_PATTERN.finditer(text)]
+        i = 0
+        while i < len(words):
+            node = 0
+            best = None
+            j = i
+            while j < len(words):
+                if j > i and not text[words[j - 1][1]:words[j][0]].isspace():
+                    break
+                node = self.step(node, words[j][2])
+                if node is None:
+                    break
+                if self.nodes[node][1] >= 0:
+                    best = (j, self.resolutions[self.nodes[node][1]])
+                j += 1
+
+            if best is None:
+                start, end, _ = words[i]
+                yield start, end, self.resolve_word(text[start:end])
+                i += 1
+            else:
+                last, resolution = best
+                yield words[i][0], words[last][1], resolution
+                i = last + 1
+
+
+def source_stats(*paths):
+    """{path: [size, mtime_ns]} for the registry files an index is built from."""
+    stats = {}
+    for path in paths:
+        if path:
+            stat = os.stat(path)
+            stats[str(path)] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def build_index(signs_path=DEFAULT_SIGNS, mapping_path=DEFAULT_MAPPING):
+    """GlossIndex built from the registry files (wlasl_mapping.json is optional)."""
+    with open(signs_path, 'r') as f:
+        signs = json.load(f)
+    mapping = None
+    if mapping_path and os.path.exists(mapping_path):
+        with open(mapping_path, 'r') as f:
+            mapping = json.load(f)
+    else:
+        mapping_path = None
+    return GlossIndex.build(signs, mapping, sources=source_stats(signs_path, mapping_path))
+
+
+def load_index(signs_path=DEFAULT_SIGNS, mapping_path=DEFAULT_MAPPING, index_path=DEFAULT_INDEX):
+    """
+    The serialized index for the registry files, rebuilt (and saved, if
+    index_path is writable) when they have changed since it was written.
+    """
+    if mapping_path and not os.path.exists(mapping_path):
+        mapping_path = None
+    sources = source_stats(signs_path, mapping_path)
+    if index_path:
+        try:
+            with open(index_path, 'r') as f:
+                data = json.load(f)
+            if data.get('format') == INDEX_FORMAT and data.get('sources') == sources:
+                return GlossIndex.from_dict(data)
+        except (OSError, ValueError):
+            pass
+
+    index = build_index(signs_path, mapping_path)
+    if index_path:
+        try:
+            index.save(index_path)
+        except OSError as e:
+            print(f"⚠️  Could not save gloss index {index_path}: {e}")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the longest-match gloss index')
+    parser.add_argument('--signs', default=DEFAULT_SIGNS, help=f'Sign registry (default: {DEFAULT_SIGNS})')
+    parser.add_argument('--mapping', default=DEFAULT_MAPPING,
+                        help=f'WLASL gloss mapping (default: {DEFAULT_MAPPING})')
+    parser.add_argument('--index', default=str(DEFAULT_INDEX), help=f'Serialized index (default: {DEFAULT_INDEX})')
+    parser.add_argument('--build', action='store_true', help='Rebuild the index even if it is current')
+    parser.add_argument('--match', metavar='TEXT', help='Print the sign spans found in TEXT')
+    args = parser.parse_args()
+
+    if args.build:
+        index = build_index(args.signs, args.mapping)
+        index.save(args.index)
+        glosses = sum(1 for _, resolution in index.nodes if resolution >= 0)
+        print(f"✅ Gloss index {args.index}: {len(index.nodes)} nodes, {glosses} glosses, "
+              f"{len(index.forms)} inflected forms")
+    else:
+        index = load_index(args.signs, args.mapping, args.index)
+
+    if args.match:
+        for start, end, resolution in index.scan(args.match):
+            parts = f" ({' + '.join(resolution.parts)})" if resolution.parts else ''
+            print(f"{args.match[start:end]!r:24} {resolution.mode:12} {resolution.key}{parts}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
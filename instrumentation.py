@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Per-stage instrumentation for the conversion pipeline.
+
+The converter marks its stages with stage(): 'load' (.pkl or parameter
+store), 'parse' (182-dim rows to SMPL-X inputs), 'forward' (body model),
+'keyframes' (frame selection), 'transform' (orientation, morph deltas,
+normals, skinning), 'pack' (GLB assembly) and 'write' (file output). Each
+stage records its wall time excluding nested stages, calls, frames, bytes
+and the process's peak RSS so far. Outside measure() stage() does nothing,
+so plain runs pay for one list check per stage.
+
+measure() collects one run into a RunReport. Its as_dict() is the JSON
+record written by --report. A .json report holds the runs and their
+aggregate(); a .ndjson report holds one line per run, then the summary
+line. --profile cprofile adds the top functions by cumulative time (and
+writes REPORT.prof for pstats/snakeviz). --profile tracemalloc adds each
+stage's peak traced allocation, and the largest allocation sites still live
+at the end of the stage with the highest peak.
+
+Usage:
+    python convert_pkl_to_glb.py ... --report report.json --profile tracemalloc
+    python batch_convert.py --report batch.ndjson
+    with measure('ABOUT') as report:
+        convert_file(...)
+    write_report('report.json', [report.as_dict()])
+"""
+
+import contextlib
+import cProfile
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+# Pipeline stages in report order; other names are allowed and sort last
+STAGES = ('load', 'cache', 'parse', 'forward', 'keyframes', 'transform', 'pack', 'write')
+
+PROFILERS = ('cprofile', 'tracemalloc')
+
+# Entries kept from cProfile and tracemalloc in a report
+PROFILE_TOP = 25
+
+# Runs being measured in this process, innermost last
+_active = []
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KB elsewhere
+    return round(peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def _new_stage():
+    return {'seconds': 0.0, 'calls': 0, 'frames': 0, 'bytes': 0, 'peak_rss_mb': None}
+
+
+class RunReport:
+    """Stage timings and totals for one measured run."""
+
+    def __init__(self, label, profile=None):
+        self.label = label
+        self.profile = profile
+        self.stages = {}
+        self.seconds = 0.0
+        self.peak_rss_mb = None
+        self.extra = {}
+        self._stack = []
+        self._traced_peak = 0
+
+    @contextlib.contextmanager
+    def stage(self, name, frames=0):
+        """Time a stage; the yielded record's 'frames' and 'bytes' may be added to inside."""
+        record = self.stages.setdefault(name, _new_stage())
+        tracing = self.profile == 'tracemalloc' and tracemalloc.is_tracing()
+        if tracing:
+            if self._stack:
+                # Keep the enclosing stage's peak before restarting the measurement
+                parent = self._stack[-1]
+                parent['traced_peak'] = max(parent['traced_peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = {'start': time.perf_counter(), 'nested': 0.0, 'traced_peak': 0}
+        self._stack.append(frame)
+        try:
+            yield record
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame['start']
+            record['seconds'] += elapsed - frame['nested']
+            record['calls'] += 1
+            record['frames'] += frames
+            record['peak_rss_mb'] = peak_rss_mb()
+            if tracing:
+                peak = max(frame['traced_peak'], tracemalloc.get_traced_memory()[1])
+                record['traced_peak_mb'] = round(max(record.get('traced_peak_mb', 0.0), peak / 1024 / 1024), 1)
+                if peak > self._traced_peak:
+                    # What is still allocated as the most memory-hungry stage so far ends
+                    self._traced_peak = peak
+                    self.extra['allocations'] = {'stage': name,
+                                                 'sites': allocation_summary(tracemalloc.take_snapshot())}
+            if self._stack:
+                self._stack[-1]['nested'] += elapsed
+                if tracing:
+                    self._stack[-1]['traced_peak'] = max(self._stack[-1]['traced_peak'], peak)
+
+    def as_dict(self):
+        """JSON-serializable record of the run."""
+        # Source frames, as loaded; stages such as 'parse' may see frames more than once
+        frames = self.stages['load']['frames'] if self.stages.get('load', {}).get('frames') else \
+            max((record['frames'] for record in self.stages.values()), default=0)
+        written = sum(record['bytes'] for record in self.stages.values())
+        order = {name: i for i, name in enumerate(STAGES)}
+        stages = {}
+        for name in sorted(self.stages, key=lambda name: (order.get(name, len(STAGES)), name)):
+            record = dict(self.stages[name])
+            record['seconds'] = round(record['seconds'], 6)
+            if record['frames'] and record['seconds'] > 0:
+                record['fps'] = round(record['frames'] / record['seconds'], 1)
+            stages[name] = record
+        return {
+            'label': self.label,
+            'seconds': round(self.seconds, 6),
+            'frames': frames,
+            'fps': round(frames / self.seconds, 1) if frames and self.seconds > 0 else None,
+            'bytes': written,
+            'peak_rss_mb': self.peak_rss_mb,
+            'stages': stages,
+            **self.extra,
+        }
+
+
+@contextlib.contextmanager
+def stage(name, frames=0):
+    """
+    Mark a pipeline stage in the run being measured (a no-op otherwise).
+    Usable as a context manager, yielding the stage record, or a decorator.
+    """
+    if not _active:
+        yield _new_stage()
+        return
+    with _active[-1].stage(name, frames) as record:
+        yield record
+
+
+@contextlib.contextmanager
+def measure(label, profile=None, profile_path=None):
+    """
+    Measure everything run inside the block as one RunReport.
+
+    profile is None, 'cprofile' or 'tracemalloc'. With cprofile and a
+    profile_path the raw stats are also dumped there.
+    """
+    if profile not in (None, *PROFILERS):
+        raise ValueError(f"Unknown profiler: {profile}")
+    report = RunReport(label, profile)
+    profiler = None
+    started_tracing = False
+    if profile == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif profile == 'tracemalloc' and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracing = True
+
+    _active.append(report)
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.seconds = time.perf_counter() - start
+        _active.pop()
+        report.peak_rss_mb = peak_rss_mb()
+        if profiler is not None:
+            profiler.disable()
+            report.extra['profile'] = profile_summary(profiler)
+            if profile_path:
+                profiler.dump_stats(profile_path)
+        elif started_tracing:
+            tracemalloc.stop()
+
+
+def profile_summary(profiler, limit=PROFILE_TOP):
+    """Top functions of a cProfile run by cumulative time."""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({'function': f"{Path(filename).name}:{line}({function})", 'calls': calls,
+                     'own_seconds': round(own, 6), 'cumulative_seconds': round(cumulative, 6)})
+    rows.sort(key=lambda row: -row['cumulative_seconds'])
+    return rows[:limit]
+
+
+def allocation_summary(snapshot, limit=PROFILE_TOP):
+    """Largest live allocation sites in a tracemalloc snapshot."""
+    return [{'site': f"{Path(stat.traceback[0].filename).name}:{stat.traceback[0].lineno}",
+             'mb': round(stat.size / 1024 / 1024, 3), 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:limit]]
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))] if values else None
+
+
+def aggregate(runs):
+    """
+    Summary of run records (RunReport.as_dict): totals, per-stage sums with
+    their share of the time, the largest peak RSS, run time percentiles and
+    the slowest runs.
+    """
+    runs = list(runs)
+    seconds = sum(run['seconds'] for run in runs)
+    frames = sum(run['frames'] for run in runs)
+    stages = {}
+    for run in runs:
+        for name, record in run['stages'].items():
+            total = stages.setdefault(name, _new_stage())
+            for key in ('seconds', 'calls', 'frames', 'bytes'):
+                total[key] += record[key]
+            if record['peak_rss_mb'] is not None:
+                total['peak_rss_mb'] = max(total['peak_rss_mb'] or 0.0, record['peak_rss_mb'])
+    stage_seconds = sum(total['seconds'] for total in stages.values())
+    for total in stages.values():
+        total['seconds'] = round(total['seconds'], 6)
+        total['share'] = round(total['seconds'] / stage_seconds, 4) if stage_seconds > 0 else None
+        if total['frames'] and total['seconds'] > 0:
+            total['fps'] = round(total['frames'] / total['seconds'], 1)
+    peaks = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+    durations = [run['seconds'] for run in runs]
+    return {
+        'type': 'summary',
+        'runs': len(runs),
+        'failed': sum(1 for run in runs if run.get('ok') is False),
+        'seconds': round(seconds, 6),
+        'frames': frames,
+        'fps': round(frames / seconds, 1) if frames and seconds > 0 else None,
+        'bytes': sum(run['bytes'] for run in runs),
+        'peak_rss_mb': max(peaks) if peaks else None,
+        'seconds_p50': _percentile(durations, 0.5),
+        'seconds_p95': _percentile(durations, 0.95),
+        'stages': stages,
+        'slowest': [{'label': run['label'], 'seconds': run['seconds']}
+                    for run in sorted(runs, key=lambda run: -run['seconds'])[:5]],
+    }
+
+
+def write_report(path, runs, **summary_fields):
+    """
+    Write run records and their aggregate: NDJSON (one run per line, then the
+    summary) for .ndjson/.jsonl paths, otherwise one JSON document.
+    Returns the summary.
+    """
+    path = Path(path)
+    runs = list(runs)
+    summary = {**aggregate(runs), **summary_fields}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        if path.suffix in ('.ndjson', '.jsonl'):
+            for run in runs:
+                f.write(json.dumps({'type': 'run', **run}) + '\n')
+            f.write(json.dumps(summary) + '\n')
+        else:
+            json.dump({'summary': summary, 'runs': runs}, f, indent=2)
+    return summary
+
+
+def print_stage_summary(summary):
+    """Print an aggregate() summary as a stage table."""
+    throughput = f" ({summary['fps']:.0f} frames/s)" if summary['fps'] else ""
+    print(f"\n⏱️  {summary['runs']} run(s): {summary['seconds']:.2f}s, {summary['frames']} frames{throughput}, "
+          f"{summary['bytes'] / 1024:.0f} KB written, peak RSS {summary['peak_rss_mb']} MB")
+    order = {name: i for i, name in enumerate(STAGES)}
+    for name in sorted(summary['stages'], key=lambda name: (order.get(name, len(STAGES)), name)):
+        total = summary['stages'][name]
+        share = f"{total['share']:6.1%}" if total['share'] is not None else "     -"
+        fps = f"{total['fps']:>10.0f} frames/s" if total.get('fps') else ""
+        print(f"   {name:<10} {total['seconds']:8.3f}s {share} {fps}")
+
+
+def report_runs(path, runs, wall_seconds=None):
+    """
+    Print the stage summary of run records and write them to path (if any).
+    wall_seconds is the elapsed time of a parallel batch, which the per-run
+    seconds overcount. Returns the summary.
+    """
+    runs = list(runs)
+    fields = {}
+    if wall_seconds:
+        frames = sum(run['frames'] for run in runs)
+        fields = {'wall_seconds': round(wall_seconds, 3), 'wall_fps': round(frames / wall_seconds, 1)}
+    summary = write_report(path, runs, **fields) if path else {**aggregate(runs), **fields}
+    print_stage_summary(summary)
+    if wall_seconds:
+        print(f"   Wall time: {wall_seconds:.2f}s ({summary['wall_fps']:.0f} frames/s across workers)")
+    if path:
+        print(f"   Report: {path}")
+    return summary
+
+
+def add_report_arguments(parser):
+    """Add the --report and --profile options to an argparse parser."""
+    parser.add_argument('--report', default=None, metavar='PATH',
+                        help='Write per-stage timings, memory and throughput as JSON '
+                             '(or NDJSON for a .ndjson path)')
+    parser.add_argument('--profile', choices=PROFILERS, default=None,
+                        help='Also profile the run: cprofile (top functions, plus REPORT.prof) or '
+                             'tracemalloc (peak allocations per stage)')
+    return parser
@@ -3,44 +3,56 @@
 Convert WLASL words from mapping to GLB animations and update signs.json
 """
 import json
-import subprocess
 import os
 import sys
 
-def convert_word_to_glb(word_info):
-    """Convert a single word from .pkl to .glb"""
-    file_id = word_info['file_id']
-    sign_key = word_info['sign_key']
-    gloss = word_info['gloss']
-    
-    pkl_path = f"signavatars-data/asl-word-level/{file_id}.pkl"
-    glb_path = f"animations/{sign_key}.glb"
-    
-    # Skip if already exists
-    if os.path.exists(glb_path):
-        print(f"   ⏩ {gloss}: {glb_path} already exists")
-        return True
-    
-    # Convert
-    cmd = [
-        ".venv/bin/python",
-        "convert_pkl_to_glb.py",
-        "--input", pkl_path,
-        "--output", glb_path
-    ]
+from batch_engine import ConversionJob, run_batch
+from build_manifest import BuildManifest
+from conversion_settings import DEFAULT_SETTINGS
+
+SMPLX_MODEL = "signavatars-data/models"
+MANIFEST = "animations/.build-manifest.json"
+
+def convert_words_to_glb(mapping):
+    """Convert every mapped word from .pkl to .glb on a warm worker pool"""
+    manifest = BuildManifest(MANIFEST, SMPLX_MODEL, DEFAULT_SETTINGS)
+    jobs = []
+    fingerprints = {}
+    converted = 0
+    for word, info in sorted(mapping.items()):
+        file_id = info['file_id']
+        sign_key = info['sign_key']
+        gloss = info['gloss']
+        
+        pkl_path = f"signavatars-data/asl-word-level/{file_id}.pkl"
+        glb_path = f"animations/{sign_key}.glb"
+        
+        if not os.path.exists(pkl_path):
+            print(f"   ❌ {gloss}: {pkl_path} not found")
+            continue
+        
+        # Skip if the output was built from the same .pkl, model and settings
+        fingerprint = manifest.fingerprint(pkl_path)
+        if manifest.is_current(glb_path, fingerprint):
+            print(f"   ⏩ {gloss}: {glb_path} is up to date")
+            converted += 1
+            continue
+        
+        fingerprints[glb_path] = fingerprint
+        jobs.append(ConversionJob(pkl_path, glb_path, gloss))
     
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            print(f"   ✅ {gloss}: {file_id} → {sign_key}.glb")
-            return True
+    for result in run_batch(jobs, SMPLX_MODEL, settings=DEFAULT_SETTINGS):
+        job = result['job']
+        if result['ok']:
+            print(f"   ✅ {job.word}: {os.path.basename(job.input_path)} → {os.path.basename(job.output_path)}")
+            manifest.record(job.output_path, fingerprints[job.output_path])
+            manifest.save()
+            converted += 1
         else:
-            print(f"   ❌ {gloss}: Conversion failed")
-            print(f"      {result.stderr[:200]}")
-            return False
-    except Exception as e:
-        print(f"   ❌ {gloss}: Error - {e}")
-        return False
+            print(f"   ❌ {job.word}: Conversion failed")
+            print(f"      {result['error'][:200]}")
+    
+    return converted
 
 def update_signs_json(mapping):
     """Update signs.json with WLASL word mappings"""
@@ -90,10 +102,7 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == '--convert':
         # Convert all words
         print(f"\n🔄 Converting words to GLB animations...")
-        converted = 0
-        for word, info in sorted(mapping.items()):
-            if convert_word_to_glb(info):
-                converted += 1
+        converted = convert_words_to_glb(mapping)
         print(f"\n✅ Converted {converted}/{len(mapping)} words")
     
     # Update signs.json with word aliases
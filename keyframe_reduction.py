@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Error-bounded adaptive keyframe selection for morph-target signs.
+
+The fixed-stride selection in convert_pkl_to_glb.py gives fast fingerspelling
+and long holds the same key budget. select_adaptive_keyframes instead works on
+the whole (F, V, 3) vertex sequence: it starts from the first and last frame
+and greedily adds the frame with the largest interpolation error until every
+source frame is within the tolerance, or the key budget is spent.
+
+Errors are measured the way the GLB plays back. Each morph keyframe is one
+fully weighted target, so LINEAR weight interpolation is a straight line
+between key poses. CUBICSPLINE interpolation is a Hermite curve through them,
+with Catmull-Rom tangents; hermite_tangents gives those tangents for either
+vertices or morph weights, since positions are linear in the weights.
+
+Usage:
+    indices, max_error = select_adaptive_keyframes(vertices, times, tolerance=0.002, max_keyframes=40)
+"""
+
+import bisect
+import numpy as np
+
+INTERPOLATIONS = ('LINEAR', 'CUBICSPLINE')
+
+
+def hermite_tangents(values, times):
+    """
+    Catmull-Rom tangents (per second) for (K, ...) key values at times (K,).
+
+    Interior keys use the central difference of their neighbours, the end
+    keys a one-sided difference.
+    """
+    values = np.asarray(values)
+    times = np.asarray(times, dtype=np.float64)
+    tangents = np.zeros(values.shape, dtype=np.float32)
+    if len(values) < 2:
+        return tangents
+    shape = (-1,) + (1,) * (values.ndim - 1)
+    tangents[1:-1] = (values[2:] - values[:-2]) / (times[2:] - times[:-2]).reshape(shape)
+    tangents[0] = (values[1] - values[0]) / (times[1] - times[0])
+    tangents[-1] = (values[-1] - values[-2]) / (times[-1] - times[-2])
+    return tangents
+
+
+def cubic_spline_output(values, times):
+    """
+    glTF CUBICSPLINE sampler output for (K, N) key values: rows of
+    (in-tangent, value, out-tangent) per key, shape (3 * K, N).
+    """
+    values = np.asarray(values, dtype=np.float32)
+    tangents = hermite_tangents(values, times)
+    return np.stack([tangents, values, tangents], axis=1).reshape(-1, values.shape[1])
+
+
+def _key_tangent(vertices, times, keys, position):
+    """Catmull-Rom tangent of the key at keys[position], given its current neighbours."""
+    before = keys[max(position - 1, 0)]
+    after = keys[min(position + 1, len(keys) - 1)]
+    return (vertices[after] - vertices[before]) / (times[after] - times[before])
+
+
+def _segment_errors(vertices, times, keys, segment, interpolation):
+    """Per-frame max vertex distance for the frames strictly inside keys[segment]..keys[segment + 1]."""
+    start, stop = keys[segment], keys[segment + 1]
+    frames = np.arange(start + 1, stop)
+    if len(frames) == 0:
+        return frames, np.zeros(0)
+
+    duration = times[stop] - times[start]
+    s = ((times[frames] - times[start]) / duration).astype(np.float32)[:, None, None]
+    if interpolation == 'CUBICSPLINE':
+        start_tangent = _key_tangent(vertices, times, keys, segment)
+        stop_tangent = _key_tangent(vertices, times, keys, segment + 1)
+        approx = ((2 * s**3 - 3 * s**2 + 1) * vertices[start] + (s**3 - 2 * s**2 + s) * duration * start_tangent +
+                  (-2 * s**3 + 3 * s**2) * vertices[stop] + (s**3 - s**2) * duration * stop_tangent)
+    else:
+        approx = vertices[start] + s * (vertices[stop] - vertices[start])
+
+    return frames, np.linalg.norm(vertices[frames] - approx, axis=2).max(axis=1)
+
+
+def select_adaptive_keyframes(vertices, times, tolerance, max_keyframes=None, interpolation='LINEAR'):
+    """
+    Choose the fewest keyframes (greedily) that keep every source frame within tolerance.
+
+    vertices is (F, V, 3), times (F,) in seconds, tolerance the allowed max
+    vertex distance in the same units as vertices. max_keyframes caps the
+    count (None = no cap, minimum 2). Returns (sorted frame indices,
+    achieved max vertex error over all frames).
+    """
+    if interpolation not in INTERPOLATIONS:
+        raise ValueError(f"Unknown interpolation: {interpolation}")
+    num_frames = len(vertices)
+    if num_frames < 2:
+        return list(range(num_frames)), 0.0
+    times = np.asarray(times, dtype=np.float64)
+    max_keyframes = None if max_keyframes is None else max(2, int(max_keyframes))
+
+    keys = [0, num_frames - 1]
+    errors = np.zeros(num_frames)
+    frames, segment_errors = _segment_errors(vertices, times, keys, 0, interpolation)
+    errors[frames] = segment_errors
+
+    while True:
+        worst = int(np.argmax(errors))
+        if errors[worst] <= tolerance or (max_keyframes is not None and len(keys) >= max_keyframes):
+            break
+        position = bisect.bisect(keys, worst)
+        keys.insert(position, worst)
+        errors[worst] = 0.0
+
+        # The new key splits one segment; with cubic tangents it also changes
+        # the tangents of its neighbours, so their outer segments are redone too
+        reach = 2 if interpolation == 'CUBICSPLINE' else 1
+        for segment in range(max(position - reach, 0), min(position + reach, len(keys) - 1)):
+            frames, segment_errors = _segment_errors(vertices, times, keys, segment, interpolation)
+            errors[frames] = segment_errors
+
+    return keys, float(errors.max())
+
+
+def max_weight_sum(weights, times, interpolation='LINEAR'):
+    """
+    Upper bound on sum(|w|) over all morph weights at any time between keys.
+
+    weights is the sampler output: (K, N) for LINEAR, (3 * K, N) for
+    CUBICSPLINE. Linear interpolation never exceeds its keys; for a cubic
+    segment the value basis functions sum to 1 and each tangent basis
+    function peaks at 4/27.
+    """
+    weights = np.abs(np.asarray(weights, dtype=np.float64))
+    if interpolation != 'CUBICSPLINE':
+        return float(weights.sum(axis=1).max()) if len(weights) else 0.0
+
+    keys = weights.reshape(len(times), 3, -1)
+    in_tangents, values, out_tangents = keys[:, 0], keys[:, 1], keys[:, 2]
+    if len(times) < 2:
+        return float(values.sum(axis=1).max())
+    durations = np.diff(np.asarray(times, dtype=np.float64))[:, None]
+    segments = np.maximum(values[:-1], values[1:]) + durations * 4 / 27 * (out_tangents[:-1] + in_tangents[1:])
+    return float(segments.sum(axis=1).max())
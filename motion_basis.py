@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+PCA motion basis for morph-target signs.
+
+The keyframe export spends one full-mesh morph target per keyframe and only
+ever weights one of them at a time. fit_motion_basis instead factorizes the
+sign's (F, V*3) vertex trajectory: the mean pose becomes the base mesh, the
+first k principal components become k morph targets, and each frame's
+component scores become the weight curve, at the full source frame rate.
+k is the smallest count that keeps every vertex of every frame within the
+error target.
+
+Usage:
+    mean, targets, weights, max_error = fit_motion_basis(vertices, tolerance=0.002, max_components=8)
+"""
+
+import numpy as np
+
+# Used when the settings leave the basis options unset
+DEFAULT_BASIS_TOLERANCE = 0.002  # metres
+DEFAULT_MAX_BASIS = 8
+
+
+def fit_motion_basis(vertices, tolerance=DEFAULT_BASIS_TOLERANCE, max_components=DEFAULT_MAX_BASIS):
+    """
+    Factorize an (F, V, 3) vertex sequence into a mean pose and k morph targets.
+
+    Components are added in order of explained variance until the largest
+    per-vertex reconstruction error is within tolerance, or max_components is
+    reached.
+    Returns (mean (V, 3), targets (k, V, 3), weights (F, k), max vertex error).
+    """
+    vertices = np.asarray(vertices, dtype=np.float32)
+    num_frames, num_vertices, _ = vertices.shape
+    mean = vertices.mean(axis=0)
+    residual = (vertices - mean).reshape(num_frames, -1)
+
+    # Thin SVD: F is at most a few hundred frames, V*3 is ~31k
+    left, singular, right = np.linalg.svd(residual, full_matrices=False)
+    max_components = min(max_components, len(singular))
+
+    def max_vertex_error():
+        return float(np.linalg.norm(residual.reshape(num_frames, num_vertices, 3), axis=2).max()) \
+            if num_frames else 0.0
+
+    count = 0
+    max_error = max_vertex_error()
+    while max_error > tolerance and count < max_components:
+        residual -= np.outer(left[:, count] * singular[count], right[count])
+        count += 1
+        max_error = max_vertex_error()
+
+    # Targets carry the singular values so the weights are the unit-scale scores
+    targets = (right[:count] * singular[:count, None]).reshape(count, num_vertices, 3)
+    weights = np.ascontiguousarray(left[:, :count])
+    return mean, targets.astype(np.float32), weights.astype(np.float32), max_error
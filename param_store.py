@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Packed SMPL-X parameter store.
+
+Decoding a SignAvatars .pkl unpickles every torch storage blob through
+torch.load. Ingest does that once per file and packs each sign's 'smplx' rows
+into one flat float32 file, with an index.json mapping file id -> offset,
+frame count and row width, plus the source .pkl's size and mtime. ParamStore
+memory-maps the packed file read-only, so converters and analyzers get a
+sign's rows without importing torch, and batch workers share the pages.
+
+Re-ingesting copies unchanged signs from the existing store and only decodes
+new or modified pickles. load_params() falls back to the .pkl for signs that
+are missing from the store or have changed since it was built.
+
+Usage:
+    python param_store.py --pkl-dir signavatars-data/asl-word-level
+    store = open_param_store('signavatars-data/param-store')
+    params = store.load('00295')  # {'smplx': (frames, 182) float32, read-only}
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import pickle
+import time
+import numpy as np
+from pathlib import Path
+
+DEFAULT_PARAM_STORE = Path("signavatars-data/param-store")
+INDEX_FILE = 'index.json'
+STORE_FORMAT = 1
+
+# Each sign starts on a 64-byte boundary
+ALIGN_ELEMENTS = 16
+
+
+class CPU_Unpickler(pickle.Unpickler):
+    """Unpickler that loads torch storages onto the CPU, whatever device they were saved from."""
+
+    def find_class(self, module, name):
+        if module == 'torch.storage' and name == '_load_from_bytes':
+            import torch
+            return lambda b: torch.load(io.BytesIO(b), map_location='cpu', weights_only=False)
+        return super().find_class(module, name)
+
+
+def _to_numpy(obj):
+    """Replace torch tensors with numpy arrays throughout a decoded pickle, in one walk."""
+    if hasattr(obj, 'detach') and hasattr(obj, 'numpy'):
+        return obj.detach().numpy()
+    if isinstance(obj, dict):
+        return {key: _to_numpy(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_to_numpy(item) for item in obj)
+    return obj
+
+
+def read_pkl(pkl_path):
+    """Decode a SignAvatars .pkl (PyTorch tensors) into a dict of numpy arrays. Needs torch."""
+    with open(pkl_path, 'rb') as f:
+        return _to_numpy(CPU_Unpickler(f).load())
+
+
+def _source_stat(pkl_path):
+    stat = os.stat(pkl_path)
+    return {'source': str(Path(pkl_path).resolve()), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class ParamStore:
+    """Read-only view of an ingested store; rows are slices of one memory map."""
+
+    def __init__(self, store_dir=DEFAULT_PARAM_STORE):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / INDEX_FILE) as f:
+            index = json.load(f)
+        if index.get('format') != STORE_FORMAT:
+            raise ValueError(f"Unsupported parameter store format in {self.store_dir}: {index.get('format')}")
+        self.entries = index['entries']
+        self.data_file = index['data_file']
+        total = index['total_elements']
+        self.data = np.memmap(self.store_dir / self.data_file, dtype=np.float32, mode='r', shape=(total,)) \
+            if total else np.zeros(0, dtype=np.float32)
+
+    def __contains__(self, file_id):
+        return file_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def ids(self):
+        return sorted(self.entries)
+
+    def get(self, file_id):
+        """(frames, width) float32 'smplx' rows of one sign, as a read-only view."""
+        entry = self.entries[file_id]
+        count = entry['frames'] * entry['width']
+        return self.data[entry['offset']:entry['offset'] + count].reshape(entry['frames'], entry['width'])
+
+    def load(self, file_id):
+        """Parameters in the same shape load_pkl_params returns (only the 'smplx' key is stored)."""
+        return {'smplx': self.get(file_id)}
+
+    def is_current(self, pkl_path):
+        """True if the store holds this exact .pkl, unchanged since ingest."""
+        entry = self.entries.get(Path(pkl_path).stem)
+        if entry is None:
+            return False
+        try:
+            current = _source_stat(pkl_path)
+        except OSError:
+            return False
+        return all(entry[key] == value for key, value in current.items())
+
+
+_open_stores = {}
+
+
+def open_param_store(store_dir=DEFAULT_PARAM_STORE):
+    """The store at store_dir, reused while its index is unchanged; None if there is none."""
+    index_path = Path(store_dir) / INDEX_FILE
+    try:
+        stat = os.stat(index_path)
+    except OSError:
+        return None
+    key = (str(index_path), stat.st_size, stat.st_mtime_ns)
+    if key not in _open_stores:
+        _open_stores.clear()
+        _open_stores[key] = ParamStore(store_dir)
+    return _open_stores[key]
+
+
+def load_params(pkl_path, store_dir=DEFAULT_PARAM_STORE):
+    """
+    SMPL-X parameters for a .pkl: from the store when it holds the unchanged
+    file (no torch needed), otherwise decoded from the pickle itself.
+    """
+    store = open_param_store(store_dir) if store_dir is not None else None
+    if store is not None and store.is_current(pkl_path):
+        return store.load(Path(pkl_path).stem)
+    return read_pkl(pkl_path)
+
+
+def ingest(pkl_paths, store_dir=DEFAULT_PARAM_STORE, force=False):
+    """
+    Pack the 'smplx' rows of pkl_paths into a store at store_dir.
+
+    Signs already in the store with the same source size and mtime are copied
+    from it instead of being decoded again (unless force). The new data file
+    and index are written beside the old ones and the index is swapped in
+    last, so readers never see a half-written store.
+    Returns a summary dict.
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    previous = None if force else open_param_store(store_dir)
+
+    entries = {}
+    decoded = reused = 0
+    digest = hashlib.sha256()
+    tmp_data = store_dir / f".params-{os.getpid()}.tmp"
+    offset = 0
+    with open(tmp_data, 'wb') as out:
+        for pkl_path in pkl_paths:
+            file_id = Path(pkl_path).stem
+            if file_id in entries:
+                raise ValueError(f"Duplicate file id {file_id}: {pkl_path}")
+            if previous is not None and previous.is_current(pkl_path):
+                rows = previous.get(file_id)
+                reused += 1
+            else:
+                rows = read_pkl(pkl_path).get('smplx')
+                if rows is None:
+                    print(f"  ⚠️  {pkl_path}: no 'smplx' key, skipped")
+                    continue
+                decoded += 1
+            rows = np.ascontiguousarray(rows, dtype=np.float32)
+            if rows.ndim != 2:
+                print(f"  ⚠️  {pkl_path}: 'smplx' has shape {rows.shape}, skipped")
+                continue
+
+            padding = -offset % ALIGN_ELEMENTS
+            out.write(b'\0' * (padding * 4))
+            offset += padding
+            data = rows.tobytes()
+            out.write(data)
+            digest.update(data)
+            entries[file_id] = {'offset': offset, 'frames': rows.shape[0], 'width': rows.shape[1],
+                                **_source_stat(pkl_path)}
+            offset += rows.size
+
+    data_file = f"params-{digest.hexdigest()[:16]}.f32"
+    os.replace(tmp_data, store_dir / data_file)
+    index = {'format': STORE_FORMAT, 'data_file': data_file, 'dtype': 'float32',
+             'total_elements': offset, 'entries': entries}
+    tmp_index = store_dir / f".{INDEX_FILE}.{os.getpid()}.tmp"
+    with open(tmp_index, 'w') as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp_index, store_dir / INDEX_FILE)
+
+    # Old data files stay readable through any open memory maps until closed
+    for stale in store_dir.glob('params-*.f32'):
+        if stale.name != data_file:
+            stale.unlink()
+
+    return {'signs': len(entries), 'decoded': decoded, 'reused': reused,
+            'frames': sum(entry['frames'] for entry in entries.values()), 'bytes': offset * 4}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Decode SignAvatars .pkl files once into a packed parameter store')
+    parser.add_argument('--pkl-dir', default='signavatars-data/asl-word-level',
+                        help='Directory of SignAvatars .pkl files')
+    parser.add_argument('--store', default=str(DEFAULT_PARAM_STORE), help='Store directory to write')
+    parser.add_argument('--force', action='store_true', help='Decode every .pkl, even if unchanged')
+    args = parser.parse_args()
+
+    pkl_paths = sorted(Path(args.pkl_dir).glob("*.pkl"))
+    if not pkl_paths:
+        print(f"❌ ERROR: No .pkl files found in {args.pkl_dir}")
+        return 1
+
+    start = time.time()
+    print(f"Ingesting {len(pkl_paths)} .pkl files into {args.store}")
+    summary = ingest(pkl_paths, args.store, force=args.force)
+    print(f"\n✅ Parameter store: {summary['signs']} signs, {summary['frames']} frames "
+          f"({summary['bytes'] / 1024 / 1024:.1f} MB)")
+    print(f"   Decoded {summary['decoded']}, reused {summary['reused']} in {time.time() - start:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Per-page preload manifests: which sign GLBs a page needs, in reading order.
+
+app.js fetches a sign's GLB on its first hover or click, so the first play
+of every sign waits for a multi-megabyte download. This works out a page's
+fetch plan ahead of time: the sign keys in reading order (from the page
+itself, or from its site_build.py manifest), each GLB they need with its byte
+size and clip duration, and <link rel="preload"> hints for those files in
+order of first appearance until a byte budget is spent. Animation-only signs
+are preceded by the shared base avatar named in their asset.extras.
+
+The hints use as="fetch" with crossorigin="anonymous", which is the request
+three.js GLTFLoader makes, so the browser reuses the preloaded response.
+Only each GLB's JSON chunk is read, not its buffers.
+
+Usage:
+    python preload_manifest.py --page index.html                   # -> index.preload.json
+    python preload_manifest.py --page build/docs/page.signs.json --budget-mb 4
+    python preload_manifest.py --page build/index.html --inject    # also add the hints to <head>
+"""
+
+import argparse
+import json
+import os
+import re
+from html import escape
+from pathlib import Path
+
+from build_manifest import file_sha256
+from glb_writer import read_glb_json
+from gloss_matcher import DEFAULT_INDEX, DEFAULT_MAPPING, DEFAULT_SIGNS, load_index
+from sign_annotator import TokenMatcher, annotate_file, page_manifest
+
+ANIMATIONS_DIR = Path("animations")
+BASE_URL = "animations/"
+DEFAULT_BUDGET_MB = 8
+PRELOAD_SUFFIX = '.preload.json'
+PRELOAD_ATTRIBUTE = 'data-sign-preload'
+# Marks sign_bundle.py's tags, which per-sign hint injection leaves alone
+BUNDLE_ATTRIBUTE = 'data-sign-bundle'
+
+HEAD_END = re.compile(r'</head\s*>', re.IGNORECASE)
+
+
+def glb_info(path):
+    """Byte size, first clip duration (seconds) and base avatar of a GLB, or None if it does not exist."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return None
+    gltf = read_glb_json(path)
+    duration = None
+    animations = gltf.get('animations') or []
+    if animations:
+        accessors = gltf.get('accessors', [])
+        inputs = {sampler['input'] for sampler in animations[0].get('samplers', [])}
+        ends = [accessors[i]['max'][0] for i in inputs if accessors[i].get('max')]
+        duration = round(max(ends), 3) if ends else None
+    base_avatar = gltf.get('asset', {}).get('extras', {}).get('baseAvatar')
+    return {'bytes': size, 'duration': duration, 'base_avatar': base_avatar}
+
+
+def preload_link(href, marker=PRELOAD_ATTRIBUTE):
+    return (f'<link rel="preload" href="{escape(href)}" as="fetch" type="model/gltf-binary" '
+            f'crossorigin="anonymous" {marker}>')
+
+
+def preload_plan(manifest, signs, animations_dir=ANIMATIONS_DIR, budget_bytes=DEFAULT_BUDGET_MB << 20,
+                 base_url=BASE_URL, info_cache=None):
+    """
+    Fetch plan for a page manifest (site_build.page_manifest format).
+
+    Files are listed in order of first appearance; preload hints cover that
+    order up to the first file that would exceed budget_bytes. info_cache
+    (file -> glb_info) lets a caller share GLB reads across pages.
+    """
+    info_cache = {} if info_cache is None else info_cache
+
+    def info(file):
+        if file not in info_cache:
+            info_cache[file] = glb_info(Path(animations_dir) / file)
+        return info_cache[file]
+
+    files = {}
+    missing = []
+
+    def add_file(file, key):
+        if file in files or file in missing:
+            return
+        details = info(file)
+        if details is None:
+            missing.append(file)
+            return
+        if details['base_avatar']:
+            add_file(details['base_avatar'], key)
+        files[file] = {'file': file, 'href': base_url + file, 'bytes': details['bytes'],
+                       'duration': details['duration'], 'first_key': key}
+
+    entries = []
+    for sign in manifest['signs']:
+        part_keys = sign.get('parts', [sign['key']] if sign['mode'] == 'sign' else [])
+        sign_files = [signs[part]['file'] for part in part_keys if signs.get(part, {}).get('file')]
+        for file in sign_files:
+            add_file(file, sign['key'])
+        durations = [files[file]['duration'] for file in sign_files if file in files]
+        entries.append({'key': sign['key'], 'mode': sign['mode'], 'files': sign_files,
+                        'duration': round(sum(d for d in durations if d), 3) if durations else None})
+
+    # Hints follow reading order and stop at the first file that does not fit
+    preload_bytes = 0
+    links = []
+    for details in files.values():
+        details['preload'] = preload_bytes + details['bytes'] <= budget_bytes
+        if not details['preload']:
+            break
+        preload_bytes += details['bytes']
+        links.append(preload_link(details['href']))
+    for details in files.values():
+        details.setdefault('preload', False)
+
+    return {
+        'page': manifest.get('page'),
+        'budget_bytes': budget_bytes,
+        'preload_bytes': preload_bytes,
+        'total_bytes': sum(details['bytes'] for details in files.values()),
+        'signs': entries,
+        'files': list(files.values()),
+        'missing': missing,
+        'links': links,
+    }
+
+
+def is_marked_tag(line, markers):
+    return line.lstrip().startswith(('<link', '<meta')) and any(marker in line for marker in markers)
+
+
+def inject_links(html_path, links, replace=(PRELOAD_ATTRIBUTE,)):
+    """
+    Insert preload hints (or other <link>/<meta> tags) before </head> of an
+    HTML file, first removing the tags a previous run added: those carrying
+    one of the replace marker attributes. Streams the file line by line.
+    Returns False if the page has no </head>.
+    """
+    html_path = Path(html_path)
+    tmp_path = html_path.with_name(html_path.name + '.tmp')
+    injected = False
+    with open(html_path, 'r', encoding='utf-8', newline='') as src, \
+            open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+        for line in src:
+            if is_marked_tag(line, replace):
+                continue
+            match = None if injected else HEAD_END.search(line)
+            if match:
+                before = line[:match.start()]
+                if before.strip():
+                    out.write(before + '\n')
+                    before = ''
+                out.writelines(f'{before}  {link}\n' for link in links)
+                out.write(before + line[match.start():])
+                injected = True
+            else:
+                out.write(line)
+    if injected:
+        os.replace(tmp_path, html_path)
+    else:
+        os.remove(tmp_path)
+    return injected
+
+
+def has_sign_bundle(html_path):
+    """Whether an HTML page's <head> carries sign_bundle.py tags."""
+    with open(html_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if is_marked_tag(line, (BUNDLE_ATTRIBUTE,)):
+                return True
+            if HEAD_END.search(line):
+                return False
+    return False
+
+
+def page_manifest_for(path, signs_path, mapping_path, index_path):
+    """Page manifest from a .signs.json file, or by annotating an HTML page (output discarded)."""
+    path = Path(path)
+    if path.suffix == '.json':
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    with open(signs_path, 'r') as f:
+        signs = json.load(f)
+    matcher = TokenMatcher(load_index(signs_path, mapping_path, index_path))
+    annotator = annotate_file(str(path), os.devnull, matcher)
+    return page_manifest(path, file_sha256(path), annotator, signs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a per-page sign preload manifest')
+    parser.add_argument('--page', required=True, help='HTML page, or its site_build.py .signs.json manifest')
+    parser.add_argument('--output', default=None, help=f'Preload manifest (default: PAGE{PRELOAD_SUFFIX})')
+    parser.add_argument('--budget-mb', type=float, default=DEFAULT_BUDGET_MB,
+                        help=f'Preload at most this many MB (default: {DEFAULT_BUDGET_MB})')
+    parser.add_argument('--animations', default=str(ANIMATIONS_DIR), help='Directory holding the GLBs')
+    parser.add_argument('--base-url', default=BASE_URL, help=f'URL prefix of the GLBs (default: {BASE_URL})')
+    parser.add_argument('--inject', action='store_true', help='Add the preload hints to the HTML page\'s <head>')
+    parser.add_argument('--signs', default=DEFAULT_SIGNS, help=f'Sign registry (default: {DEFAULT_SIGNS})')
+    parser.add_argument('--mapping', default=DEFAULT_MAPPING,
+                        help=f'WLASL gloss mapping (default: {DEFAULT_MAPPING})')
+    parser.add_argument('--index', default=str(DEFAULT_INDEX),
+                        help=f'Serialized gloss index (default: {DEFAULT_INDEX})')
+    args = parser.parse_args()
+
+    page = Path(args.page)
+    manifest = page_manifest_for(page, args.signs, args.mapping, args.index)
+    with open(args.signs, 'r') as f:
+        signs = json.load(f)
+    plan = preload_plan(manifest, signs, args.animations, int(args.budget_mb * (1 << 20)), args.base_url)
+
+    stem = page.name[:-len('.signs.json')] if page.name.endswith('.signs.json') else page.stem
+    output = Path(args.output) if args.output else page.with_name(stem + PRELOAD_SUFFIX)
+    with open(output, 'w') as f:
+        json.dump(plan, f, indent=2)
+
+    print(f"✅ {output}: {len(plan['signs'])} signs, {len(plan['files'])} GLBs "
+          f"({plan['total_bytes'] / 1e6:.1f} MB), preloading {len(plan['links'])} "
+          f"({plan['preload_bytes'] / 1e6:.1f} MB)")
+    if plan['missing']:
+        print(f"⚠️  Not built yet: {', '.join(plan['missing'])}")
+    if args.inject:
+        if page.suffix == '.json':
+            print("⚠️  --inject needs an HTML page")
+        elif not inject_links(page, plan['links']):
+            print(f"⚠️  No </head> in {page}; hints not injected")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Vocabulary-wide shared motion basis.
+
+Build stage: run a sample of frames from every sign through the body model
+(mean shape, centred and flipped like the GLB export), and fit one PCA basis
+across the whole vocabulary. The mean pose and the basis components are
+written once as animations/basis-avatar.glb, a mesh whose morph targets are
+the components. The basis itself is saved to animations/shared-basis.npz for
+the per-sign step.
+
+Per-sign step (convert_pkl_to_glb.py --mode weights): project every frame of
+the sign onto the basis. The sign becomes a weight-curve animation only, a
+few KB, that binds by node name to basis-avatar.glb. app.js loads that avatar
+once (asset.extras.baseAvatar).
+
+The basis is fitted with a randomized SVD, so the build needs only the
+sampled frames in memory (max_samples x V x 3 floats).
+
+Usage:
+    python shared_basis.py --tolerance 0.005 --max-components 48 --quantize int16
+    python batch_convert.py --mode weights
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+import numpy as np
+from pathlib import Path
+
+from conversion_settings import CONVERTER_VERSION, DEFAULT_CHUNK_SIZE, DEFAULT_SHARED_BASIS
+from keyframe_reduction import max_weight_sum
+from instrumentation import stage
+
+BASIS_AVATAR_FILE = 'basis-avatar.glb'
+
+DEFAULT_SHARED_TOLERANCE = 0.005  # metres, on the sampled frames
+DEFAULT_SHARED_COMPONENTS = 48
+DEFAULT_MAX_SAMPLES = 2048
+
+
+def randomized_pca(samples, rank, oversample=10, power_iterations=2, seed=0):
+    """
+    Leading principal components of (N, D) samples.
+
+    Returns (mean (D,), singular values (k,), components (k, D) with
+    orthonormal rows), k = min(rank, N).
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    mean = samples.mean(axis=0)
+    centred = samples - mean
+    width = min(rank + oversample, *centred.shape)
+
+    if width >= min(centred.shape):
+        _, singular, components = np.linalg.svd(centred, full_matrices=False)
+    else:
+        rng = np.random.default_rng(seed)
+        sketch = centred @ rng.standard_normal((centred.shape[1], width)).astype(np.float32)
+        for _ in range(power_iterations):
+            sketch, _ = np.linalg.qr(sketch)
+            sketch = centred @ (centred.T @ sketch)
+        basis, _ = np.linalg.qr(sketch)
+        _, singular, components = np.linalg.svd(basis.T @ centred, full_matrices=False)
+
+    rank = min(rank, len(singular))
+    return mean, singular[:rank], components[:rank]
+
+
+def max_vertex_error(residual):
+    """Largest per-vertex distance in an (N, V*3) residual."""
+    return float(np.linalg.norm(residual.reshape(len(residual), -1, 3), axis=2).max()) if len(residual) else 0.0
+
+
+def fit_shared_basis(samples, tolerance=DEFAULT_SHARED_TOLERANCE, max_components=DEFAULT_SHARED_COMPONENTS):
+    """
+    Fit the vocabulary basis on (N, V, 3) sampled frames.
+
+    Keeps the fewest leading components whose reconstruction of every sample
+    is within tolerance (at most max_components).
+    Returns (mean (V, 3), components (k, V, 3) orthonormal, max sample error).
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    num_samples, num_vertices, _ = samples.shape
+    flat = samples.reshape(num_samples, -1)
+    mean, _, components = randomized_pca(flat, max_components)
+
+    residual = flat - mean
+    scores = residual @ components.T
+    count = 0
+    max_error = max_vertex_error(residual)
+    while max_error > tolerance and count < len(components):
+        residual -= np.outer(scores[:, count], components[count])
+        count += 1
+        max_error = max_vertex_error(residual)
+
+    return mean.reshape(num_vertices, 3), components[:count].reshape(count, num_vertices, 3), max_error
+
+
+def project_onto_basis(vertices, basis):
+    """
+    Weight curves (F, k) for an (F, V, 3) oriented vertex sequence, and the
+    max vertex error of the reconstruction.
+    """
+    num_frames = len(vertices)
+    components = basis['components'].reshape(len(basis['components']), -1)
+    centred = (np.asarray(vertices, dtype=np.float32) - basis['mean']).reshape(num_frames, -1)
+    weights = centred @ components.T
+    residual = centred - weights @ components
+    return weights.astype(np.float32), max_vertex_error(residual)
+
+
+def sample_frame_indices(num_frames, stride):
+    """Every stride-th frame; frame 0 is always included since it sets the sign's centring."""
+    return list(range(0, num_frames, max(1, stride)))
+
+
+def collect_samples(pkl_paths, smplx_model, max_samples=DEFAULT_MAX_SAMPLES, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Body-model vertices for a uniform frame sample across the vocabulary.
+
+    Every sign is evaluated with the mean shape and oriented like the export,
+    with one frame stride for all signs so the total stays near max_samples.
+    Returns (N, V, 3) float32.
+    """
+    from convert_pkl_to_glb import load_pkl_params, orient_for_gltf, params_to_vertices, with_mean_shape
+
+    signs = []
+    for pkl_path in pkl_paths:
+        params = load_pkl_params(pkl_path)
+        if params.get('smplx') is not None and len(params['smplx']):
+            signs.append(with_mean_shape(params))
+    total_frames = sum(len(params['smplx']) for params in signs)
+    stride = max(1, math.ceil(total_frames / max_samples))
+    print(f"\nSampling every {stride} frame(s) of {total_frames} from {len(signs)} signs")
+
+    num_vertices = smplx_model.v_template.shape[0]
+    samples = np.empty((sum(len(sample_frame_indices(len(p['smplx']), stride)) for p in signs), num_vertices, 3),
+                       dtype=np.float32)
+    filled = 0
+    for params in signs:
+        indices = sample_frame_indices(len(params['smplx']), stride)
+        vertices = params_to_vertices(params, smplx_model, chunk_size=chunk_size, frame_indices=indices)
+        orient_for_gltf(vertices, out=samples[filled:filled + len(indices)])
+        filled += len(indices)
+    return samples
+
+
+def build_shared_basis(pkl_paths, smplx_model, output_path=DEFAULT_SHARED_BASIS,
+                       tolerance=DEFAULT_SHARED_TOLERANCE, max_components=DEFAULT_SHARED_COMPONENTS,
+                       max_samples=DEFAULT_MAX_SAMPLES, quantize=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Fit the vocabulary basis, write the basis avatar GLB next to output_path
+    and save the basis for per-sign projection. Returns a summary dict.
+    """
+    from convert_pkl_to_glb import vertex_normals, write_morph_animation_glb
+    from skinned_export import BODY_NODE_NAME
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    samples = collect_samples(pkl_paths, smplx_model, max_samples, chunk_size)
+    mean, components, sample_error = fit_shared_basis(samples, tolerance, max_components)
+    faces = np.asarray(smplx_model.faces)
+    normals = vertex_normals(mean, faces)
+
+    avatar_path = output_path.parent / BASIS_AVATAR_FILE
+    written = write_morph_animation_glb(avatar_path, mean, normals, faces, components, None, None,
+                                        quantize=quantize, node_name=BODY_NODE_NAME)
+
+    digest = hashlib.sha256()
+    for array in (mean, components, written['weight_scales']):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update(json.dumps({'converter_version': CONVERTER_VERSION, 'quantize': quantize}).encode('utf-8'))
+    basis_hash = digest.hexdigest()
+
+    np.savez(output_path, mean=mean, components=components, weight_scales=written['weight_scales'],
+             position_error=written['max_error'], morph_step=written['morph_step'],
+             sample_error=sample_error, avatar_file=BASIS_AVATAR_FILE, basis_hash=basis_hash)
+
+    print(f"\n✅ Shared basis: {len(components)} components from {len(samples)} frames "
+          f"(max sample error {sample_error * 1000:.3f} mm)")
+    print(f"   Basis avatar: {avatar_path} ({written['bytes'] / 1024:.0f} KB)")
+    print(f"   Basis data:   {output_path}")
+    return {'components': len(components), 'samples': len(samples), 'sample_error_mm': sample_error * 1000,
+            'avatar_bytes': written['bytes']}
+
+
+_loaded_bases = {}
+
+
+def load_shared_basis(path=DEFAULT_SHARED_BASIS):
+    """Load a saved basis, reusing it across signs while the file is unchanged."""
+    path = Path(path)
+    stat = os.stat(path)
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _loaded_bases:
+        with np.load(path) as data:
+            basis = {name: data[name] for name in data.files}
+        basis['avatar_file'] = str(basis['avatar_file'])
+        basis['basis_hash'] = str(basis['basis_hash'])
+        _loaded_bases.clear()
+        _loaded_bases[key] = basis
+    return _loaded_bases[key]
+
+
+def create_weights_glb(vertices, basis, output_path, word_label="sign", fps=30):
+    """
+    Write a sign as weight curves over the shared basis (no geometry).
+
+    vertices is the full oriented (F, V, 3) sequence with the mean shape.
+    Returns signs.json-style metadata.
+    """
+    from glb_writer import GLBWriter
+    from skinned_export import BODY_NODE_NAME, add_stub_body
+
+    with stage('transform', frames=len(vertices)):
+        weights, projection_error = project_onto_basis(vertices, basis)
+        weights *= basis['weight_scales']
+    times = np.arange(len(vertices), dtype=np.float32) / fps
+    max_error = projection_error + float(basis['position_error']) + \
+        max_weight_sum(weights, times) * float(basis['morph_step'])
+
+    writer = GLBWriter()
+    writer.gltf['asset']['extras'] = {'baseAvatar': basis['avatar_file'], 'baseAvatarHash': basis['basis_hash']}
+    writer.add('nodes', {"name": BODY_NODE_NAME, "mesh": add_stub_body(writer, weights.shape[1])})
+    writer.add('scenes', {"nodes": [0]})
+    writer.gltf['scene'] = 0
+    writer.add('animations', {
+        "name": word_label,
+        "samplers": [{"input": writer.add_accessor(times, min_max=True),
+                      "output": writer.add_accessor(weights.reshape(-1)), "interpolation": "LINEAR"}],
+        "channels": [{"sampler": 0, "target": {"node": 0, "path": "weights"}}],
+    })
+    written = writer.write(output_path)
+
+    print(f"\n✅ Created weight track for {basis['avatar_file']}: {output_path}")
+    print(f"   Frames: {len(vertices)} (duration: {times[-1]:.2f}s), basis components: {weights.shape[1]}")
+    print(f"   Max position error: {max_error * 1000:.3f} mm")
+    print(f"   Size: {written / 1024:.1f} KB")
+
+    return {
+        'file': Path(output_path).name,
+        'description': f'ASL sign: {word_label}',
+        'region': 'ASL',
+        'biomechanical': True,
+        'frames': len(vertices),
+        'max_error_mm': round(max_error * 1000, 4),
+        'base_avatar': basis['avatar_file'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fit the vocabulary-wide shared motion basis')
+    parser.add_argument('--pkl-dir', default='signavatars-data/asl-word-level',
+                        help='Directory of SignAvatars .pkl files')
+    parser.add_argument('--mapping', default='wlasl_mapping.json',
+                        help='Only use signs listed in this WLASL mapping (use "" for every .pkl)')
+    parser.add_argument('--smplx-model', default='signavatars-data/models',
+                        help='Path to SMPL-X models directory (contains smplx/ subfolder)')
+    parser.add_argument('--output', default=DEFAULT_SHARED_BASIS, help='Basis .npz to write')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_SHARED_TOLERANCE, metavar='METRES',
+                        help=f'Max vertex error on the sampled frames (default: {DEFAULT_SHARED_TOLERANCE})')
+    parser.add_argument('--max-components', type=int, default=DEFAULT_SHARED_COMPONENTS,
+                        help=f'Upper limit on basis morph targets (default: {DEFAULT_SHARED_COMPONENTS})')
+    parser.add_argument('--max-samples', type=int, default=DEFAULT_MAX_SAMPLES,
+                        help=f'Approximate number of frames to fit on (default: {DEFAULT_MAX_SAMPLES})')
+    parser.add_argument('--quantize', choices=['int16', 'int8'], default=None,
+                        help='Store the basis avatar with KHR_mesh_quantization')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Frames per batched SMPL-X forward pass (default: {DEFAULT_CHUNK_SIZE})')
+    args = parser.parse_args()
+
+    from convert_pkl_to_glb import load_smplx_model
+
+    pkl_dir = Path(args.pkl_dir)
+    if args.mapping:
+        with open(args.mapping) as f:
+            mapping = json.load(f)
+        pkl_paths = sorted({pkl_dir / f"{info['file_id']}.pkl" for info in mapping.values()})
+        pkl_paths = [path for path in pkl_paths if path.exists()]
+    else:
+        pkl_paths = sorted(pkl_dir.glob("*.pkl"))
+    if not pkl_paths:
+        print(f"❌ ERROR: No .pkl files found in {pkl_dir}")
+        return 1
+
+    start = time.time()
+    smplx_model = load_smplx_model(args.smplx_model)
+    build_shared_basis(pkl_paths, smplx_model, args.output, tolerance=args.tolerance,
+                       max_components=args.max_components, max_samples=args.max_samples,
+                       quantize=args.quantize, chunk_size=args.chunk_size)
+    print(f"   Built in {time.time() - start:.1f}s")
+    print(f"\nNext: python3 batch_convert.py --mode weights")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
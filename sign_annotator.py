@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Streaming HTML-to-sign annotator.
+
+Reads a page through html.parser in fixed-size chunks, finds the words in its
+visible text and writes the page back out with each signable word wrapped in
+the same markup index.html uses by hand:
+
+    <span class="sign-trigger" data-sign="ACCEPT">accept</span>
+
+Words are matched against the registry with gloss_matcher (longest
+multi-word gloss first, case-folded, inflections mapped onto their gloss)
+and resolved offline with the rules app.js loadSignAction applies at
+runtime:
+
+1. a signs.json key with a file (wlasl_mapping.json glosses resolve to
+   their WORD-xxxxx key);
+2. a hyphenated or underscored key (LEGAL-DIFFERENCE) whose parts include at
+   least one signable word -> data-sign-mode="compound" with the playable
+   parts in data-sign-parts;
+3. otherwise fingerspelling -> data-sign-mode="fingerspell". Fingerspelling
+   every unknown word would turn the whole page into triggers, so by default
+   only acronyms (WAD, EAA) are fingerspelled.
+
+Markup, comments, entities and whitespace are copied through unchanged.
+Text inside script/style/code, links and buttons, hidden elements, live
+regions (role=status/alert/log/timer or aria-live) and existing
+sign-trigger spans is left alone. Only the open-element stack and
+the current run of text are held in memory, so multi-megabyte pages
+annotate in bounded memory.
+
+Usage:
+    python sign_annotator.py --input index.html --output build/index.html
+    python sign_annotator.py --input docs/page.html --output - --fingerspell none
+"""
+
+import argparse
+import re
+import sys
+from html import escape
+from html.parser import HTMLParser
+
+from gloss_matcher import DEFAULT_INDEX, DEFAULT_MAPPING, DEFAULT_SIGNS, load_index
+
+CHUNK_SIZE = 1 << 16
+
+# Elements whose text is not prose a reader would want signed
+SKIP_TAGS = frozenset(['head', 'script', 'style', 'noscript', 'template', 'textarea', 'select', 'option',
+                       'code', 'pre', 'kbd', 'samp', 'svg', 'math', 'iframe', 'canvas', 'a', 'button'])
+VOID_TAGS = frozenset(['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param',
+                       'source', 'track', 'wbr'])
+# Elements whose end tag is optional: a new one closes the open one
+AUTO_CLOSE_TAGS = frozenset(['p', 'li', 'dt', 'dd', 'tr', 'td', 'th', 'option'])
+
+# English articles and copulas ASL glossing drops (still matched inside glosses such as A LOT)
+STOP_WORDS = frozenset(['A', 'AN', 'THE', 'IS', 'ARE', 'AM', 'BE', 'BEEN', 'WAS', 'WERE', 'OF', 'TO'])
+
+FINGERSPELL_POLICIES = ('acronyms', 'all', 'none')
+
+ACRONYM_PATTERN = re.compile(r"[A-Z][A-Z0-9]{1,7}")
+
+# Live regions hold status text that scripts replace at runtime
+LIVE_REGION_ROLES = frozenset(['status', 'alert', 'log', 'timer'])
+
+
+class TokenMatcher:
+    """Picks the sign spans worth a trigger from a GlossIndex scan of a run of text."""
+
+    def __init__(self, index, fingerspell='acronyms', stop_words=STOP_WORDS):
+        if fingerspell not in FINGERSPELL_POLICIES:
+            raise ValueError(f"fingerspell must be one of {', '.join(FINGERSPELL_POLICIES)}")
+        self.index = index
+        self.fingerspell = fingerspell
+        self.stop_words = stop_words
+
+    def wanted(self, token, resolution):
+        """Whether a span's resolution is worth a trigger under the fingerspell policy."""
+        if token.upper() in self.stop_words:
+            return False
+        if resolution.mode != 'fingerspell':
+            return True
+        if self.fingerspell == 'acronyms':
+            return ACRONYM_PATTERN.fullmatch(token) is not None
+        return self.fingerspell == 'all'
+
+    def spans(self, text):
+        """Yield (start, end, Resolution) for each signable word or gloss in text, in order."""
+        for start, end, resolution in self.index.scan(text):
+            if self.wanted(text[start:end], resolution):
+                yield start, end, resolution
+
+
+def trigger_start_tag(resolution, focusable=False):
+    """Opening <span> for a sign trigger."""
+    attrs = [('class', 'sign-trigger'), ('data-sign', resolution.key)]
+    if resolution.mode != 'sign':
+        attrs.append(('data-sign-mode', resolution.mode))
+    if resolution.parts:
+        attrs.append(('data-sign-parts', ' '.join(resolution.parts)))
+    if focusable:
+        attrs += [('role', 'button'), ('tabindex', '0')]
+    return '<span ' + ' '.join(f'{name}="{escape(value)}"' for name, value in attrs) + '>'
+
+
+class SignAnnotator(HTMLParser):
+    """
+    HTMLParser that copies a page to a writable text stream, wrapping signable
+    words in sign-trigger spans as it goes.
+
+    Feed it chunks with feed() and call close() at the end. After close(),
+    counts holds the number of triggers per mode, signs the key of every
+    trigger (added or already in the page) in reading order with its number
+    of occurrences, and resolutions the Resolution of each key.
+    """
+
+    def __init__(self, out, matcher, focusable=False):
+        super().__init__(convert_charrefs=False)
+        self.out = out
+        self.matcher = matcher
+        self.focusable = focusable
+        self.stack = []  # (tag, skips) per open element
+        self.skip_depth = 0
+        self.text = []
+        self.counts = {'sign': 0, 'compound': 0, 'fingerspell': 0, 'existing': 0}
+        self.signs = {}
+        self.resolutions = {}
+
+    def record(self, resolution):
+        self.signs[resolution.key] = self.signs.get(resolution.key, 0) + 1
+        self.resolutions.setdefault(resolution.key, resolution)
+
+    # Text
+
+    def handle_data(self, data):
+        # Runs of text can arrive split at chunk boundaries; hold them until the next tag
+        self.text.append(data)
+
+    def flush_text(self):
+        if not self.text:
+            return
+        text = ''.join(self.text)
+        self.text = []
+        if self.skip_depth:
+            self.out.write(text)
+            return
+
+        position = 0
+        for start, end, resolution in self.matcher.spans(text):
+            self.out.write(text[position:start])
+            self.out.write(trigger_start_tag(resolution, self.focusable))
+            self.out.write(text[start:end])
+            self.out.write('</span>')
+            position = end
+            self.counts[resolution.mode] += 1
+            self.record(resolution)
+        self.out.write(text[position:])
+
+    # Markup, copied through
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        self.out.write(self.get_starttag_text())
+        if tag in VOID_TAGS:
+            return
+        if tag in AUTO_CLOSE_TAGS and self.stack and self.stack[-1][0] == tag:
+            self._pop()
+
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+        if attrs.get('data-sign'):
+            self.record(self.matcher.index.resolve_key(attrs['data-sign']))
+            self.counts['existing'] += 1
+        skips = (tag in SKIP_TAGS or 'sign-trigger' in classes or 'hidden' in attrs
+                 or attrs.get('aria-hidden') == 'true' or attrs.get('translate') == 'no'
+                 or attrs.get('role') in LIVE_REGION_ROLES or 'aria-live' in attrs)
+        self.stack.append((tag, skips))
+        self.skip_depth += skips
+
+    def handle_startendtag(self, tag, attrs):
+        self.flush_text()
+        self.out.write(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+        self.out.write(f'</{tag}>')
+        if any(open_tag == tag for open_tag, _ in self.stack):
+            while self._pop() != tag:
+                pass
+
+    def _pop(self):
+        tag, skips = self.stack.pop()
+        self.skip_depth -= skips
+        return tag
+
+    def handle_entityref(self, name):
+        self.flush_text()
+        self.out.write(f'&{name};')
+
+    def handle_charref(self, name):
+        self.flush_text()
+        self.out.write(f'&#{name};')
+
+    def handle_comment(self, data):
+        self.flush_text()
+        self.out.write(f'<!--{data}-->')
+
+    def handle_decl(self, decl):
+        self.flush_text()
+        self.out.write(f'<!{decl}>')
+
+    def handle_pi(self, data):
+        self.flush_text()
+        self.out.write(f'<?{data}>')
+
+    def unknown_decl(self, data):
+        self.flush_text()
+        self.out.write(f'<![{data}]>')
+
+    def close(self):
+        super().close()
+        self.flush_text()
+
+
+def page_manifest(page, sha256, annotator, signs):
+    """
+    Manifest of the signs an annotated page uses: each key in reading order
+    with its mode, occurrences and GLB file (or compound parts), the GLB
+    files in order of first use and the fingerspelled words. signs is the
+    signs.json registry.
+    """
+    entries = []
+    files = {}
+    fingerspelled = []
+    for key, count in annotator.signs.items():
+        resolution = annotator.resolutions[key]
+        entry = {'key': key, 'mode': resolution.mode, 'count': count}
+        if resolution.mode == 'fingerspell':
+            fingerspelled.append(key)
+        part_keys = resolution.parts if resolution.mode == 'compound' else (key,)
+        if resolution.parts:
+            entry['parts'] = list(resolution.parts)
+        part_files = [(signs[part]['file'], part) for part in part_keys if signs.get(part, {}).get('file')]
+        if resolution.mode == 'sign' and part_files:
+            entry['file'] = part_files[0][0]
+        for file, part in part_files:
+            files.setdefault(file, part)
+        entries.append(entry)
+    return {
+        'page': page.as_posix(),
+        'sha256': sha256,
+        'counts': annotator.counts,
+        'signs': entries,
+        'files': [{'file': file, 'key': key} for file, key in files.items()],
+        'fingerspelled': fingerspelled,
+    }
+
+
+def annotate_stream(src, out, matcher, focusable=False, chunk_size=CHUNK_SIZE):
+    """Annotate HTML from text stream src into out, chunk by chunk. Returns the finished SignAnnotator."""
+    annotator = SignAnnotator(out, matcher, focusable)
+    for chunk in iter(lambda: src.read(chunk_size), ''):
+        annotator.feed(chunk)
+    annotator.close()
+    return annotator
+
+
+def annotate_file(input_path, output_path, matcher, focusable=False):
+    """Annotate one HTML file ('-' for stdin/stdout). Returns the finished SignAnnotator."""
+    src = sys.stdin if input_path == '-' else open(input_path, 'r', encoding='utf-8', newline='')
+    out = sys.stdout if output_path == '-' else open(output_path, 'w', encoding='utf-8', newline='')
+    try:
+        return annotate_stream(src, out, matcher, focusable)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Annotate an HTML page with sign-trigger markup')
+    parser.add_argument('--input', required=True, help="HTML page to annotate ('-' for stdin)")
+    parser.add_argument('--output', required=True, help="Annotated HTML ('-' for stdout)")
+    parser.add_argument('--signs', default=DEFAULT_SIGNS, help=f'Sign registry (default: {DEFAULT_SIGNS})')
+    parser.add_argument('--mapping', default=DEFAULT_MAPPING,
+                        help=f'WLASL gloss mapping (default: {DEFAULT_MAPPING})')
+    parser.add_argument('--index', default=str(DEFAULT_INDEX),
+                        help=f'Serialized gloss index, rebuilt when the registry changes (default: {DEFAULT_INDEX})')
+    parser.add_argument('--fingerspell', choices=FINGERSPELL_POLICIES, default='acronyms',
+                        help='Which unknown words get a fingerspelling trigger (default: acronyms)')
+    parser.add_argument('--focusable', action='store_true',
+                        help='Add role="button" tabindex="0" to every trigger (adds one tab stop per word)')
+    args = parser.parse_args()
+
+    index = load_index(args.signs, args.mapping, args.index)
+    matcher = TokenMatcher(index, fingerspell=args.fingerspell)
+    annotator = annotate_file(args.input, args.output, matcher, focusable=args.focusable)
+
+    log = sys.stderr if args.output == '-' else sys.stdout
+    counts = annotator.counts
+    print(f"✅ Annotated {args.input}: {counts['sign']} signs, {counts['compound']} compounds, "
+          f"{counts['fingerspell']} fingerspelled, {counts['existing']} existing triggers "
+          f"({len(annotator.signs)} distinct keys)", file=log)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
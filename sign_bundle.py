@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Per-page sign bundles: every sign a page uses in one GLB.
+
+Each sign GLB carries its own copy of the avatar mesh, so a page with N signs
+makes N requests and N mesh uploads. A bundle holds one skinned SMPL-X
+avatar and one named animation clip per sign (see skinned_export.py), plus a
+small JSON index mapping sign keys to clip names:
+
+    {"file": "index.bundle.glb", "clips": {"ACCEPT": "ACCEPT", ...},
+     "durations": {"ACCEPT": 2.6, ...}, "skipped": {"wad": "no WLASL .pkl"}}
+
+All clips are retargeted to the mean body shape, so one mesh fits every
+sign, and each clip is centred on its own first frame. Signs without a
+SignAvatars .pkl (hand-made GLBs) are listed under 'skipped'; app.js plays
+them from their own files as before.
+
+app.js picks a bundle up from <meta name="sign-bundle" content="INDEX.json">
+in the page's <head>; --inject adds that tag and a preload hint for the
+bundle GLB, replacing any per-sign preload hints. Both carry
+data-sign-bundle, so preload_manifest.py and site_build.py leave them in
+place.
+
+Usage:
+    python sign_bundle.py --keys ACCEPT ABOUT ABLE --output bundles/demo.bundle.glb
+    python sign_bundle.py --page build/index.signs.json --output build/index.bundle.glb --inject build/index.html
+    python sign_bundle.py --page index.html --output bundles/index.bundle.glb --quantize int16
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from conversion_settings import DEFAULT_CHUNK_SIZE, DEFAULT_MAX_KEYFRAMES
+from gloss_matcher import DEFAULT_INDEX, DEFAULT_MAPPING, DEFAULT_SIGNS
+from preload_manifest import BUNDLE_ATTRIBUTE, PRELOAD_ATTRIBUTE, inject_links, page_manifest_for, preload_link
+from site_build import wlasl_file_id
+
+PKL_DIR = Path("signavatars-data/asl-word-level")
+SMPLX_MODEL = "signavatars-data/models"
+BUNDLE_INDEX_SUFFIX = '.json'
+
+
+def bundle_sources(keys, signs, pkl_dir=PKL_DIR):
+    """
+    Split sign keys into [(key, .pkl path)] to bundle and {key: reason} to
+    skip, keeping the first occurrence of each key in order.
+    """
+    sources = []
+    skipped = {}
+    for key in dict.fromkeys(keys):
+        entry = signs.get(key)
+        if not entry or not entry.get('file'):
+            skipped[key] = "not a sign in signs.json"
+            continue
+        file_id = wlasl_file_id(key, entry)
+        pkl_path = Path(pkl_dir) / f"{file_id}.pkl" if file_id else None
+        if pkl_path is None or not pkl_path.exists():
+            skipped[key] = "no SignAvatars .pkl"
+            continue
+        sources.append((key, pkl_path))
+    return sources, skipped
+
+
+def iter_sign_clips(sources, smplx_model, max_keyframes=DEFAULT_MAX_KEYFRAMES, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (name, parsed, reference_indices, reference_vertices) per sign for
+    create_skinned_clips_glb, loading each sign only when it is consumed.
+    """
+    from convert_pkl_to_glb import (load_pkl_params, parse_smplx_params, params_to_vertices,
+                                    select_keyframe_indices, with_mean_shape)
+
+    for key, pkl_path in sources:
+        params = load_pkl_params(pkl_path)
+        if params.get('smplx') is None:
+            raise ValueError(f"No 'smplx' key found in {pkl_path}")
+        params = with_mean_shape(params)
+        reference_indices = select_keyframe_indices(len(params['smplx']), max_keyframes)
+        reference_vertices = params_to_vertices(params, smplx_model, chunk_size=chunk_size,
+                                                frame_indices=reference_indices)
+        yield key, parse_smplx_params(params['smplx']), reference_indices, reference_vertices
+
+
+def create_bundle(keys, signs, output_path, smplx_model, pkl_dir=PKL_DIR, fps=30,
+                  max_keyframes=DEFAULT_MAX_KEYFRAMES, quantize=None, sparse_threshold=None,
+                  chunk_size=DEFAULT_CHUNK_SIZE, index_path=None):
+    """
+    Write one GLB with a clip per sign key and its JSON index (default: the
+    GLB path with .json). Returns the index.
+    """
+    from skinned_export import create_skinned_clips_glb
+
+    output_path = Path(output_path)
+    index_path = Path(index_path) if index_path else output_path.with_suffix(BUNDLE_INDEX_SUFFIX)
+    sources, skipped = bundle_sources(keys, signs, pkl_dir)
+    if not sources:
+        raise ValueError("None of the sign keys has a SignAvatars .pkl to bundle")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    clips, written, max_error = create_skinned_clips_glb(
+        iter_sign_clips(sources, smplx_model, max_keyframes, chunk_size), smplx_model, output_path, fps=fps,
+        quantize=quantize, sparse_threshold=sparse_threshold, recenter=True)
+
+    index = {
+        'file': os.path.relpath(output_path, index_path.parent),
+        'bytes': written,
+        'clips': {clip['name']: clip['name'] for clip in clips},
+        'durations': {clip['name']: round((clip['frames'] - 1) / fps, 3) for clip in clips},
+        'max_error_mm': round(max_error * 1000, 4),
+        'skipped': skipped,
+    }
+    with open(index_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+def bundle_tags(index_path, glb_path, page_path):
+    """The <meta> tag app.js looks for and a preload hint for the bundle, relative to the page."""
+    page_dir = Path(page_path).parent
+    index_href = Path(os.path.relpath(index_path, page_dir)).as_posix()
+    return [f'<meta name="sign-bundle" content="{index_href}" {BUNDLE_ATTRIBUTE}>',
+            preload_link(Path(os.path.relpath(glb_path, page_dir)).as_posix(), BUNDLE_ATTRIBUTE)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bundle a page\'s signs into one GLB with a clip per sign')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--keys', nargs='+', help='Sign keys to bundle, in order')
+    source.add_argument('--page', help='HTML page, or its site_build.py .signs.json manifest')
+    parser.add_argument('--output', required=True, help='Bundle GLB path (the index goes next to it as .json)')
+    parser.add_argument('--inject', metavar='HTML', default=None,
+                        help='Add the sign-bundle <meta> tag and a preload hint to this page\'s <head>')
+    parser.add_argument('--pkl-dir', default=str(PKL_DIR), help=f'SignAvatars .pkl files (default: {PKL_DIR})')
+    parser.add_argument('--smplx-model', default=SMPLX_MODEL,
+                        help=f'Path to SMPL-X models directory (default: {SMPLX_MODEL})')
+    parser.add_argument('--keyframes', type=int, default=DEFAULT_MAX_KEYFRAMES,
+                        help=f'Reference frames per sign for placement and error checks '
+                             f'(default: {DEFAULT_MAX_KEYFRAMES})')
+    parser.add_argument('--quantize', choices=['int16', 'int8'], default=None,
+                        help='Quantize positions, expression targets and joint rotations (KHR_mesh_quantization)')
+    parser.add_argument('--sparse-threshold', type=float, default=None, metavar='METRES',
+                        help='Store expression targets as sparse accessors, dropping smaller deltas')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Frames per batched SMPL-X forward pass (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--signs', default=DEFAULT_SIGNS, help=f'Sign registry (default: {DEFAULT_SIGNS})')
+    parser.add_argument('--mapping', default=DEFAULT_MAPPING,
+                        help=f'WLASL gloss mapping (default: {DEFAULT_MAPPING})')
+    parser.add_argument('--index', default=str(DEFAULT_INDEX),
+                        help=f'Serialized gloss index (default: {DEFAULT_INDEX})')
+    args = parser.parse_args()
+
+    from convert_pkl_to_glb import load_smplx_model
+
+    with open(args.signs, 'r') as f:
+        signs = json.load(f)
+    if args.keys:
+        keys = args.keys
+    else:
+        # The page manifest's files already expand compounds into their parts
+        manifest = page_manifest_for(args.page, args.signs, args.mapping, args.index)
+        keys = [item['key'] for item in manifest['files']]
+
+    start = time.perf_counter()
+    output_path = Path(args.output)
+    index = create_bundle(keys, signs, output_path, load_smplx_model(args.smplx_model), args.pkl_dir,
+                          max_keyframes=args.keyframes, quantize=args.quantize,
+                          sparse_threshold=args.sparse_threshold, chunk_size=args.chunk_size)
+    index_path = output_path.with_suffix(BUNDLE_INDEX_SUFFIX)
+
+    print(f"\n✅ Bundled {len(index['clips'])} signs into {output_path} ({index['bytes'] / 1024:.0f} KB) "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"   Index: {index_path}")
+    print(f"   Max deviation from body model: {index['max_error_mm']:.3f} mm")
+    for key, reason in index['skipped'].items():
+        print(f"   ⏭️  {key}: {reason}")
+    if args.inject and not inject_links(args.inject, bundle_tags(index_path, output_path, args.inject),
+                                        replace=(BUNDLE_ATTRIBUTE, PRELOAD_ATTRIBUTE)):
+        print(f"⚠️  No </head> in {args.inject}; bundle tags not injected")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Parallel, incremental sign annotation for a whole site.
+
+Walks a directory of HTML pages and annotates them on a process pool (see
+sign_annotator.py); each worker loads the serialized gloss index and
+signs.json once. For every page it writes, under the output directory:
+
+    docs/page.html          annotated page
+    docs/page.signs.json    page manifest: sign keys in reading order with
+                            mode, occurrences and GLB file, the GLB files the
+                            page needs and the words it fingerspells
+    docs/page.preload.json  with --preload-budget-mb: fetch plan with GLB
+                            sizes and durations, whose preload hints are
+                            also added to the page's <head>
+
+plus a site-wide coverage report (default OUT/sign-coverage.json): demand for
+every sign and fingerspelled word across pages, the GLBs not yet built and a
+'priority' list of WLASL file ids ordered by how many pages need them, which
+batch_convert.py --priority converts first.
+
+Pages whose content hash is unchanged since the last build are skipped, as
+long as the registry and annotation options are unchanged too (state in
+OUT/.site-build.json).
+
+Usage:
+    python site_build.py --src site/ --out build/
+    python site_build.py --src site/ --out build/ --workers 8 --force
+    python site_build.py --src site/ --out build/ --preload-budget-mb 8
+    python batch_convert.py --priority build/sign-coverage.json
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import re
+import time
+from pathlib import Path
+
+from batch_engine import default_worker_count
+from build_manifest import file_sha256
+from gloss_matcher import DEFAULT_INDEX, DEFAULT_MAPPING, DEFAULT_SIGNS, INDEX_FORMAT, load_index
+from preload_manifest import PRELOAD_SUFFIX, has_sign_bundle, inject_links, preload_plan
+from sign_annotator import FINGERSPELL_POLICIES, TokenMatcher, annotate_file, page_manifest
+
+ANIMATIONS_DIR = Path("animations")
+STATE_FILE = '.site-build.json'
+COVERAGE_FILE = 'sign-coverage.json'
+MANIFEST_SUFFIX = '.signs.json'
+SITE_BUILD_VERSION = 1
+HTML_SUFFIXES = ('.html', '.htm')
+
+# Per-process state, filled by _init_worker
+_worker = {}
+
+
+def find_pages(src_dir):
+    """HTML pages under src_dir, relative to it, in sorted order."""
+    src_dir = Path(src_dir)
+    return sorted(path.relative_to(src_dir) for path in src_dir.rglob('*')
+                  if path.suffix.lower() in HTML_SUFFIXES and path.is_file())
+
+
+def manifest_path(out_dir, page):
+    return Path(out_dir) / page.with_suffix(MANIFEST_SUFFIX)
+
+
+def wlasl_file_id(key, entry):
+    """WLASL file id behind a sign (00384), or None for hand-made signs."""
+    if entry.get('wlasl_id'):
+        return entry['wlasl_id']
+    match = re.fullmatch(r'WORD-(\d+)(?:\.glb)?', entry.get('file') or key)
+    return match.group(1) if match else None
+
+
+def _init_worker(signs_path, mapping_path, index_path, fingerspell, focusable):
+    index = load_index(signs_path, mapping_path, index_path)
+    with open(signs_path, 'r') as f:
+        signs = json.load(f)
+    _worker.update(matcher=TokenMatcher(index, fingerspell=fingerspell), signs=signs, focusable=focusable)
+
+
+def _build_page(job):
+    """Annotate one page inside a worker and write its manifest. Returns the manifest (or an error)."""
+    page, src_path, out_path, sha256, manifest_file = job
+    try:
+        Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+        annotator = annotate_file(src_path, out_path, _worker['matcher'], focusable=_worker['focusable'])
+        manifest = page_manifest(page, sha256, annotator, _worker['signs'])
+        with open(manifest_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+    except Exception as e:
+        return {'page': page.as_posix(), 'error': f"{type(e).__name__}: {e}"}
+
+
+def build_settings(index, fingerspell, focusable, preload):
+    """Hash of everything besides a page's content that determines its output."""
+    payload = json.dumps({'version': SITE_BUILD_VERSION, 'index_format': INDEX_FORMAT, 'sources': index.sources,
+                          'fingerspell': fingerspell, 'focusable': focusable, 'preload': preload}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def coverage_report(manifests, signs, animations_dir=ANIMATIONS_DIR):
+    """Site-wide sign demand and build coverage from page manifests."""
+    demand = {}
+    fingerspelled = {}
+    for manifest in manifests:
+        for entry in manifest['signs']:
+            table = fingerspelled if entry['mode'] == 'fingerspell' else demand
+            stats = table.setdefault(entry['key'], {'pages': 0, 'occurrences': 0})
+            stats['pages'] += 1
+            stats['occurrences'] += entry['count']
+            if entry['mode'] == 'compound':
+                stats['parts'] = entry['parts']
+            elif 'file' in entry:
+                stats['file'] = entry['file']
+
+    def by_demand(table):
+        return dict(sorted(table.items(), key=lambda item: (-item[1]['pages'], -item[1]['occurrences'], item[0])))
+
+    demand = by_demand(demand)
+    # Compound parts count towards the demand for their own GLBs
+    files = {}
+    for key, stats in demand.items():
+        for part in stats.get('parts', [key]):
+            file = signs.get(part, {}).get('file')
+            if not file:
+                continue
+            usage = files.setdefault(file, {'key': part, 'pages': 0, 'occurrences': 0})
+            usage['pages'] += stats['pages']
+            usage['occurrences'] += stats['occurrences']
+    for file, usage in files.items():
+        usage['built'] = (Path(animations_dir) / file).exists()
+
+    files = dict(sorted(files.items(), key=lambda item: (-item[1]['pages'], -item[1]['occurrences'], item[0])))
+    priority = []
+    for file, usage in files.items():
+        file_id = wlasl_file_id(usage['key'], signs.get(usage['key'], {}))
+        if file_id:
+            priority.append({'file_id': file_id, 'key': usage['key'], 'file': file, 'pages': usage['pages'],
+                             'occurrences': usage['occurrences'], 'built': usage['built']})
+
+    return {
+        'pages': len(manifests),
+        'signs': demand,
+        'fingerspelled': by_demand(fingerspelled),
+        'files': files,
+        'unbuilt': [file for file, usage in files.items() if not usage['built']],
+        'priority': priority,
+    }
+
+
+def write_preload_plans(out_dir, manifests, signs, budget_bytes, rebuilt):
+    """
+    Write each page's preload plan and inject its hints where they changed or
+    the page was rebuilt. Pages with a sign bundle keep the bundle's own hint.
+    """
+    info_cache = {}
+    for manifest in manifests:
+        page = Path(manifest['page'])
+        plan = preload_plan(manifest, signs, ANIMATIONS_DIR, budget_bytes, info_cache=info_cache)
+        plan_path = Path(out_dir) / page.with_suffix(PRELOAD_SUFFIX)
+        previous = None
+        if plan_path.exists():
+            with open(plan_path, 'r') as f:
+                previous = json.load(f)
+        if previous != plan:
+            with open(plan_path, 'w') as f:
+                json.dump(plan, f, indent=2)
+        if manifest['page'] in rebuilt or previous is None or previous['links'] != plan['links']:
+            if not has_sign_bundle(Path(out_dir) / page):
+                inject_links(Path(out_dir) / page, plan['links'])
+
+
+def build_site(src_dir, out_dir, signs_path=DEFAULT_SIGNS, mapping_path=DEFAULT_MAPPING, index_path=DEFAULT_INDEX,
+               fingerspell='acronyms', focusable=False, workers=None, force=False, coverage_path=None,
+               preload_budget=None):
+    """
+    Annotate every page under src_dir into out_dir and write the coverage
+    report. Returns (coverage report, {'built', 'skipped', 'failed'}).
+
+    With preload_budget (bytes), every page also gets a .preload.json fetch
+    plan and its preload hints in <head> (see preload_manifest.py). Plans
+    depend on the GLBs on disk, so they are refreshed for unchanged pages too.
+    """
+    src_dir, out_dir = Path(src_dir), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Write the serialized index once up front, so workers only load it
+    index = load_index(signs_path, mapping_path, index_path)
+    with open(signs_path, 'r') as f:
+        signs = json.load(f)
+    settings = build_settings(index, fingerspell, focusable, preload_budget is not None)
+
+    state_path = out_dir / STATE_FILE
+    state = {'settings': None, 'pages': {}}
+    if state_path.exists() and not force:
+        with open(state_path, 'r') as f:
+            state = json.load(f)
+    previous = state['pages'] if state.get('settings') == settings else {}
+
+    manifests = []
+    rebuilt = set()
+    jobs = []
+    stats = {'built': 0, 'skipped': 0, 'failed': 0}
+    pages = {}
+    for page in find_pages(src_dir):
+        sha256 = file_sha256(src_dir / page)
+        manifest_file = manifest_path(out_dir, page)
+        if previous.get(page.as_posix()) == sha256 and (out_dir / page).exists() and manifest_file.exists():
+            with open(manifest_file, 'r') as f:
+                manifests.append(json.load(f))
+            pages[page.as_posix()] = sha256
+            stats['skipped'] += 1
+            continue
+        jobs.append((page, str(src_dir / page), str(out_dir / page), sha256, str(manifest_file)))
+
+    if jobs:
+        workers = min(workers or default_worker_count(), len(jobs))
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(workers, initializer=_init_worker,
+                          initargs=(signs_path, mapping_path, index_path, fingerspell, focusable)) as pool:
+            for manifest in pool.imap(_build_page, jobs, chunksize=4):
+                if 'error' in manifest:
+                    print(f"  ❌ {manifest['page']}: {manifest['error']}")
+                    stats['failed'] += 1
+                    continue
+                manifests.append(manifest)
+                pages[manifest['page']] = manifest['sha256']
+                rebuilt.add(manifest['page'])
+                stats['built'] += 1
+
+    with open(state_path, 'w') as f:
+        json.dump({'settings': settings, 'pages': pages}, f, indent=2)
+
+    manifests.sort(key=lambda manifest: manifest['page'])
+    if preload_budget is not None:
+        write_preload_plans(out_dir, manifests, signs, preload_budget, rebuilt)
+    report = coverage_report(manifests, signs)
+    with open(coverage_path or out_dir / COVERAGE_FILE, 'w') as f:
+        json.dump(report, f, indent=2)
+    return report, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Annotate a directory of HTML pages with sign triggers')
+    parser.add_argument('--src', required=True, help='Directory of HTML pages')
+    parser.add_argument('--out', required=True, help='Output directory for annotated pages and manifests')
+    parser.add_argument('--signs', default=DEFAULT_SIGNS, help=f'Sign registry (default: {DEFAULT_SIGNS})')
+    parser.add_argument('--mapping', default=DEFAULT_MAPPING,
+                        help=f'WLASL gloss mapping (default: {DEFAULT_MAPPING})')
+    parser.add_argument('--index', default=str(DEFAULT_INDEX),
+                        help=f'Serialized gloss index (default: {DEFAULT_INDEX})')
+    parser.add_argument('--fingerspell', choices=FINGERSPELL_POLICIES, default='acronyms',
+                        help='Which unknown words get a fingerspelling trigger (default: acronyms)')
+    parser.add_argument('--focusable', action='store_true', help='Add role="button" tabindex="0" to every trigger')
+    parser.add_argument('--coverage', default=None, help=f'Coverage report path (default: OUT/{COVERAGE_FILE})')
+    parser.add_argument('--preload-budget-mb', type=float, default=None,
+                        help='Write page.preload.json and add <link rel="preload"> hints up to this many MB per page')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Rebuild every page, ignoring content hashes')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report, stats = build_site(args.src, args.out, args.signs, args.mapping, args.index, args.fingerspell,
+                               args.focusable, args.workers, args.force, args.coverage,
+                               None if args.preload_budget_mb is None else int(args.preload_budget_mb * (1 << 20)))
+
+    print(f"✅ {stats['built']} pages annotated, {stats['skipped']} unchanged, {stats['failed']} failed "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"   {len(report['signs'])} signs used, {len(report['fingerspelled'])} fingerspelled words, "
+          f"{len(report['unbuilt'])} GLBs not built yet")
+    for item in report['priority'][:10]:
+        status = 'built' if item['built'] else 'missing'
+        print(f"   {item['key']:24} {item['file_id']}  {item['pages']} pages, {item['occurrences']}x ({status})")
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    exit(main())
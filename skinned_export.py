@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+Skinned skeletal GLB export for SignAvatars signs.
+
+Instead of baking keyframes into full-mesh morph targets, the sign is written
+as one skinned SMPL-X mesh (rest shape from the sign's betas) with the model's
+55-joint hierarchy and linear blend skinning weights. Each frame becomes a
+rotation key per joint plus a pelvis translation key, at the full source frame
+rate, so playback needs no keyframe subsampling and no morph blending.
+
+Facial expression is kept as 10 morph targets (the SMPL-X expression basis)
+driven by the per-frame expression coefficients.
+
+Differences from the morph-target export:
+- glTF skinning has no pose-corrective blend shapes, so SMPL-X posedirs are lost.
+- three.js uses 4 joint influences per vertex; SMPL-X weights are trimmed to the
+  4 largest and renormalized.
+- Joint positions come from the rest shape without expression.
+The export measures the resulting deviation from the body model on a sample of
+frames and reports it as max_error_mm.
+
+--mode animation writes the avatar once as animations/base-avatar-<hash>.glb
+(mean shape, all expression targets) and each sign as an animation-only file
+whose channels bind to the base avatar's nodes by name. The hash covers the
+body model and export options, so builds with different settings get their
+own avatar instead of replacing the one earlier signs were made for. Those files carry only
+joint rotations, pelvis translation and expression weights, plus a one-point
+placeholder mesh so loaders build the expression weight track.
+
+Usage:
+    python convert_pkl_to_glb.py --input signavatars-data/asl-word-level/00295.pkl \\
+        --output animations/WORD-00295.glb --mode skinned
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from pathlib import Path
+
+from glb_writer import (GLBWriter, ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER, quantize_normalized, pad_vec3,
+                        read_glb_json)
+from conversion_settings import CONVERTER_VERSION
+from convert_pkl_to_glb import SKIN_MATERIAL, QUANTIZED_MORPH_TYPES, vertex_normals
+from instrumentation import stage
+
+# SMPL-X kinematic joints in full_pose order (smplx.joint_names.JOINT_NAMES[:55])
+SMPLX_JOINT_NAMES = [
+    'pelvis', 'left_hip', 'right_hip', 'spine1', 'left_knee', 'right_knee', 'spine2',
+    'left_ankle', 'right_ankle', 'spine3', 'left_foot', 'right_foot', 'neck',
+    'left_collar', 'right_collar', 'head', 'left_shoulder', 'right_shoulder',
+    'left_elbow', 'right_elbow', 'left_wrist', 'right_wrist', 'jaw',
+    'left_eye_smplhf', 'right_eye_smplhf',
+    'left_index1', 'left_index2', 'left_index3', 'left_middle1', 'left_middle2', 'left_middle3',
+    'left_pinky1', 'left_pinky2', 'left_pinky3', 'left_ring1', 'left_ring2', 'left_ring3',
+    'left_thumb1', 'left_thumb2', 'left_thumb3',
+    'right_index1', 'right_index2', 'right_index3', 'right_middle1', 'right_middle2', 'right_middle3',
+    'right_pinky1', 'right_pinky2', 'right_pinky3', 'right_ring1', 'right_ring2', 'right_ring3',
+    'right_thumb1', 'right_thumb2', 'right_thumb3',
+]
+
+# full_pose blocks in joint order; each is (num_frames, 3 * joints)
+FULL_POSE_ORDER = ['global_orient', 'body_pose', 'jaw_pose', 'leye_pose', 'reye_pose',
+                   'left_hand_pose', 'right_hand_pose']
+
+# Same orientation fix as the morph export: rotate 180° around X (negate Y and Z).
+# Applied by a parent node above the skeleton; glTF quaternions are (x, y, z, w).
+FLIP_AXES = np.array([1.0, -1.0, -1.0], dtype=np.float32)
+FLIP_QUATERNION = [1.0, 0.0, 0.0, 0.0]
+
+# three.js reads a single JOINTS_0/WEIGHTS_0 set
+MAX_JOINT_INFLUENCES = 4
+
+SKELETON_ROOT_NAME = 'smplx_root'
+BODY_NODE_NAME = 'body'
+
+# Shared avatar for --mode animation, written next to the sign files with its hash in the name
+BASE_AVATAR_FILE = 'base-avatar.glb'
+BASE_AVATAR_HASH_LENGTH = 16
+
+
+def axis_angle_to_matrix(axis_angle):
+    """Rodrigues' formula for (..., 3) axis-angle vectors; returns (..., 3, 3)."""
+    axis_angle = np.asarray(axis_angle, dtype=np.float64)
+    angle = np.linalg.norm(axis_angle, axis=-1, keepdims=True)
+    axis = axis_angle / np.maximum(angle, 1e-12)
+    x, y, z = axis[..., 0], axis[..., 1], axis[..., 2]
+    zero = np.zeros_like(x)
+    skew = np.stack([zero, -z, y, z, zero, -x, -y, x, zero], axis=-1).reshape(axis.shape[:-1] + (3, 3))
+    sin, cos = np.sin(angle)[..., None], np.cos(angle)[..., None]
+    return np.eye(3) + sin * skew + (1 - cos) * (skew @ skew)
+
+
+def axis_angle_to_quaternion(axis_angle):
+    """Convert (..., 3) axis-angle vectors to (..., 4) glTF (x, y, z, w) quaternions."""
+    axis_angle = np.asarray(axis_angle, dtype=np.float64)
+    angle = np.linalg.norm(axis_angle, axis=-1, keepdims=True)
+    # sin(angle/2)/angle tends to 1/2 for small angles
+    factor = np.where(angle > 1e-8, np.sin(angle / 2) / np.maximum(angle, 1e-12), 0.5)
+    return np.concatenate([axis_angle * factor, np.cos(angle / 2)], axis=-1)
+
+
+def quaternion_to_matrix(quaternions):
+    """Convert (..., 4) (x, y, z, w) quaternions to (..., 3, 3) rotation matrices."""
+    q = quaternions / np.linalg.norm(quaternions, axis=-1, keepdims=True)
+    x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    return np.stack([
+        1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w),
+        2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w),
+        2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y),
+    ], axis=-1).reshape(q.shape[:-1] + (3, 3))
+
+
+def make_continuous(quaternions):
+    """
+    Flip signs along the frame axis of (frames, joints, 4) quaternions so
+    consecutive keys are in the same hemisphere and interpolate the short way.
+    """
+    dots = np.sum(quaternions[1:] * quaternions[:-1], axis=-1)
+    signs = np.cumprod(np.where(dots < 0, -1.0, 1.0), axis=0)
+    quaternions = quaternions.copy()
+    quaternions[1:] *= signs[..., None]
+    return quaternions
+
+
+def full_pose(parsed):
+    """Concatenate parsed SMPL-X pose blocks into (num_frames, 55, 3) axis-angle rotations."""
+    pose = np.concatenate([parsed[name] for name in FULL_POSE_ORDER], axis=1)
+    return pose.reshape(len(pose), -1, 3)
+
+
+def body_model_arrays(smplx_model):
+    """NumPy copies of the SMPL-X model buffers the skinned export needs."""
+    def to_numpy(buffer):
+        # NumPy body model arrays, or torch buffers from the smplx package
+        return buffer.detach().cpu().numpy() if hasattr(buffer, 'detach') else np.asarray(buffer)
+    return {
+        'v_template': to_numpy(smplx_model.v_template).astype(np.float64),
+        'shapedirs': to_numpy(smplx_model.shapedirs).astype(np.float64),
+        'expr_dirs': to_numpy(smplx_model.expr_dirs).astype(np.float64),
+        'J_regressor': to_numpy(smplx_model.J_regressor).astype(np.float64),
+        'parents': to_numpy(smplx_model.parents).astype(np.int64),
+        'lbs_weights': to_numpy(smplx_model.lbs_weights).astype(np.float64),
+        'faces': np.asarray(smplx_model.faces, dtype=np.int64),
+    }
+
+
+def top_joint_weights(lbs_weights, count=MAX_JOINT_INFLUENCES):
+    """
+    Keep the count largest skinning weights per vertex.
+
+    Returns (joints uint8 (V, count), weights float32 (V, count)) with each
+    row of weights summing to 1.
+    """
+    joints = np.argsort(-lbs_weights, axis=1)[:, :count]
+    weights = np.take_along_axis(lbs_weights, joints, axis=1)
+    weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1e-12)
+    return joints.astype(np.uint8), weights.astype(np.float32)
+
+
+def rest_shape(model, betas):
+    """Shaped rest-pose vertices (V, 3) and joint positions (55, 3) for one set of betas."""
+    vertices = model['v_template'] + model['shapedirs'] @ np.asarray(betas, dtype=np.float64)
+    return vertices, model['J_regressor'] @ vertices
+
+
+def skin_vertices(rest_vertices, joints, parents, rotations, root_translations, joint_indices, joint_weights,
+                  expression_dirs=None, expression=None):
+    """
+    Pose rest_vertices with linear blend skinning, as a glTF viewer would.
+
+    rotations is (F, 55, 3, 3) local joint rotations, root_translations (F, 3)
+    the pelvis position, joint_indices/joint_weights the per-vertex influences.
+    Returns (F, V, 3) float32 vertices.
+    """
+    num_frames = len(rotations)
+    world_rotations = np.empty_like(rotations)
+    world_positions = np.empty((num_frames, len(joints), 3))
+    for j, parent in enumerate(parents):
+        if parent < 0:
+            world_rotations[:, j] = rotations[:, j]
+            world_positions[:, j] = root_translations
+        else:
+            world_rotations[:, j] = world_rotations[:, parent] @ rotations[:, j]
+            world_positions[:, j] = world_positions[:, parent] + \
+                np.einsum('fij,j->fi', world_rotations[:, parent], joints[j] - joints[parent])
+
+    # Joint transforms relative to the rest pose: x -> R x + (p - R J)
+    offsets = world_positions - np.einsum('fjik,jk->fji', world_rotations, joints)
+
+    posed = np.empty((num_frames, len(rest_vertices), 3), dtype=np.float32)
+    for f in range(num_frames):
+        vertices = rest_vertices
+        if expression is not None:
+            vertices = vertices + expression_dirs @ expression[f]
+        blended_rotations = np.einsum('vk,vkij->vij', joint_weights, world_rotations[f][joint_indices])
+        blended_offsets = np.einsum('vk,vki->vi', joint_weights, offsets[f][joint_indices])
+        posed[f] = np.einsum('vij,vj->vi', blended_rotations, vertices) + blended_offsets
+    return posed
+
+
+def build_avatar(model, betas):
+    """
+    Skinned avatar for one set of betas, in glTF bind space.
+
+    Bind space is the flipped SMPL-X rest space (x_bind = FLIP_AXES * x), so the
+    inverse bind matrices undo the flip that the skeleton root node applies.
+    """
+    rest_vertices, joints = rest_shape(model, betas)
+    joint_indices, joint_weights = top_joint_weights(model['lbs_weights'])
+    parents = model['parents']
+
+    bind_vertices = rest_vertices * FLIP_AXES
+    inverse_bind_matrices = np.tile(np.eye(4), (len(joints), 1, 1))
+    inverse_bind_matrices[:, :3, :3] = np.diag(FLIP_AXES)
+    inverse_bind_matrices[:, :3, 3] = -joints
+
+    joint_offsets = joints - joints[np.maximum(parents, 0)]
+    joint_offsets[parents < 0] = joints[parents < 0]
+
+    return {
+        'rest_vertices': rest_vertices,
+        'joints': joints,
+        'parents': parents,
+        'joint_offsets': joint_offsets,
+        'joint_indices': joint_indices,
+        'joint_weights': joint_weights,
+        'bind_vertices': bind_vertices,
+        'normals': vertex_normals(bind_vertices, model['faces']),
+        'inverse_bind_matrices': inverse_bind_matrices,
+        'faces': model['faces'],
+    }
+
+
+def prepare_body_geometry(bind_vertices, expression_targets=None, quantize=None, sparse_threshold=None):
+    """
+    Convert bind-space positions and expression deltas (E, V, 3) to their stored form.
+
+    Returns a dict with 'positions', 'targets' [(stored deltas, moving mask)],
+    'dequantize' (4x4 matrix folded into the inverse bind matrices, since
+    skinned mesh node transforms are ignored), 'scale' and 'target_scales'
+    (factors folded into the expression weights). The base avatar and its
+    animation-only files both call this, so their weights agree.
+    """
+    dequantize = np.eye(4)
+    if quantize:
+        lower, upper = bind_vertices.min(axis=0), bind_vertices.max(axis=0)
+        center = (lower + upper) / 2
+        scale = float(max((upper - lower).max() / 2, 1e-8))
+        dequantize[:3, :3] *= scale
+        dequantize[:3, 3] = center
+        positions = pad_vec3(quantize_normalized((bind_vertices - center) / scale, np.int16))
+    else:
+        scale = 1.0
+        positions = bind_vertices.astype(np.float32)
+
+    targets, target_scales = [], []
+    for target in ([] if expression_targets is None else expression_targets):
+        target = (target / scale).astype(np.float32)
+        # Exact zeros (vertices outside the face) always go sparse; the threshold drops more
+        moving = np.abs(target).max(axis=1) > (sparse_threshold or 0.0) / scale
+        target[~moving] = 0.0
+        target_scale = 1.0
+        if quantize:
+            target_scale = float(max(np.abs(target).max(), 1e-12))
+            target = quantize_normalized(target / target_scale, QUANTIZED_MORPH_TYPES[quantize])
+        targets.append((target, moving))
+        target_scales.append(target_scale)
+
+    return {'positions': positions, 'targets': targets, 'dequantize': dequantize, 'scale': scale,
+            'target_scales': np.asarray(target_scales, dtype=np.float32)}
+
+
+def geometry_error_bound(geometry, expression_weights=None, quantize=None, sparse_threshold=None):
+    """Position error bound in metres from quantization and sparse thresholding of prepared geometry."""
+    max_error = 0.0
+    if quantize:
+        max_error += geometry['scale'] * 0.5 / np.iinfo(np.int16).max
+    if expression_weights is not None and len(geometry['targets']):
+        weights = np.abs(expression_weights)
+        if sparse_threshold:
+            max_error += sparse_threshold * float(weights.sum(axis=1).max())
+        if quantize:
+            step = geometry['scale'] * 0.5 / np.iinfo(QUANTIZED_MORPH_TYPES[quantize]).max
+            max_error += float((weights * geometry['target_scales']).sum(axis=1).max()) * step
+    return max_error
+
+
+def add_skinned_body(writer, geometry, avatar):
+    """Write the skinned mesh (positions, normals, LBS influences, expression targets); returns the mesh index."""
+    quantized = geometry['positions'].dtype != np.float32
+    writer.add('materials', SKIN_MATERIAL)
+    if quantized:
+        writer.require_extension("KHR_mesh_quantization")
+        attributes = {
+            "POSITION": writer.add_accessor(geometry['positions'], target=ARRAY_BUFFER, min_max=True,
+                                            normalized=True, accessor_type="VEC3"),
+            "NORMAL": writer.add_accessor(pad_vec3(quantize_normalized(avatar['normals'], np.int8)),
+                                          target=ARRAY_BUFFER, normalized=True, accessor_type="VEC3"),
+        }
+    else:
+        attributes = {
+            "POSITION": writer.add_accessor(geometry['positions'], target=ARRAY_BUFFER, min_max=True),
+            "NORMAL": writer.add_accessor(avatar['normals'].astype(np.float32), target=ARRAY_BUFFER),
+        }
+    attributes["JOINTS_0"] = writer.add_accessor(avatar['joint_indices'], target=ARRAY_BUFFER)
+    attributes["WEIGHTS_0"] = writer.add_accessor(avatar['joint_weights'], target=ARRAY_BUFFER)
+
+    faces = avatar['faces']
+    index_type = np.uint16 if quantized and faces.max() < 65535 else np.uint32
+    primitive = {
+        "attributes": attributes,
+        "indices": writer.add_accessor(faces.astype(index_type).reshape(-1), target=ELEMENT_ARRAY_BUFFER),
+        "material": 0,
+    }
+    mesh = {"primitives": [primitive]}
+    if geometry['targets']:
+        primitive["targets"] = [{"POSITION": writer.add_morph_target_accessor(deltas, moving, normalized=quantized)}
+                                for deltas, moving in geometry['targets']]
+        mesh["weights"] = [0.0] * len(geometry['targets'])
+    return writer.add('meshes', mesh)
+
+
+def add_stub_body(writer, num_targets):
+    """
+    Write a one-point placeholder mesh with num_targets empty morph targets.
+
+    Animation-only files need it so loaders create the expression weight track
+    for the body node; the accessors have no buffer data.
+    """
+    empty = writer.add_sparse_accessor(1, [], np.zeros((0, 3), dtype=np.float32), "VEC3",
+                                       min_values=[0.0] * 3, max_values=[0.0] * 3)
+    primitive = {"attributes": {"POSITION": empty}, "mode": 0}
+    mesh = {"primitives": [primitive]}
+    if num_targets:
+        primitive["targets"] = [{"POSITION": empty}] * num_targets
+        mesh["weights"] = [0.0] * num_targets
+    return writer.add('meshes', mesh)
+
+
+def add_skeleton(writer, mesh, avatar, inverse_bind_matrices=None):
+    """
+    Write the body node, the orientation-fix root and the joint hierarchy as the scene.
+
+    Node 0 is the body, node 1 the flip, nodes 2.. the joints in SMPL-X order.
+    With inverse_bind_matrices the body is skinned to the joints.
+    Returns the node index of the first joint (the pelvis).
+    """
+    first_joint = 2
+    parents = avatar['parents']
+    body = {"name": BODY_NODE_NAME, "mesh": mesh}
+    writer.add('nodes', body)
+    writer.add('nodes', {"name": SKELETON_ROOT_NAME, "rotation": FLIP_QUATERNION, "children": [first_joint]})
+    for j, name in enumerate(SMPLX_JOINT_NAMES[:len(parents)]):
+        node = {"name": name, "translation": np.asarray(avatar['joint_offsets'][j], dtype=np.float64).tolist()}
+        children = [first_joint + c for c, parent in enumerate(parents) if parent == j]
+        if children:
+            node["children"] = children
+        writer.add('nodes', node)
+
+    if inverse_bind_matrices is not None:
+        body["skin"] = writer.add('skins', {
+            "joints": list(range(first_joint, first_joint + len(parents))),
+            "skeleton": first_joint,
+            # glTF matrices are column-major
+            "inverseBindMatrices": writer.add_accessor(
+                inverse_bind_matrices.transpose(0, 2, 1).reshape(-1, 16).astype(np.float32)),
+        })
+    writer.add('scenes', {"nodes": [0, 1]})
+    writer.gltf['scene'] = 0
+    return first_joint
+
+
+def add_sign_animation(writer, first_joint, times, rotations, root_translations, expression_weights=None,
+                       clip_name=None):
+    """
+    Write one clip: a rotation channel per joint, pelvis translation and
+    (optionally) body expression weights, all sharing one time input.
+
+    rotations is (F, J, 4) float32 or normalized int16 quaternions.
+    """
+    samplers, channels = [], []
+    times_accessor = writer.add_accessor(np.asarray(times, dtype=np.float32), min_max=True)
+
+    def add_channel(node, path, values, normalized=False):
+        samplers.append({"input": times_accessor, "interpolation": "LINEAR",
+                         "output": writer.add_accessor(values, normalized=normalized)})
+        channels.append({"sampler": len(samplers) - 1, "target": {"node": node, "path": path}})
+
+    for j in range(rotations.shape[1]):
+        add_channel(first_joint + j, "rotation", np.ascontiguousarray(rotations[:, j]),
+                    normalized=rotations.dtype != np.float32)
+    add_channel(first_joint, "translation", np.asarray(root_translations, dtype=np.float32))
+    if expression_weights is not None:
+        add_channel(0, "weights", np.asarray(expression_weights, dtype=np.float32).reshape(-1))
+
+    animation = {"samplers": samplers, "channels": channels}
+    if clip_name:
+        animation["name"] = clip_name
+    return writer.add('animations', animation)
+
+
+def base_avatar_hash(model, quantize=None, sparse_threshold=None):
+    """SHA-256 of everything the base avatar is built from; animation-only files record it."""
+    digest = hashlib.sha256()
+    for name in ('v_template', 'expr_dirs', 'J_regressor', 'parents', 'lbs_weights', 'faces'):
+        digest.update(np.ascontiguousarray(model[name]).tobytes())
+    options = {'converter_version': CONVERTER_VERSION, 'quantize': quantize, 'sparse_threshold': sparse_threshold}
+    digest.update(json.dumps(options, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def base_avatar_file(source_hash, name=BASE_AVATAR_FILE):
+    """File name of the base avatar with a given hash: base-avatar-<hash prefix>.glb."""
+    name = Path(name)
+    return f"{name.stem}-{source_hash[:BASE_AVATAR_HASH_LENGTH]}{name.suffix}"
+
+
+def ensure_base_avatar(model, output_dir, quantize=None, sparse_threshold=None, name=BASE_AVATAR_FILE):
+    """
+    Write the shared base avatar to output_dir unless an identical one already exists.
+
+    The base is the SMPL-X mean shape (zero betas) with all expression targets
+    and no animation. Its file name carries its hash (see base_avatar_file),
+    so an avatar other signs were built for is never replaced. Returns
+    (file name, hash). Safe to call from several workers at once.
+    """
+    source_hash = base_avatar_hash(model, quantize, sparse_threshold)
+    file_name = base_avatar_file(source_hash, name)
+    output_path = Path(output_dir) / file_name
+    if output_path.exists():
+        extras = read_glb_json(output_path)['asset'].get('extras', {})
+        if extras.get('sourceHash') == source_hash:
+            return file_name, source_hash
+
+    avatar = build_avatar(model, np.zeros(model['shapedirs'].shape[2]))
+    expression_targets = np.moveaxis(model['expr_dirs'], 2, 0) * FLIP_AXES
+    geometry = prepare_body_geometry(avatar['bind_vertices'], expression_targets, quantize, sparse_threshold)
+
+    writer = GLBWriter()
+    writer.gltf['asset']['extras'] = {'sourceHash': source_hash}
+    mesh = add_skinned_body(writer, geometry, avatar)
+    add_skeleton(writer, mesh, avatar, avatar['inverse_bind_matrices'] @ geometry['dequantize'])
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    written = writer.write(tmp_path)
+    os.replace(tmp_path, output_path)
+    print(f"✅ Wrote base avatar: {output_path} ({written / 1024:.0f} KB)")
+    return file_name, source_hash
+
+
+def skinned_clip(model, avatar, parsed, centroid, reference_indices, reference_vertices, quantize=None,
+                 expression_dirs=None):
+    """
+    Animation data for one clip of a skinned export.
+
+    parsed holds the clip's frames (parse_smplx_params) and reference_vertices
+    the body-model vertices of its frames reference_indices (clip-relative).
+    centroid is the recording's centring offset. With expression_dirs the
+    expression is part of the skinning check.
+    Returns (quaternions (F, 55, 4) as stored, root translations (F, 3),
+    expression (F, E) float64, max skinning deviation in metres).
+    """
+    with stage('transform', frames=len(parsed['global_orient'])):
+        expression = parsed['expression'].astype(np.float64)
+        root_translations = avatar['joints'][0] + parsed['transl'].astype(np.float64) - centroid
+
+        quaternions = make_continuous(axis_angle_to_quaternion(full_pose(parsed)))
+        if quantize:
+            # Unit quaternions fit normalized int16 (core glTF allows it for rotation samplers)
+            quaternions = quantize_normalized(quaternions, np.int16)
+            stored_rotations = quaternions.astype(np.float64) / np.iinfo(np.int16).max
+        else:
+            quaternions = quaternions.astype(np.float32)
+            stored_rotations = quaternions.astype(np.float64)
+
+        # Check skinning (as written) against the body model on the reference frames
+        skinned = skin_vertices(avatar['rest_vertices'], avatar['joints'], avatar['parents'],
+                                quaternion_to_matrix(stored_rotations[reference_indices]),
+                                root_translations[reference_indices] + centroid,
+                                avatar['joint_indices'], avatar['joint_weights'], expression_dirs,
+                                expression[reference_indices] if expression_dirs is not None else None)
+        skinning_error = float(np.abs(skinned - reference_vertices).max())
+    return quaternions, root_translations, expression, skinning_error
+
+
+@stage('pack')
+def create_skinned_clips_glb(clips, smplx_model, output_path, fps=30, quantize=None, sparse_threshold=None,
+                             base_avatar=None, include_expression=True, recenter=False):
+    """
+    Export named clips of one recording on a single skinned SMPL-X avatar.
+
+    clips is an iterable of (name, parsed, reference_indices,
+    reference_vertices), see skinned_clip, consumed one clip at a time so
+    only one clip's frames are in memory. The first clip sets the rest shape
+    (its first frame's betas) and, through its reference frame 0, the
+    centring of every clip. With recenter, each clip is centred on its own
+    reference frame 0 instead (clips from different recordings, which must
+    then share the rest shape, e.g. all mean shape).
+    base_avatar works as in create_skinned_glb.
+    Returns (metadata per clip, file size, max deviation in metres); with
+    base_avatar, the avatar file the clips play on is in the GLB's
+    asset.extras.baseAvatar (see base_avatar_of).
+    """
+    model = body_model_arrays(smplx_model)
+    output_path = Path(output_path)
+    writer = GLBWriter()
+    clip_metadata = []
+    max_error = 0.0
+    first_joint = avatar = geometry = centroid = expression_dirs = None
+
+    for name, parsed, reference_indices, reference_vertices in clips:
+        if avatar is None:
+            # Rest shape from the first frame's betas; pelvis carries the global translation
+            avatar = build_avatar(model, parsed['betas'][0])
+            expression_dirs = model['expr_dirs'][:, :, :parsed['expression'].shape[1]]
+            # Centre on the first frame like the morph export; the flip is the parent node
+            centroid = reference_vertices[0].mean(axis=0).astype(np.float64)
+            avatar['joint_offsets'][0] = avatar['joints'][0] + parsed['transl'][0].astype(np.float64) - centroid
+
+            expression_targets = np.moveaxis(expression_dirs, 2, 0) * FLIP_AXES if include_expression else None
+            geometry = prepare_body_geometry(avatar['bind_vertices'], expression_targets, quantize, sparse_threshold)
+            if base_avatar:
+                base_file, base_hash = ensure_base_avatar(model, output_path.parent, quantize, sparse_threshold,
+                                                          name=base_avatar)
+                writer.gltf['asset']['extras'] = {'baseAvatar': base_file, 'baseAvatarHash': base_hash}
+                first_joint = add_skeleton(writer, add_stub_body(writer, len(geometry['targets'])), avatar)
+            else:
+                mesh = add_skinned_body(writer, geometry, avatar)
+                first_joint = add_skeleton(writer, mesh, avatar,
+                                           avatar['inverse_bind_matrices'] @ geometry['dequantize'])
+        elif recenter:
+            centroid = reference_vertices[0].mean(axis=0).astype(np.float64)
+
+        quaternions, root_translations, expression, skinning_error = skinned_clip(
+            model, avatar, parsed, centroid, reference_indices, reference_vertices, quantize,
+            expression_dirs if include_expression else None)
+        expression_weights = expression * geometry['target_scales'] if include_expression else None
+        times = np.arange(len(quaternions), dtype=np.float32) / fps
+        add_sign_animation(writer, first_joint, times, quaternions, root_translations, expression_weights,
+                           clip_name=name)
+
+        clip_error = skinning_error + geometry_error_bound(geometry, expression_weights, quantize, sparse_threshold)
+        max_error = max(max_error, clip_error)
+        clip_metadata.append({'name': name, 'frames': len(quaternions), 'reference_frames': len(reference_indices),
+                              'max_error_mm': round(clip_error * 1000, 4)})
+
+    if avatar is None:
+        raise ValueError("No clips to export")
+    return clip_metadata, writer.write(output_path), max_error
+
+
+def base_avatar_of(glb_path):
+    """Base avatar file an animation-only GLB plays on (asset.extras.baseAvatar), or None."""
+    return read_glb_json(glb_path)['asset'].get('extras', {}).get('baseAvatar')
+
+
+def create_skinned_glb(parsed, smplx_model, output_path, word_label="sign", fps=30,
+                       reference_indices=None, reference_vertices=None, quantize=None, sparse_threshold=None,
+                       base_avatar=None):
+    """
+    Export a sign as a skinned SMPL-X mesh with per-joint rotation channels at full frame rate.
+
+    parsed is the output of parse_smplx_params for every frame.
+    reference_vertices (N, V, 3) are body-model vertices for the source frames
+    reference_indices (frame 0 first); they place the avatar like the morph
+    export and measure how far skinning deviates from the body model.
+
+    With base_avatar (a file name next to output_path, which gets the avatar's
+    hash added) the sign is written as an animation-only file bound by node
+    name to that shared avatar, which is created if needed. The avatar always has the mean shape, so parsed and
+    reference_vertices must then use zero betas.
+    Returns signs.json-style metadata.
+    """
+    output_path = Path(output_path)
+    num_frames = len(parsed['global_orient'])
+    # A shared avatar keeps its last expression, so animation-only clips always reset it
+    has_expression = base_avatar is not None or bool(np.any(parsed['expression']))
+
+    clips, written, max_error = create_skinned_clips_glb(
+        [(word_label, parsed, reference_indices, reference_vertices)], smplx_model, output_path, fps=fps,
+        quantize=quantize, sparse_threshold=sparse_threshold, base_avatar=base_avatar,
+        include_expression=has_expression)
+    if base_avatar:
+        base_avatar = base_avatar_of(output_path)
+
+    kind = f"animation for {base_avatar}" if base_avatar else "skinned GLB"
+    print(f"\n✅ Created {kind}: {output_path}")
+    print(f"   Frames: {num_frames} at {fps} fps (duration: {(num_frames - 1) / fps:.2f}s)")
+    print(f"   Joints: {len(SMPLX_JOINT_NAMES)}, influences per vertex: {MAX_JOINT_INFLUENCES}")
+    print(f"   Expression targets: {parsed['expression'].shape[1] if has_expression else 0}")
+    print(f"   Max deviation from body model: {max_error * 1000:.3f} mm "
+          f"(checked on {len(reference_indices)} frames)")
+    print(f"   Size: {written / 1024:.0f} KB")
+
+    metadata = {
+        'file': output_path.name,
+        'description': f'ASL sign: {word_label}',
+        'region': 'ASL',
+        'biomechanical': True,
+        'frames': num_frames,
+        'max_error_mm': round(max_error * 1000, 4),
+    }
+    if base_avatar:
+        metadata['base_avatar'] = base_avatar
+    return metadata
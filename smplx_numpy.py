@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+NumPy-only SMPL-X body model.
+
+The converter only needs SMPL-X vertices on the CPU, and importing torch and
+smplx for that costs seconds and hundreds of MB per worker. SMPLXModel loads
+the model .npz directly and evaluates batches of frames with the same maths
+as smplx.SMPLX.forward: shape and expression blend shapes, batched Rodrigues,
+pose-corrective blend shapes, forward kinematics and linear blend skinning.
+
+Only what SignAvatars conversion uses is supported: .npz models, full
+axis-angle hand poses (use_pca=False) and no face-contour landmarks.
+Vertices match smplx to float32 precision (tests/test_smplx_numpy.py).
+
+On first use the model's arrays are written, already sliced, converted and
+precomputed, as one directory of aligned .npy files under
+signavatars-data/model-cache/. Every later SMPLXModel maps them read-only, so
+a pool of converter workers shares one copy of the pose and shape blend
+shapes through the page cache instead of each unpacking the .npz.
+
+Usage:
+    model = create('signavatars-data/models', **SMPLX_OPTIONS)
+    vertices = model(body_pose=body_pose, betas=betas, ...).vertices  # (F, V, 3)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections import namedtuple
+import numpy as np
+from pathlib import Path
+
+from build_manifest import find_smplx_model_file
+
+DEFAULT_MODEL_CACHE = Path("signavatars-data/model-cache")
+MODEL_CACHE_FORMAT = 1
+LAYOUT_INDEX = 'layout.json'
+
+# Arrays stored per model layout, as <name>.npy
+MODEL_ARRAYS = ('v_template', 'shapedirs', 'expr_dirs', 'posedirs', 'J_regressor', 'parents', 'lbs_weights',
+                'faces', 'pose_mean', 'shape_components', 'joint_template', 'joint_components')
+
+SMPLXOutput = namedtuple('SMPLXOutput', ['vertices', 'joints'])
+
+NUM_BODY_JOINTS = 21
+NUM_HAND_JOINTS = 15
+
+# smplx keeps 300 shape components before the expression space in full models
+SHAPE_SPACE_DIM = 300
+EXPRESSION_SPACE_DIM = 100
+
+# Keyword arguments in smplx's full_pose order, with their joint counts
+POSE_INPUTS = [('global_orient', 1), ('body_pose', NUM_BODY_JOINTS), ('jaw_pose', 1), ('leye_pose', 1),
+               ('reye_pose', 1), ('left_hand_pose', NUM_HAND_JOINTS), ('right_hand_pose', NUM_HAND_JOINTS)]
+
+
+def batch_rodrigues(rot_vecs):
+    """(N, 3) axis-angle vectors to (N, 3, 3) rotation matrices, as smplx.lbs.batch_rodrigues."""
+    rot_vecs = np.asarray(rot_vecs)
+    angle = np.linalg.norm(rot_vecs + 1e-8, axis=1, keepdims=True)
+    rx, ry, rz = np.split(rot_vecs / angle, 3, axis=1)
+    zeros = np.zeros_like(rx)
+    K = np.concatenate([zeros, -rz, ry, rz, zeros, -rx, -ry, rx, zeros], axis=1).reshape(-1, 3, 3)
+    sin = np.sin(angle)[:, :, None]
+    cos = np.cos(angle)[:, :, None]
+    return np.eye(3, dtype=rot_vecs.dtype) + sin * K + (1 - cos) * (K @ K)
+
+
+def forward_kinematics(rotations, joints, parents):
+    """
+    World transforms of a batch of posed skeletons.
+
+    rotations is (F, J, 3, 3) local rotations, joints (F, J, 3) rest joint
+    positions. Returns (posed joints (F, J, 3), (F, J, 3, 4) transforms
+    relative to the rest pose: x -> R x + t).
+    """
+    relative = joints.copy()
+    relative[:, 1:] -= joints[:, parents[1:]]
+
+    world_rotations = np.empty_like(rotations)
+    world_positions = np.empty_like(joints)
+    world_rotations[:, 0] = rotations[:, 0]
+    world_positions[:, 0] = relative[:, 0]
+    for i in range(1, len(parents)):
+        parent = parents[i]
+        world_rotations[:, i] = world_rotations[:, parent] @ rotations[:, i]
+        world_positions[:, i] = (world_rotations[:, parent] @ relative[:, i, :, None])[..., 0] + \
+            world_positions[:, parent]
+
+    offsets = world_positions - (world_rotations @ joints[..., None])[..., 0]
+    return world_positions, np.concatenate([world_rotations, offsets[..., None]], axis=3)
+
+
+def model_arrays(model_file, num_betas=10, num_expression_coeffs=10, flat_hand_mean=False, dtype=np.float32):
+    """Read a SMPL-X .npz into the arrays SMPLXModel evaluates, in their final dtype and layout."""
+    with np.load(model_file, allow_pickle=True) as data:
+        shapedirs = data['shapedirs']
+        if shapedirs.ndim < 3:
+            shapedirs = shapedirs[:, :, None]
+        if shapedirs.shape[-1] < SHAPE_SPACE_DIM + EXPRESSION_SPACE_DIM:
+            # Reduced models: 10 shape then 10 expression components
+            num_betas = min(num_betas, 10)
+            expression_start, num_expression_coeffs = 10, min(num_expression_coeffs, 10)
+        else:
+            num_betas = min(num_betas, SHAPE_SPACE_DIM)
+            expression_start = SHAPE_SPACE_DIM
+            num_expression_coeffs = min(num_expression_coeffs, EXPRESSION_SPACE_DIM)
+
+        arrays = {
+            'v_template': np.asarray(data['v_template'], dtype=dtype),
+            'shapedirs': np.ascontiguousarray(shapedirs[:, :, :num_betas], dtype=dtype),
+            'expr_dirs': np.ascontiguousarray(
+                shapedirs[:, :, expression_start:expression_start + num_expression_coeffs], dtype=dtype),
+        }
+        posedirs = data['posedirs']
+        arrays['posedirs'] = np.ascontiguousarray(posedirs.reshape(-1, posedirs.shape[-1]).T, dtype=dtype)
+        arrays['J_regressor'] = np.asarray(data['J_regressor'], dtype=dtype)
+        parents = np.asarray(data['kintree_table'][0]).astype(np.int64)
+        parents[0] = -1
+        arrays['parents'] = parents
+        arrays['lbs_weights'] = np.asarray(data['weights'], dtype=dtype)
+        arrays['faces'] = np.asarray(data['f'])
+        hands_mean = np.zeros(2 * NUM_HAND_JOINTS * 3) if flat_hand_mean else \
+            np.concatenate([data['hands_meanl'], data['hands_meanr']])
+
+    # Mean pose in full_pose order (root, body, jaw, eyes, hands); only the hands can be non-zero
+    arrays['pose_mean'] = np.concatenate([np.zeros(3 * (NUM_BODY_JOINTS + 4)), hands_mean]).astype(dtype)
+
+    # Joints are linear in the shape, so regress them from the blend shapes once
+    num_vertices = len(arrays['v_template'])
+    components = np.concatenate([arrays['shapedirs'], arrays['expr_dirs']], axis=2)
+    arrays['shape_components'] = components.reshape(num_vertices * 3, -1).T.copy()  # (B + E, V * 3)
+    arrays['joint_template'] = arrays['J_regressor'] @ arrays['v_template']
+    arrays['joint_components'] = np.einsum('jv,vkl->ljk', arrays['J_regressor'], components).reshape(
+        components.shape[2], -1)  # (B + E, J * 3)
+    return arrays
+
+
+def model_layout_dir(model_file, cache_dir=DEFAULT_MODEL_CACHE, **options):
+    """Layout directory for a model file and model_arrays options; changes when the file does."""
+    stat = os.stat(model_file)
+    key = json.dumps({'format': MODEL_CACHE_FORMAT, 'source': str(Path(model_file).resolve()),
+                      'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                      **{name: np.dtype(value).name if name == 'dtype' else value
+                         for name, value in options.items()}}, sort_keys=True)
+    return Path(cache_dir) / f"{Path(model_file).stem}-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}"
+
+
+def write_model_layout(model_file, layout_dir, **options):
+    """
+    Write model_arrays as .npy files into layout_dir. The files go into a
+    temporary directory that is renamed into place, so concurrent writers
+    are safe and readers never see a partial layout.
+    """
+    layout_dir = Path(layout_dir)
+    layout_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = layout_dir.parent / f".{layout_dir.name}.{os.getpid()}.tmp"
+    tmp_dir.mkdir(exist_ok=True)
+    try:
+        for name, array in model_arrays(model_file, **options).items():
+            np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(array))
+        with open(tmp_dir / LAYOUT_INDEX, 'w') as f:
+            json.dump({'format': MODEL_CACHE_FORMAT, 'source': str(model_file), 'arrays': list(MODEL_ARRAYS)}, f)
+        os.replace(tmp_dir, layout_dir)
+    except OSError:
+        if not (layout_dir / LAYOUT_INDEX).exists():
+            raise
+        # Another process finished the same layout first
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def mapped_model_arrays(model_file, cache_dir=DEFAULT_MODEL_CACHE, **options):
+    """model_arrays as read-only memory maps of the cached layout, writing it on first use."""
+    layout_dir = model_layout_dir(model_file, cache_dir, **options)
+    if not (layout_dir / LAYOUT_INDEX).exists():
+        write_model_layout(model_file, layout_dir, **options)
+    return {name: np.load(layout_dir / f"{name}.npy", mmap_mode='r') for name in MODEL_ARRAYS}
+
+
+class SMPLXModel:
+    """
+    SMPL-X evaluated with NumPy; attribute names follow smplx.SMPLX's buffers.
+    With a cache_dir the arrays are shared read-only memory maps; with None
+    they are loaded privately from the .npz.
+    """
+
+    def __init__(self, model_file, num_betas=10, num_expression_coeffs=10, use_pca=False, flat_hand_mean=False,
+                 use_face_contour=False, dtype=np.float32, cache_dir=DEFAULT_MODEL_CACHE):
+        if use_pca:
+            raise ValueError("The NumPy SMPL-X model only supports full hand poses (use_pca=False)")
+        if use_face_contour:
+            raise ValueError("The NumPy SMPL-X model does not compute face-contour landmarks")
+        self.model_file = str(model_file)
+        self.dtype = dtype
+
+        options = dict(num_betas=num_betas, num_expression_coeffs=num_expression_coeffs,
+                       flat_hand_mean=flat_hand_mean, dtype=dtype)
+        arrays = None
+        if cache_dir is not None:
+            try:
+                arrays = mapped_model_arrays(model_file, cache_dir, **options)
+            except OSError as e:
+                print(f"⚠️  Could not use the SMPL-X model cache in {cache_dir} ({e}); loading privately")
+        if arrays is None:
+            arrays = model_arrays(model_file, **options)
+
+        self.v_template = arrays['v_template']
+        self.shapedirs = arrays['shapedirs']
+        self.expr_dirs = arrays['expr_dirs']
+        self.posedirs = arrays['posedirs']
+        self.J_regressor = arrays['J_regressor']
+        self.parents = arrays['parents']
+        self.lbs_weights = arrays['lbs_weights']
+        self.faces = arrays['faces']
+        self.pose_mean = arrays['pose_mean']
+        self._shape_components = arrays['shape_components']
+        self._joint_template = arrays['joint_template']
+        self._joint_components = arrays['joint_components']
+        self.num_betas = self.shapedirs.shape[2]
+        self.num_expression_coeffs = self.expr_dirs.shape[2]
+
+    def full_pose(self, batch_size, **inputs):
+        """(F, J, 3) axis-angle rotations in smplx's full_pose order; missing inputs are zero."""
+        blocks = []
+        for name, joints in POSE_INPUTS:
+            value = inputs.get(name)
+            if value is None:
+                value = np.zeros((batch_size, joints * 3), dtype=self.dtype)
+            blocks.append(np.asarray(value, dtype=self.dtype).reshape(batch_size, joints * 3))
+        return (np.concatenate(blocks, axis=1) + self.pose_mean).reshape(batch_size, -1, 3)
+
+    def __call__(self, betas=None, expression=None, transl=None, return_verts=True, **pose_inputs):
+        """
+        Evaluate a batch of frames; arguments are NumPy arrays named and shaped
+        like smplx.SMPLX.forward's; missing inputs are zero.
+        Returns SMPLXOutput(vertices (F, V, 3), joints (F, 55, 3)).
+        """
+        batch_size = max([len(np.atleast_2d(value)) for value in (betas, expression, *pose_inputs.values())
+                          if value is not None] or [1])
+        shape = np.zeros((batch_size, self.num_betas + self.num_expression_coeffs), dtype=self.dtype)
+        if betas is not None:
+            shape[:, :self.num_betas] = np.asarray(betas, dtype=self.dtype).reshape(-1, self.num_betas)
+        if expression is not None:
+            shape[:, self.num_betas:] = np.asarray(expression, dtype=self.dtype).reshape(
+                -1, self.num_expression_coeffs)
+
+        num_vertices = len(self.v_template)
+        v_shaped = self.v_template + (shape @ self._shape_components).reshape(batch_size, num_vertices, 3)
+        joints = self._joint_template + (shape @ self._joint_components).reshape(batch_size, -1, 3)
+
+        rotations = batch_rodrigues(self.full_pose(batch_size, **pose_inputs).reshape(-1, 3)).reshape(
+            batch_size, -1, 3, 3)
+        pose_feature = (rotations[:, 1:] - np.eye(3, dtype=self.dtype)).reshape(batch_size, -1)
+        v_posed = v_shaped + (pose_feature @ self.posedirs).reshape(batch_size, num_vertices, 3)
+
+        posed_joints, transforms = forward_kinematics(rotations, joints, self.parents)
+        # Blend the (3, 4) joint transforms per vertex, then apply them
+        blended = (self.lbs_weights @ transforms.reshape(batch_size, -1, 12)).reshape(batch_size, num_vertices, 3, 4)
+        vertices = (blended[..., :3] @ v_posed[..., None])[..., 0] + blended[..., 3]
+
+        if transl is not None:
+            transl = np.asarray(transl, dtype=self.dtype).reshape(batch_size, 1, 3)
+            vertices += transl
+            posed_joints = posed_joints + transl
+        return SMPLXOutput(vertices=vertices.astype(self.dtype, copy=False) if return_verts else None,
+                           joints=posed_joints.astype(self.dtype, copy=False))
+
+
+def create(model_path, model_type='smplx', gender='neutral', ext='npz', **kwargs):
+    """
+    Load an SMPL-X model like smplx.create: model_path is the .npz itself, a
+    directory holding it, or a directory with an smplx/ subfolder.
+    """
+    if model_type != 'smplx' or ext != 'npz':
+        raise ValueError(f"The NumPy body model only loads SMPL-X .npz files, not {model_type}/{ext}")
+    model_file = find_smplx_model_file(model_path, gender, ext)
+    if model_file is None:
+        raise FileNotFoundError(f"No SMPLX_{gender.upper()}.{ext} under {model_path}")
+    return SMPLXModel(model_file, **kwargs)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Streaming conversion for long SignAvatars recordings.
+
+convert_pkl_to_glb.py evaluates a whole word-level sign at once. Sentence-level
+and continuous recordings run to thousands of frames, so this converter
+splits a recording into clips (fixed length, or named segments from a JSON
+file) and converts one clip at a time. Each clip's rows are sliced from the
+loaded parameters (a memory map when the parameter store is current) and go
+through the body model in --chunk-size batches, so memory depends on the clip
+length, not the recording length.
+
+--split clips (skinned and animation modes) writes one GLB: a single skinned
+avatar with one named animation per clip, centred once for the whole
+recording so consecutive clips line up. --split files writes every clip as
+its own GLB in any mode (OUTPUT-001.glb, OUTPUT-002.glb, ...).
+
+A segments file is a JSON list of {"name": ..., "start": frame, "end": frame}
+with end exclusive.
+
+Usage:
+    python stream_convert.py --input signavatars-data/sentence-level/00012.pkl \\
+        --output animations/SENT-00012.glb --mode skinned --clip-seconds 4
+    python stream_convert.py --input signavatars-data/sentence-level/00012.pkl \\
+        --output animations/SENT-00012.glb --segments segments.json --split files
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+from pathlib import Path
+
+from conversion_settings import DEFAULT_CHUNK_SIZE, DEFAULT_SETTINGS, add_settings_arguments, settings_from_args
+from instrumentation import add_report_arguments, measure, report_runs
+
+DEFAULT_CLIP_SECONDS = 4.0
+
+SPLIT_MODES = ('clips', 'files')
+
+# Modes that can share one avatar across several clips in one GLB
+CLIP_MODES = ('skinned', 'animation')
+
+
+def measures_deviation(settings):
+    """
+    Whether a clip's max_error_mm covers its whole deviation from the body
+    model. Morph clips on fixed-stride keyframes only report quantization
+    and sparse error; their keyframe error is measured only with
+    --keyframe-tolerance.
+    """
+    return settings['mode'] is not None or settings['keyframe_tolerance'] is not None
+
+
+def clip_ranges(num_frames, clip_frames, label="clip"):
+    """Consecutive (name, start, stop) ranges of at most clip_frames frames covering the recording."""
+    clip_frames = max(1, int(clip_frames))
+    return [(f"{label}-{i + 1:03d}", start, min(start + clip_frames, num_frames))
+            for i, start in enumerate(range(0, num_frames, clip_frames))]
+
+
+def load_segments(path, num_frames):
+    """Read named segments from a JSON file, as (name, start, stop) ranges within the recording."""
+    with open(path) as f:
+        segments = json.load(f)
+    ranges = []
+    for i, segment in enumerate(segments):
+        start, stop = int(segment['start']), min(int(segment['end']), num_frames)
+        if not 0 <= start < stop:
+            raise ValueError(f"Segment {i} ({segment.get('name')}) is empty or outside the "
+                             f"{num_frames}-frame recording: {start}-{segment['end']}")
+        ranges.append((str(segment.get('name') or f"clip-{i + 1:03d}"), start, stop))
+    return ranges
+
+
+def iter_skinned_clips(smplx_params, ranges, smplx_model, settings, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (name, parsed, reference_indices, reference_vertices) per clip for
+    create_skinned_clips_glb, computing each clip only when it is consumed.
+    """
+    from convert_pkl_to_glb import parse_smplx_params, params_to_vertices, select_keyframe_indices, with_mean_shape
+
+    for name, start, stop in ranges:
+        clip = {'smplx': smplx_params[start:stop]}
+        if settings['mode'] == 'animation':
+            clip = with_mean_shape(clip)
+        reference_indices = select_keyframe_indices(stop - start, settings['max_keyframes'])
+        reference_vertices = params_to_vertices(clip, smplx_model, chunk_size=chunk_size,
+                                                frame_indices=reference_indices)
+        yield name, parse_smplx_params(clip['smplx']), reference_indices, reference_vertices
+
+
+def convert_stream(input_path, output_path, word_label, smplx_model, settings=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                   clip_frames=None, segments=None, split='clips'):
+    """
+    Convert a long recording clip by clip.
+
+    Clips come from segments (a JSON path) or fixed clip_frames lengths
+    (default DEFAULT_CLIP_SECONDS). split is 'clips' (one GLB, skinned or
+    animation mode) or 'files' (one GLB per clip, any mode).
+    Returns signs.json-style metadata with a 'clips' list.
+    """
+    from convert_pkl_to_glb import convert_params, load_pkl_params
+    from skinned_export import BASE_AVATAR_FILE, base_avatar_of, create_skinned_clips_glb
+
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    if split not in SPLIT_MODES:
+        raise ValueError(f"Unknown split: {split}")
+    if split == 'clips' and settings['mode'] not in CLIP_MODES:
+        raise ValueError("--split clips needs --mode skinned or --mode animation; use --split files for "
+                         f"{settings['mode'] or 'morph'} mode")
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    smplx_params = load_pkl_params(input_path).get('smplx')
+    if smplx_params is None:
+        raise ValueError("No 'smplx' key found in parameters")
+    num_frames = len(smplx_params)
+    if segments:
+        ranges = load_segments(segments, num_frames)
+    else:
+        ranges = clip_ranges(num_frames, clip_frames or round(DEFAULT_CLIP_SECONDS * settings['fps']), word_label)
+    print(f"\nStreaming {num_frames} frames as {len(ranges)} clips ({split})")
+
+    start_time = time.perf_counter()
+    error_field = 'max_error_mm' if measures_deviation(settings) else 'max_quantization_error_mm'
+    if split == 'files':
+        clips = []
+        for i, (name, start, stop) in enumerate(ranges):
+            clip_path = output_path.with_name(f"{output_path.stem}-{i + 1:03d}{output_path.suffix}")
+            clip_params = {'smplx': np.asarray(smplx_params[start:stop], dtype=np.float32)}
+            metadata = convert_params(clip_params, clip_path, name, smplx_model, settings, chunk_size)
+            clips.append({'name': name, 'file': clip_path.name, 'start': start, 'frames': stop - start,
+                          error_field: metadata.get('max_error_mm')})
+        written = sum((output_path.parent / clip['file']).stat().st_size for clip in clips)
+        max_error_mm = max((clip[error_field] or 0.0) for clip in clips)
+    else:
+        base_avatar = BASE_AVATAR_FILE if settings['mode'] == 'animation' else None
+        clips, written, max_error = create_skinned_clips_glb(
+            iter_skinned_clips(smplx_params, ranges, smplx_model, settings, chunk_size), smplx_model,
+            output_path, fps=settings['fps'], quantize=settings['quantize'],
+            sparse_threshold=settings['sparse_threshold'], base_avatar=base_avatar)
+        for clip, (_, start, _) in zip(clips, ranges):
+            clip['start'] = start
+        max_error_mm = round(max_error * 1000, 4)
+    seconds = time.perf_counter() - start_time
+
+    streamed = sum(stop - start for _, start, stop in ranges)
+    print(f"\n✅ Streamed {streamed} frames in {len(clips)} clips: {output_path}"
+          f"{'' if split == 'clips' else ' (one file per clip)'}")
+    print(f"   Throughput: {streamed / max(seconds, 1e-9):.0f} frames/s ({seconds:.1f}s)")
+    if error_field == 'max_error_mm':
+        print(f"   Max deviation from body model: {max_error_mm:.3f} mm")
+    else:
+        print(f"   Max quantization error: {max_error_mm:.3f} mm "
+              f"(keyframe error not measured; use --keyframe-tolerance)")
+    print(f"   Size: {written / 1024:.0f} KB")
+
+    metadata = {
+        'file': output_path.name,
+        'description': f'ASL recording: {word_label}',
+        'region': 'ASL',
+        'biomechanical': True,
+        'frames': streamed,
+        error_field: max_error_mm,
+        'clips': clips,
+    }
+    if split == 'clips' and settings['mode'] == 'animation':
+        metadata['base_avatar'] = base_avatar_of(output_path)
+    return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream a long SignAvatars recording into GLB clips')
+    parser.add_argument('--input', required=True, help='Input .pkl file path')
+    parser.add_argument('--output', required=True, help='Output .glb file path (clip files get -001, -002, ...)')
+    parser.add_argument('--word', default=None, help='Label for the recording (default: the output name)')
+    parser.add_argument('--smplx-model', default='signavatars-data/models',
+                        help='Path to SMPL-X models directory (contains smplx/ subfolder)')
+    parser.add_argument('--clip-seconds', type=float, default=DEFAULT_CLIP_SECONDS,
+                        help=f'Length of each clip when no segments are given (default: {DEFAULT_CLIP_SECONDS})')
+    parser.add_argument('--segments', default=None, metavar='JSON',
+                        help='Named clip ranges: [{"name": ..., "start": frame, "end": frame}, ...]')
+    parser.add_argument('--split', choices=SPLIT_MODES, default='clips',
+                        help='clips: named animations in one GLB (skinned/animation modes); '
+                             'files: one GLB per clip (default: clips)')
+    add_settings_arguments(parser)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"❌ ERROR: Input file not found: {input_path}")
+        return 1
+    if not Path(args.smplx_model).exists():
+        print(f"❌ ERROR: SMPL-X model directory not found: {args.smplx_model}")
+        return 1
+
+    settings = settings_from_args(args)
+    if args.split == 'clips' and settings['mode'] not in CLIP_MODES:
+        print("❌ ERROR: --split clips needs --mode skinned or --mode animation (or use --split files)")
+        return 1
+
+    from convert_pkl_to_glb import load_smplx_model
+
+    smplx_model = load_smplx_model(args.smplx_model)
+    label = args.word or Path(args.output).stem
+    profile_path = f"{args.report}.prof" if args.report and args.profile == 'cprofile' else None
+    with measure(label, profile=args.profile, profile_path=profile_path) as report:
+        convert_stream(input_path, args.output, label, smplx_model, settings,
+                       chunk_size=args.chunk_size, clip_frames=round(args.clip_seconds * settings['fps']),
+                       segments=args.segments, split=args.split)
+    if args.report or args.profile:
+        report_runs(args.report, [{**report.as_dict(), 'input': str(input_path), 'output': args.output, 'ok': True}])
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -1,24 +1,15 @@
 #!/usr/bin/env python3
-import torch
-import pickle
-import io
 import numpy as np
 
-class CPU_Unpickler(pickle.Unpickler):
-    def find_class(self, module, name):
-        if module == 'torch.storage' and name == '_load_from_bytes':
-            return lambda b: torch.load(io.BytesIO(b), map_location='cpu', weights_only=False)
-        return super().find_class(module, name)
+from param_store import load_params
 
-with open('signavatars-data/asl-word-level/00295.pkl', 'rb') as f:
-    data = CPU_Unpickler(f).load()
+# Reads from the packed parameter store when present (no torch needed)
+data = load_params('signavatars-data/asl-word-level/00295.pkl')
 
-smplx = data['smplx'][0]
-if isinstance(smplx, torch.Tensor):
-    smplx = smplx.cpu().numpy()
+smplx = np.asarray(data['smplx'][0])
 print('Total params:', len(smplx))
 print(f'\nglobal_orient (0:3): {smplx[0:3]}')
-print(f'body_pose (3:66): shape {smplx[3:66].shape}')  
+print(f'body_pose (3:66): shape {smplx[3:66].shape}')
 print(f'left_hand (66:78): shape {smplx[66:78].shape}')
 print(f'right_hand (78:90): shape {smplx[78:90].shape}')
 print(f'jaw (90:93): {smplx[90:93]}')
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for gloss_matcher: registry resolution, longest-match scanning,
+inflections and the serialized index.
+
+Usage:
+    python -m unittest tests/test_gloss_matcher.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gloss_matcher import GlossIndex, Resolution, SignRegistry, load_index  # noqa: E402
+
+SIGNS = {
+    'PLAY': {'file': 'WORD-00001.glb'},
+    'WORD-00002': {'file': 'WORD-00002.glb'},
+    'LEGAL': {'file': 'WORD-00003.glb'},
+    'A LOT': {'file': 'WORD-00004.glb'},
+    'LOT': {'file': 'WORD-00005.glb'},
+    'MEMBER-STATES': {'file': 'MEMBER-STATES.glb'},
+    'STUDY': {'file': 'WORD-00006.glb'},
+    'GO': {'file': 'WORD-00007.glb'},
+    'PENDING': {'description': 'no animation yet'},
+    'pdf': {'file': 'pdf.glb'},
+    'idle': {'file': 'idle-neutral.glb', 'region': 'Universal'},
+    'test': {'file': 'test-00295.glb'},
+}
+MAPPING = {'DIFFERENCE': {'sign_key': 'WORD-00002'}, 'ALL DAY': {'sign_key': 'WORD-00002'}}
+
+
+def scan(text):
+    return [(text[start:end], resolution) for start, end, resolution in GlossIndex.build(SIGNS, MAPPING).scan(text)]
+
+
+class RegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = SignRegistry(SIGNS, MAPPING)
+
+    def test_exact_and_mapped(self):
+        self.assertEqual(self.registry.resolve('play'), Resolution('sign', 'PLAY', ()))
+        self.assertEqual(self.registry.resolve('Difference'), Resolution('sign', 'WORD-00002', ()))
+
+    def test_compound_keeps_playable_parts(self):
+        self.assertEqual(self.registry.resolve('legal-difference'),
+                         Resolution('compound', 'LEGAL-DIFFERENCE', ('LEGAL', 'WORD-00002')))
+
+    def test_fingerspell_without_file(self):
+        self.assertEqual(self.registry.resolve('pending').mode, 'fingerspell')
+        self.assertEqual(self.registry.resolve('foo_bar').mode, 'fingerspell')
+
+
+class ScanTest(unittest.TestCase):
+
+    def test_longest_match(self):
+        self.assertEqual([(text, resolution.key) for text, resolution in scan('A, lot; a LOT and lot all  day')],
+                         [('A', 'A'), ('lot', 'LOT'), ('a LOT', 'A LOT'), ('and', 'AND'), ('lot', 'LOT'),
+                          ('all  day', 'WORD-00002')])
+
+    def test_hyphenated_keys(self):
+        self.assertEqual([(text, resolution.key) for text, resolution in scan('member-states, Member States')],
+                         [('member-states', 'MEMBER-STATES'), ('Member States', 'MEMBER-STATES')])
+        self.assertEqual(scan('legal-playing')[0][1], Resolution('compound', 'LEGAL-PLAYING', ('LEGAL', 'PLAY')))
+
+    def test_inflections(self):
+        self.assertEqual([resolution.key for _, resolution in scan('playing played plays studies went')],
+                         ['PLAY', 'PLAY', 'PLAY', 'STUDY', 'GO'])
+        self.assertEqual(scan('player')[0][1].mode, 'fingerspell')
+
+    def test_lower_case_keys_match_exactly(self):
+        self.assertEqual([(text, resolution.mode) for text, resolution in scan('pdf PDF Pdf pdfs')],
+                         [('pdf', 'sign'), ('PDF', 'fingerspell'), ('Pdf', 'fingerspell'), ('pdfs', 'fingerspell')])
+
+    def test_placeholders_not_matched(self):
+        index = GlossIndex.build(SIGNS, MAPPING)
+        self.assertEqual([resolution.mode for _, _, resolution in index.scan('idle Idle test')], ['fingerspell'] * 3)
+        self.assertEqual(index.resolve_key('idle'), Resolution('sign', 'idle', ()))
+        self.assertEqual(index.resolve_key('pdf'), Resolution('sign', 'pdf', ()))
+
+
+class IndexFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.signs_path = Path(self.tmpdir.name) / 'signs.json'
+        self.mapping_path = Path(self.tmpdir.name) / 'wlasl_mapping.json'
+        self.index_path = Path(self.tmpdir.name) / 'gloss-index.json'
+        self.signs_path.write_text(json.dumps(SIGNS))
+        self.mapping_path.write_text(json.dumps(MAPPING))
+
+    def load(self):
+        return load_index(self.signs_path, self.mapping_path, self.index_path)
+
+    def test_serialized_index_matches(self):
+        built = self.load()
+        loaded = self.load()
+        text = 'We play a lot, all day, in the Member States (see the pdf)'
+        self.assertEqual(list(loaded.scan(text)), list(built.scan(text)))
+
+    def test_rebuilt_when_registry_changes(self):
+        self.load()
+        mtime = self.index_path.stat().st_mtime_ns
+        self.load()
+        self.assertEqual(self.index_path.stat().st_mtime_ns, mtime)
+
+        self.signs_path.write_text(json.dumps({**SIGNS, 'PLAYER': {'file': 'WORD-00008.glb'}}))
+        os.utime(self.signs_path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+        self.assertEqual(next(self.load().scan('player'))[2].key, 'PLAYER')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for preload_manifest: fetch plans from page manifests and <head> hints.
+
+Usage:
+    python -m unittest tests/test_preload_manifest.py
+"""
+
+import sys
+import tempfile
+import unittest
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from glb_writer import GLBWriter  # noqa: E402
+from preload_manifest import inject_links, preload_link, preload_plan  # noqa: E402
+
+SIGNS = {
+    'ACCEPT': {'file': 'accept.glb'},
+    'LEGAL': {'file': 'legal.glb'},
+    'PLAY': {'file': 'play.glb'},
+    'MISSING': {'file': 'missing.glb'},
+}
+MANIFEST = {
+    'page': 'index.html',
+    'signs': [
+        {'key': 'WAD', 'mode': 'fingerspell', 'count': 1},
+        {'key': 'LEGAL-ACCEPT', 'mode': 'compound', 'count': 1, 'parts': ['LEGAL', 'ACCEPT']},
+        {'key': 'ACCEPT', 'mode': 'sign', 'count': 2, 'file': 'accept.glb'},
+        {'key': 'MISSING', 'mode': 'sign', 'count': 1, 'file': 'missing.glb'},
+        {'key': 'PLAY', 'mode': 'sign', 'count': 1, 'file': 'play.glb'},
+    ],
+}
+
+
+def write_glb(path, duration, padding, base_avatar=None):
+    writer = GLBWriter()
+    times = writer.add_accessor(np.array([0, duration], dtype=np.float32), min_max=True)
+    writer.add_accessor(np.zeros(padding, dtype=np.float32))
+    writer.gltf['animations'] = [{'samplers': [{'input': times, 'output': times}], 'channels': []}]
+    if base_avatar:
+        writer.gltf['asset']['extras'] = {'baseAvatar': base_avatar}
+    writer.write(path)
+    return path.stat().st_size
+
+
+class PreloadPlanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.dir = Path(self.tmpdir.name)
+        self.sizes = {
+            'avatar.glb': write_glb(self.dir / 'avatar.glb', 1.0, 4000),
+            'legal.glb': write_glb(self.dir / 'legal.glb', 1.25, 1000, base_avatar='avatar.glb'),
+            'accept.glb': write_glb(self.dir / 'accept.glb', 2.5, 1000),
+            'play.glb': write_glb(self.dir / 'play.glb', 0.5, 100),
+        }
+
+    def plan(self, budget):
+        return preload_plan(MANIFEST, SIGNS, self.dir, budget)
+
+    def test_files_in_reading_order(self):
+        plan = self.plan(1 << 20)
+        self.assertEqual([(item['file'], item['bytes'], item['first_key']) for item in plan['files']],
+                         [('avatar.glb', self.sizes['avatar.glb'], 'LEGAL-ACCEPT'),
+                          ('legal.glb', self.sizes['legal.glb'], 'LEGAL-ACCEPT'),
+                          ('accept.glb', self.sizes['accept.glb'], 'LEGAL-ACCEPT'),
+                          ('play.glb', self.sizes['play.glb'], 'PLAY')])
+        self.assertEqual([(sign['key'], sign['duration']) for sign in plan['signs']],
+                         [('WAD', None), ('LEGAL-ACCEPT', 3.75), ('ACCEPT', 2.5), ('MISSING', None), ('PLAY', 0.5)])
+        self.assertEqual(plan['missing'], ['missing.glb'])
+        self.assertEqual(plan['links'], [preload_link(f'animations/{item["file"]}') for item in plan['files']])
+
+    def test_budget_stops_at_first_file_that_does_not_fit(self):
+        budget = self.sizes['avatar.glb'] + self.sizes['legal.glb'] + self.sizes['play.glb']
+        plan = self.plan(budget)
+        self.assertEqual([item['preload'] for item in plan['files']], [True, True, False, False])
+        self.assertEqual(plan['preload_bytes'], self.sizes['avatar.glb'] + self.sizes['legal.glb'])
+        self.assertEqual(len(plan['links']), 2)
+
+    def test_inject_replaces_previous_hints(self):
+        page = self.dir / 'page.html'
+        page.write_text('<html>\n<head>\n  <title>x</title>\n</head>\n<body></body>\n</html>\n')
+        self.assertTrue(inject_links(page, [preload_link('animations/a.glb'), preload_link('animations/b.glb')]))
+        self.assertTrue(inject_links(page, [preload_link('animations/c.glb')]))
+        self.assertEqual(page.read_text(), (
+            '<html>\n<head>\n  <title>x</title>\n'
+            f'  {preload_link("animations/c.glb")}\n</head>\n<body></body>\n</html>\n'))
+
+        fragment = self.dir / 'fragment.html'
+        fragment.write_text('<p>No head</p>\n')
+        self.assertFalse(inject_links(fragment, [preload_link('animations/a.glb')]))
+        self.assertEqual(fragment.read_text(), '<p>No head</p>\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for sign_annotator: trigger markup and pass-through of everything else.
+
+Usage:
+    python -m unittest tests/test_sign_annotator.py
+"""
+
+import io
+import re
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gloss_matcher import GlossIndex  # noqa: E402
+from sign_annotator import TokenMatcher, annotate_stream  # noqa: E402
+
+SIGNS = {
+    'ACCEPT': {'file': 'WORD-00001.glb'},
+    'WORD-00002': {'file': 'WORD-00002.glb'},
+    'LEGAL': {'file': 'WORD-00003.glb'},
+    'PENDING': {'description': 'no animation yet'},
+    'A LOT': {'file': 'WORD-00004.glb'},
+    'LOT': {'file': 'WORD-00005.glb'},
+    'LEGAL-DIFFERENCE': {'file': 'LEGAL-DIFFERENCE.glb'},
+}
+MAPPING = {'DIFFERENCE': {'sign_key': 'WORD-00002'}, 'PENDING': {'sign_key': 'PENDING'}}
+
+
+def annotate(html, chunk_size=7, **options):
+    matcher = TokenMatcher(GlossIndex.build(SIGNS, MAPPING), **options)
+    out = io.StringIO()
+    annotator = annotate_stream(io.StringIO(html), out, matcher, chunk_size=chunk_size)
+    return out.getvalue(), annotator
+
+
+class AnnotateTest(unittest.TestCase):
+
+    def test_wraps_words_and_keeps_markup(self):
+        html = ('<!DOCTYPE html><p class="x">We accept the <em>legal-accept</em> &amp; WAD.<br/>'
+                '<!-- accept --></p>')
+        output, annotator = annotate(html)
+        self.assertEqual(output, (
+            '<!DOCTYPE html><p class="x">We <span class="sign-trigger" data-sign="ACCEPT">accept</span> the <em>'
+            '<span class="sign-trigger" data-sign="LEGAL-ACCEPT" data-sign-mode="compound" '
+            'data-sign-parts="LEGAL ACCEPT">legal-accept</span></em> &amp; '
+            '<span class="sign-trigger" data-sign="WAD" data-sign-mode="fingerspell">WAD</span>.<br/>'
+            '<!-- accept --></p>'))
+        self.assertEqual(annotator.counts, {'sign': 1, 'compound': 1, 'fingerspell': 1, 'existing': 0})
+        self.assertEqual(list(annotator.signs), ['ACCEPT', 'LEGAL-ACCEPT', 'WAD'])
+
+    def test_skipped_contexts(self):
+        html = ('<head><title>accept</title></head><script>accept()</script><a href="#">accept</a>'
+                '<span class="sign-trigger" data-sign="accept">accept</span><div hidden>accept</div>'
+                '<code>accept</code>')
+        output, annotator = annotate(html)
+        self.assertEqual(output, html)
+        self.assertEqual(annotator.counts['existing'], 1)
+        self.assertEqual(list(annotator.signs), ['ACCEPT'])
+
+    def test_live_regions_skipped(self):
+        page = (Path(__file__).resolve().parent.parent / 'index.html').read_text(encoding='utf-8')
+        region = re.search(r'<div\s+id="sign-description".*?</div>', page, re.DOTALL).group()
+        output, annotator = annotate(f'<main>{region}<p role="log">accept</p></main>', fingerspell='all')
+        self.assertEqual(output, f'<main>{region}<p role="log">accept</p></main>')
+        self.assertEqual(annotator.signs, {})
+
+    def test_chunking_does_not_change_output(self):
+        html = '<p>accept ' * 50 + 'WAD</p>'
+        self.assertEqual(annotate(html, chunk_size=3)[0], annotate(html, chunk_size=1 << 16)[0])
+
+    def test_multi_word_gloss(self):
+        output, annotator = annotate('<p>A lot of legal\ndifferences. A <b>lot</b></p>')
+        self.assertEqual(output, (
+            '<p><span class="sign-trigger" data-sign="A LOT">A lot</span> of '
+            '<span class="sign-trigger" data-sign="LEGAL-DIFFERENCE">legal\ndifferences</span>. A <b>'
+            '<span class="sign-trigger" data-sign="LOT">lot</span></b></p>'))
+
+    def test_fingerspell_policy(self):
+        self.assertEqual(annotate('<p>WAD pending</p>', fingerspell='none')[0], '<p>WAD pending</p>')
+        self.assertIn('data-sign="PENDING" data-sign-mode="fingerspell"',
+                      annotate('<p>WAD pending</p>', fingerspell='all')[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
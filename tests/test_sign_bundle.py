@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for sign_bundle: one GLB with a named clip per sign on a single mesh.
+
+Runs on the synthetic SMPL-X model and .pkl files from benchmarks/synthetic.py.
+
+Usage:
+    python -m unittest tests/test_sign_bundle.py
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import write_synthetic_model, write_synthetic_pkls  # noqa: E402
+from convert_pkl_to_glb import SMPLX_OPTIONS  # noqa: E402
+from glb_writer import read_glb_json  # noqa: E402
+from preload_manifest import (BUNDLE_ATTRIBUTE, PRELOAD_ATTRIBUTE, has_sign_bundle, inject_links,  # noqa: E402
+                              preload_link)
+from sign_bundle import bundle_sources, bundle_tags, create_bundle  # noqa: E402
+from smplx_numpy import create  # noqa: E402
+
+SIGNS = {
+    'ACCEPT': {'file': 'WORD-00030.glb', 'wlasl_id': '00030'},
+    'ABOUT': {'file': 'WORD-00045.glb'},
+    'wad': {'file': 'wad.glb'},
+    'PENDING': {'description': 'no animation yet'},
+}
+
+
+class SignBundleTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        root = Path(cls.tmpdir.name)
+        write_synthetic_model(root / 'models')
+        cls.pkl_dir = root / 'pkl'
+        for path in write_synthetic_pkls(cls.pkl_dir, lengths=(30, 45)):
+            path.rename(cls.pkl_dir / f"{path.stem.split('-')[1]}.pkl")
+        cls.model = create(root / 'models', cache_dir=root / 'cache', **SMPLX_OPTIONS)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_sources(self):
+        sources, skipped = bundle_sources(['ACCEPT', 'wad', 'ACCEPT', 'ABOUT', 'PENDING', 'MISSING'], SIGNS,
+                                          self.pkl_dir)
+        self.assertEqual([key for key, _ in sources], ['ACCEPT', 'ABOUT'])
+        self.assertEqual(skipped, {'wad': 'no SignAvatars .pkl', 'PENDING': 'not a sign in signs.json',
+                                   'MISSING': 'not a sign in signs.json'})
+
+    def test_one_mesh_many_clips(self):
+        output = Path(self.tmpdir.name) / 'out' / 'page.bundle.glb'
+        with contextlib.redirect_stdout(io.StringIO()):
+            index = create_bundle(['ABOUT', 'wad', 'ACCEPT'], SIGNS, output, self.model, self.pkl_dir)
+
+        gltf = read_glb_json(output)
+        self.assertEqual(len(gltf['meshes']), 1)
+        self.assertEqual([animation['name'] for animation in gltf['animations']], ['ABOUT', 'ACCEPT'])
+        self.assertEqual(index['clips'], {'ABOUT': 'ABOUT', 'ACCEPT': 'ACCEPT'})
+        self.assertEqual(index['durations'], {'ABOUT': round(44 / 30, 3), 'ACCEPT': round(29 / 30, 3)})
+        self.assertEqual(index['skipped'], {'wad': 'no SignAvatars .pkl'})
+        self.assertEqual(index['file'], 'page.bundle.glb')
+        self.assertEqual(json.loads(output.with_suffix('.json').read_text()), index)
+
+    def test_bundle_tags_survive_preload_injection(self):
+        page = Path(self.tmpdir.name) / 'page.html'
+        page.write_text('<html>\n<head>\n  <title>x</title>\n</head>\n<body></body>\n</html>\n')
+        self.assertFalse(has_sign_bundle(page))
+        inject_links(page, [preload_link('animations/a.glb')])
+        tags = bundle_tags(page.with_name('page.bundle.json'), page.with_name('page.bundle.glb'), page)
+        inject_links(page, tags, replace=(BUNDLE_ATTRIBUTE, PRELOAD_ATTRIBUTE))
+        inject_links(page, [preload_link('animations/b.glb')])
+
+        self.assertTrue(has_sign_bundle(page))
+        html = page.read_text()
+        self.assertIn('<meta name="sign-bundle" content="page.bundle.json" data-sign-bundle>', html)
+        self.assertIn('href="page.bundle.glb"', html)
+        self.assertNotIn('animations/a.glb', html)
+        self.assertIn('animations/b.glb', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for site_build: page manifests, coverage report and incremental rebuilds.
+
+Usage:
+    python -m unittest tests/test_site_build.py
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from site_build import build_site  # noqa: E402
+
+SIGNS = {
+    'ACCEPT': {'file': 'WORD-00602.glb', 'wlasl_id': '00602'},
+    'LEGAL': {'file': 'WORD-00003.glb'},
+    'MEMBER-STATES': {'file': 'MEMBER-STATES.glb'},
+}
+
+
+class SiteBuildTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        root = Path(self.tmpdir.name)
+        self.src, self.out = root / 'site', root / 'build'
+        (self.src / 'docs').mkdir(parents=True)
+        self.signs_path = root / 'signs.json'
+        self.signs_path.write_text(json.dumps(SIGNS))
+        (self.src / 'index.html').write_text('<p>We accept the Member States and WAD.</p>')
+        (self.src / 'docs' / 'law.html').write_text('<p>Accept legal-accept, accept.</p>')
+
+    def build(self):
+        return build_site(self.src, self.out, self.signs_path, mapping_path=None,
+                          index_path=Path(self.tmpdir.name) / 'gloss-index.json', workers=1)
+
+    def test_manifests_and_coverage(self):
+        report, stats = self.build()
+        self.assertEqual(stats, {'built': 2, 'skipped': 0, 'failed': 0})
+        self.assertIn('data-sign="ACCEPT"', (self.out / 'docs' / 'law.html').read_text())
+
+        manifest = json.loads((self.out / 'docs' / 'law.signs.json').read_text())
+        self.assertEqual([(entry['key'], entry['mode'], entry['count']) for entry in manifest['signs']],
+                         [('ACCEPT', 'sign', 2), ('LEGAL-ACCEPT', 'compound', 1)])
+        self.assertEqual([item['file'] for item in manifest['files']], ['WORD-00602.glb', 'WORD-00003.glb'])
+
+        self.assertEqual(report['pages'], 2)
+        self.assertEqual(report['signs']['ACCEPT'], {'pages': 2, 'occurrences': 3, 'file': 'WORD-00602.glb'})
+        self.assertEqual(report['fingerspelled'], {'WAD': {'pages': 1, 'occurrences': 1}})
+        self.assertEqual([item['file_id'] for item in report['priority']], ['00602', '00003'])
+        self.assertEqual(report['files']['WORD-00602.glb']['pages'], 3)  # two pages plus the compound part
+        self.assertEqual(json.loads((self.out / 'sign-coverage.json').read_text()), report)
+
+    def test_unchanged_pages_are_skipped(self):
+        first, _ = self.build()
+        report, stats = self.build()
+        self.assertEqual(stats, {'built': 0, 'skipped': 2, 'failed': 0})
+        self.assertEqual(report, first)
+
+        (self.src / 'index.html').write_text('<p>Legal.</p>')
+        report, stats = self.build()
+        self.assertEqual(stats, {'built': 1, 'skipped': 1, 'failed': 0})
+        self.assertEqual(report['signs']['ACCEPT']['pages'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Equivalence test: smplx_numpy.SMPLXModel against smplx.SMPLX.
+
+Both models load the same synthetic SMPL-X .npz from benchmarks/synthetic.py
+(random blend shapes and skeleton with the real vertex and joint counts), so
+no licensed model files are needed. The comparison is skipped when torch or
+smplx is not installed; the memory-mapped model layout is checked against a
+private load either way.
+
+Usage:
+    python -m unittest tests/test_smplx_numpy.py
+"""
+
+import sys
+import tempfile
+import unittest
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import write_synthetic_model  # noqa: E402
+from smplx_numpy import LAYOUT_INDEX, create, model_layout_dir  # noqa: E402
+
+try:
+    import smplx
+    import torch
+except ImportError:
+    smplx = None
+
+OPTIONS = dict(model_type='smplx', gender='neutral', use_face_contour=False, num_betas=10,
+               num_expression_coeffs=10, use_pca=False, ext='npz')
+
+
+@unittest.skipIf(smplx is None, "smplx and torch are needed for the reference model")
+class SMPLXNumpyEquivalenceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        write_synthetic_model(cls.tmpdir.name, seed=0)
+        rng = np.random.default_rng(0)
+
+        frames = 12
+        cls.inputs = {
+            'global_orient': rng.normal(0, 0.5, (frames, 3)),
+            'body_pose': rng.normal(0, 0.3, (frames, 63)),
+            'left_hand_pose': rng.normal(0, 0.3, (frames, 45)),
+            'right_hand_pose': rng.normal(0, 0.3, (frames, 45)),
+            'jaw_pose': rng.normal(0, 0.1, (frames, 3)),
+            'leye_pose': rng.normal(0, 0.1, (frames, 3)),
+            'reye_pose': rng.normal(0, 0.1, (frames, 3)),
+            'expression': rng.normal(0, 1, (frames, 10)),
+            'betas': rng.normal(0, 1, (frames, 10)),
+            'transl': rng.normal(0, 0.2, (frames, 3)),
+        }
+        cls.inputs = {name: values.astype(np.float32) for name, values in cls.inputs.items()}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def create(self, flat_hand_mean):
+        return create(self.tmpdir.name, flat_hand_mean=flat_hand_mean, cache_dir=Path(self.tmpdir.name) / 'cache',
+                      **OPTIONS)
+
+    def reference(self, flat_hand_mean, inputs):
+        model = smplx.create(self.tmpdir.name, flat_hand_mean=flat_hand_mean, batch_size=len(inputs['body_pose']),
+                             **OPTIONS)
+        with torch.no_grad():
+            output = model(**{name: torch.from_numpy(values) for name, values in inputs.items()},
+                           return_verts=True)
+        return output.vertices.numpy()
+
+    def assert_matches(self, flat_hand_mean, inputs):
+        model = self.create(flat_hand_mean)
+        vertices = model(**inputs).vertices
+        expected = self.reference(flat_hand_mean, inputs)
+        self.assertEqual(vertices.shape, expected.shape)
+        self.assertEqual(vertices.dtype, np.float32)
+        np.testing.assert_allclose(vertices, expected, atol=1e-5, rtol=0)
+
+    def test_flat_hand_mean(self):
+        self.assert_matches(True, self.inputs)
+
+    def test_hand_mean(self):
+        self.assert_matches(False, self.inputs)
+
+    def test_missing_inputs_are_zero(self):
+        inputs = {'body_pose': self.inputs['body_pose']}
+        zeros = {name: np.zeros_like(values) for name, values in self.inputs.items() if name != 'body_pose'}
+        model = self.create(True)
+        np.testing.assert_allclose(model(**inputs).vertices, self.reference(True, {**inputs, **zeros}),
+                                   atol=1e-5, rtol=0)
+
+    def test_faces(self):
+        model = self.create(True)
+        reference = smplx.create(self.tmpdir.name, flat_hand_mean=True, **OPTIONS)
+        np.testing.assert_array_equal(model.faces, reference.faces)
+
+
+class ModelLayoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        write_synthetic_model(self.tmpdir.name, seed=1)
+        self.cache_dir = Path(self.tmpdir.name) / 'cache'
+
+    def test_mapped_matches_private(self):
+        mapped = create(self.tmpdir.name, flat_hand_mean=False, cache_dir=self.cache_dir, **OPTIONS)
+        private = create(self.tmpdir.name, flat_hand_mean=False, cache_dir=None, **OPTIONS)
+        self.assertIsInstance(mapped.posedirs, np.memmap)
+        self.assertFalse(mapped.posedirs.flags.writeable)
+
+        body_pose = np.random.default_rng(2).normal(0, 0.3, (4, 63)).astype(np.float32)
+        np.testing.assert_array_equal(mapped(body_pose=body_pose).vertices, private(body_pose=body_pose).vertices)
+        np.testing.assert_array_equal(mapped.faces, private.faces)
+
+    def test_layout_written_once_per_options(self):
+        model_file = Path(self.tmpdir.name) / 'smplx' / 'SMPLX_NEUTRAL.npz'
+        create(self.tmpdir.name, flat_hand_mean=True, cache_dir=self.cache_dir, **OPTIONS)
+        layout_dir = model_layout_dir(model_file, self.cache_dir, num_betas=10, num_expression_coeffs=10,
+                                      flat_hand_mean=True, dtype=np.float32)
+        index_mtime = (layout_dir / LAYOUT_INDEX).stat().st_mtime_ns
+
+        create(self.tmpdir.name, flat_hand_mean=True, cache_dir=self.cache_dir, **OPTIONS)
+        self.assertEqual((layout_dir / LAYOUT_INDEX).stat().st_mtime_ns, index_mtime)
+        create(self.tmpdir.name, flat_hand_mean=False, cache_dir=self.cache_dir, **OPTIONS)
+        self.assertEqual(len([path for path in self.cache_dir.iterdir() if path.is_dir()]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
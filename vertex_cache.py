@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of posed SMPL-X vertex sequences.
+
+Export settings (keyframes, orientation, quantization, modes) change far more
+often than the body model's output. With a cache, a sign's full (F, V, 3)
+vertex sequence is computed once and saved as .npy; later runs with any
+settings slice it instead of running the body model again.
+
+Entries are keyed by three SHA-256 hashes: the source .pkl content, the
+SMPL-X model file, and the body-model options (including whether betas were
+zeroed for a mean-shape avatar, and the stored dtype). float16 entries are
+half the size; their rounding is under 0.5 mm for SMPL-X coordinates, so the
+exported GLBs are not bit-identical to uncached ones.
+
+The cache is capped in bytes. Hits refresh an entry's mtime and writes evict
+the least recently used entries above the cap. Writes are atomic, so batch
+workers can share one cache directory.
+
+Usage:
+    python batch_convert.py --vertex-cache --vertex-cache-dtype float16 --vertex-cache-size 20
+    cache = VertexCache('signavatars-data/vertex-cache')
+    key = cache.key(pkl_path, smplx_model, options)
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from pathlib import Path
+
+from build_manifest import file_sha256
+from conversion_settings import DEFAULT_VERTEX_CACHE, DEFAULT_VERTEX_CACHE_GB
+
+CACHE_DTYPES = {'float32': np.float32, 'float16': np.float16}
+
+# (path, size, mtime_ns) -> sha256, per process
+_file_hashes = {}
+
+
+def cached_file_sha256(path):
+    """file_sha256, remembered while the file's size and mtime are unchanged."""
+    stat = os.stat(path)
+    key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+    if key not in _file_hashes:
+        _file_hashes[key] = file_sha256(path)
+    return _file_hashes[key]
+
+
+def body_model_sha256(smplx_model):
+    """
+    Hash of the body model: its source file if load_smplx_model recorded one,
+    otherwise the model's buffers.
+    """
+    model_file = getattr(smplx_model, 'model_file', None)
+    if model_file:
+        return cached_file_sha256(model_file)
+    cached = getattr(smplx_model, '_buffers_sha256', None)
+    if cached is None:
+        digest = hashlib.sha256()
+        for name, buffer in sorted(smplx_model.named_buffers()):
+            digest.update(name.encode('utf-8'))
+            digest.update(buffer.detach().cpu().numpy().tobytes())
+        digest.update(np.asarray(smplx_model.faces).tobytes())
+        cached = digest.hexdigest()
+        smplx_model._buffers_sha256 = cached
+    return cached
+
+
+class VertexCache:
+    """Size-capped LRU directory of (F, V, 3) vertex sequences."""
+
+    def __init__(self, cache_dir=DEFAULT_VERTEX_CACHE, dtype='float32', max_bytes=DEFAULT_VERTEX_CACHE_GB * 1024 ** 3):
+        if dtype not in CACHE_DTYPES:
+            raise ValueError(f"Unsupported vertex cache dtype: {dtype}")
+        self.cache_dir = Path(cache_dir)
+        self.dtype = dtype
+        self.max_bytes = int(max_bytes)
+
+    def key(self, pkl_path, smplx_model, options):
+        """Entry name for a .pkl evaluated with a body model and JSON-serializable options."""
+        options_hash = hashlib.sha256(
+            json.dumps({**options, 'dtype': self.dtype}, sort_keys=True).encode('utf-8')).hexdigest()
+        return f"{cached_file_sha256(pkl_path)[:20]}-{body_model_sha256(smplx_model)[:20]}-{options_hash[:20]}"
+
+    def path(self, key):
+        return self.cache_dir / f"{key}.npy"
+
+    def get(self, key):
+        """The cached sequence as a read-only memory map, or None on a miss."""
+        path = self.path(key)
+        try:
+            vertices = np.load(path, mmap_mode='r')
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+        return vertices
+
+    def put(self, key, vertices):
+        """Store a sequence, then evict least recently used entries above the size cap."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(key)
+        tmp_path = self.cache_dir / f".{key}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.asarray(vertices, dtype=CACHE_DTYPES[self.dtype]))
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        """Delete the least recently used entries until the cache fits max_bytes. Returns bytes freed."""
+        entries = []
+        for path in self.cache_dir.glob('*.npy'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Evicted by another worker
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total - freed <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                freed += size
+            except OSError:
+                pass
+        return freed
+
+
+def vertex_cache_from_args(args):
+    """VertexCache for the --vertex-cache options, or None when caching is off."""
+    if not getattr(args, 'vertex_cache', None):
+        return None
+    return VertexCache(args.vertex_cache, dtype=args.vertex_cache_dtype,
+                       max_bytes=args.vertex_cache_size * 1024 ** 3)